@@ -88,3 +88,45 @@ def test_write_read(adapter: ArrowAdapter) -> None:
     # test adapter.write() raises NotImplementedError when there are more than 1 partitions
     with pytest.raises(NotImplementedError):
         adapter.write(batch0)
+
+
+def test_read_arrow(adapter: ArrowAdapter) -> None:
+    adapter.write_partition(0, batch0)
+    adapter.write_partition(1, batch1)
+    adapter.write_partition(2, batch2)
+
+    assert adapter.read_partition_arrow(1) == pa.Table.from_batches([batch1])
+    assert adapter.read_arrow() == pa.Table.from_batches([batch0, batch1, batch2])
+    assert adapter.read_arrow(["f1"]) == pa.Table.from_batches(
+        [batch0, batch1, batch2]
+    ).select(["f1"])
+    with pytest.raises(KeyError):
+        adapter.read_partition_arrow(0, ["missing"])
+
+
+def test_column_view_survives_rewrite(adapter: ArrowAdapter) -> None:
+    adapter.write_partition(0, batch0)
+    adapter.write_partition(1, batch1)
+    adapter.write_partition(2, batch2)
+
+    column = adapter["f0"].read()
+    assert list(column) == list(range(1, 15))
+    # The column may be a view on the memory-mapped files. Rewriting a
+    # partition replaces the file instead of truncating it under the view.
+    adapter.write_partition(0, batch2)
+    assert list(column) == list(range(1, 15))
+    assert list(adapter["f0"].read()) == [13, 14] + list(range(6, 15))
+
+
+def test_read_arrow_rows(adapter: ArrowAdapter) -> None:
+    adapter.write_partition(0, batch0)
+    adapter.write_partition(1, batch1)
+    adapter.write_partition(2, batch2)
+
+    table = adapter.read_arrow(["f1"], filters=[("f0", ">", 4)], offset=1, limit=3)
+    assert table.column_names == ["f1"]
+    assert table.column("f1").to_pylist() == ["foo1", "bar1", None]
+    table = adapter.read_partition_arrow(1, offset=5)
+    assert table.column("f0").to_pylist() == [11, 12]
+    table = adapter.read_arrow(filters=[("f2", "==", None)])
+    assert table.column("f0").to_pylist() == [2, 5, 6, 11, 14]
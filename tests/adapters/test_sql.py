@@ -11,6 +11,7 @@ from tiled.adapters.sql import (
     SQLAdapter,
     is_safe_identifier,
 )
+from tiled.adapters.table_filters import FilterError
 from tiled.storage import SQLStorage, get_storage, parse_storage, register_storage
 from tiled.structures.core import StructureFamily
 from tiled.structures.data_source import DataSource, Management
@@ -219,6 +220,37 @@ def test_write_read_one_batch_one_part(
     assert test_table == pa.Table.from_pandas(result_read_partition)
 
 
+@pytest.mark.parametrize(
+    "adapter",
+    [
+        ("adapter_sqlite_one_partition"),
+        ("adapter_duckdb_one_partition"),
+        ("adapter_psql_one_partition"),
+    ],
+)
+def test_read_arrow(adapter: SQLAdapter, request: pytest.FixtureRequest) -> None:
+    # get adapter from fixture
+    adapter = request.getfixturevalue(adapter)
+
+    # The Arrow-native reads are cast back to the original schema,
+    # including the boolean column, with no pandas round trip.
+    test_table = pa.Table.from_arrays(data0, names)
+
+    adapter.append_partition(0, batch0)
+    assert test_table == adapter.read_arrow()
+    assert test_table == adapter.read_partition_arrow(0)
+
+    # Row selection is pushed down into the query.
+    assert test_table.slice(1, 2) == adapter.read_arrow(offset=1, limit=2)
+    assert test_table.slice(3) == adapter.read_partition_arrow(0, offset=3)
+    assert test_table.filter(pa.compute.field("f0") > 2) == adapter.read_arrow(
+        filters=[("f0", ">", 2)]
+    )
+    # Filter values are bound as parameters, not spliced into the SQL.
+    assert test_table.slice(1, 1) == adapter.read_arrow(filters=[("f2", "==", "bar0")])
+    assert adapter.read_arrow(filters=[("f2", "==", "x' OR 'a'='a")]).num_rows == 0
+
+
 @pytest.mark.parametrize(
     "adapter",
     [
@@ -797,3 +829,19 @@ def test_append_nullable(
     assert deep_array_equal(result_part, result_full)
 
     storage.dispose()  # Close all connections
+
+
+@pytest.mark.parametrize(
+    "adapter", [("adapter_duckdb_one_partition"), ("adapter_psql_one_partition")]
+)
+def test_read_arrow_filter_type_mismatch(
+    adapter: SQLAdapter, request: pytest.FixtureRequest
+) -> None:
+    # A value the database cannot compare with the column is a FilterError,
+    # which the server reports as a bad request.
+    adapter = request.getfixturevalue(adapter)
+    adapter.append_partition(0, batch0)
+    with pytest.raises(FilterError):
+        adapter.read_arrow(filters=[("f0", ">", "not a number")])
+    # The connection is still usable.
+    assert adapter.read_arrow(filters=[("f0", ">", 4)]).num_rows == 1
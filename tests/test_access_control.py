@@ -6,7 +6,7 @@ import numpy
 import pytest
 from starlette.status import HTTP_403_FORBIDDEN
 
-from tiled.access_control.access_tags import AccessTagsCompiler
+from tiled.access_control.access_tags import AccessTagsCompiler, AccessTagsParser
 from tiled.access_control.scopes import ALL_SCOPES
 from tiled.client import Context, from_context
 from tiled.server.app import build_app_from_config
@@ -234,6 +234,41 @@ def compile_access_tags_db_with_reset(compile_access_tags_db):
     access_tags_compiler.recompile()
 
 
+@pytest.mark.asyncio
+async def test_access_tags_parser_reloads_snapshot(tmp_path):
+    "The parser answers from memory and reloads when the database file changes."
+    db_path = tmp_path / "compiled_tags.sqlite"
+    access_tags_compiler = AccessTagsCompiler(
+        ALL_SCOPES,
+        deepcopy(access_tag_config),
+        {"uri": f"file:{db_path}"},
+        group_parser,
+    )
+    access_tags_compiler.load_tag_config()
+    access_tags_compiler.compile()
+    parser = AccessTagsParser.from_uri(f"sqlite:///{db_path}")
+    await parser.connect()
+    try:
+        snapshot = await parser.snapshot()
+        assert await parser.is_tag_defined("alice_tag")
+        assert await parser.is_tag_public("public")
+        assert not await parser.is_tag_defined("new_tag")
+        # Unchanged, so the same snapshot is used.
+        assert await parser.snapshot() is snapshot
+
+        access_tags_compiler.tag_config["tags"].update(
+            {"new_tag": {"users": [{"name": "tony", "scopes": ["read:metadata"]}]}}
+        )
+        access_tags_compiler.load_tag_config()
+        access_tags_compiler.recompile()
+        assert await parser.is_tag_defined("new_tag")
+        assert "new_tag" in await parser.get_tags_from_scope("read:metadata", "tony")
+        assert await parser.get_scopes_from_tag("new_tag", "tony") == {"read:metadata"}
+    finally:
+        await parser.close()
+        access_tags_compiler.connection.close()
+
+
 @pytest.fixture(scope="module")
 def access_control_test_context_factory(tmpdir_module, compile_access_tags_db):
     config = {
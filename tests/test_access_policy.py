@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from typing import Optional
 from unittest.mock import MagicMock
@@ -183,6 +184,37 @@ async def test_allowed_scopes(
     assert allowed_scopes == {"read:data", "write:data"}
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_decisions_cached(
+    external_policy: ExternalPolicyDecisionPoint, principal: Principal
+):
+    route = respx.post(external_policy._node_scopes).mock(
+        return_value=Response(200, json={"result": ["read:data"]})
+    )
+
+    async def allowed_scopes():
+        return await external_policy.allowed_scopes(
+            node=None,
+            principal=principal,
+            authn_access_tags=set(),
+            authn_scopes=set([]),
+        )
+
+    # Concurrent requests for the same decision share one round trip...
+    results = await asyncio.gather(*(allowed_scopes() for _ in range(5)))
+    assert results == 5 * [{"read:data"}]
+    assert route.call_count == 1
+    # ...and later requests use the cached decision.
+    assert await allowed_scopes() == {"read:data"}
+    assert route.call_count == 1
+
+    external_policy._decision_cache.clear()
+    assert await allowed_scopes() == {"read:data"}
+    assert route.call_count == 2
+    await external_policy.close()
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_allowed_scopes_return_no_scopes_if_invalid_response(
@@ -244,3 +276,18 @@ async def test_empty_access_blob_public(
 
     if route:
         assert route.call_count == 1
+
+
+def test_node_independent_filters(external_policy: ExternalPolicyDecisionPoint):
+    "Subclasses that override filters() do not inherit node_independent_filters."
+    assert external_policy.node_independent_filters
+
+    class NodeDependentFilters(type(external_policy)):
+        async def filters(self, node, *args, **kwargs):
+            return [AccessBlobFilter(tags=node.access_blob["tags"], user_id=None)]
+
+    class NodeIndependentFilters(NodeDependentFilters):
+        node_independent_filters = True
+
+    assert not NodeDependentFilters.node_independent_filters
+    assert NodeIndependentFilters.node_independent_filters
@@ -7,8 +7,13 @@ import dask.array
 import httpx
 import numpy
 import pytest
-from starlette.status import HTTP_406_NOT_ACCEPTABLE, HTTP_422_UNPROCESSABLE_CONTENT
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_406_NOT_ACCEPTABLE,
+    HTTP_422_UNPROCESSABLE_CONTENT,
+)
 
+import tiled.server.router
 from tiled.adapters.array import ArrayAdapter
 from tiled.adapters.mapping import MapAdapter
 from tiled.client import Context, from_context, record_history
@@ -212,6 +217,109 @@ def test_request_slicing(context):
     numpy.testing.assert_equal(actual, expected)
 
 
+def test_streamed_full_array(context):
+    "A request spanning several chunks is streamed one slab at a time."
+    client = from_context(context)["cube/chunked"]
+    response = client.context.http_client.get(
+        client.item["links"]["full"],
+        headers={"Accept": "application/octet-stream"},
+        params={"slice": "2:9:3,:,100:300"},
+    )
+    response.raise_for_status()
+    # Streamed responses are not tokenized, so they carry no ETag.
+    assert "ETag" not in response.headers
+    actual = numpy.frombuffer(response.read(), dtype="uint64").reshape((3, 300, 200))
+    numpy.testing.assert_equal(actual, cube_cases["chunked"][2:9:3, :, 100:300])
+
+
+@pytest.mark.parametrize("blocks_per_request, num_gets_expected", [(256, 1), (8, 3)])
+def test_read_blocks(context, blocks_per_request, num_gets_expected, monkeypatch):
+    "Many blocks are fetched together, in batches."
+    monkeypatch.setattr(ArrayClient, "BLOCKS_PER_REQUEST", blocks_per_request)
+    client = from_context(context)["cube/chunked"]
+    expected = cube_cases["chunked"]
+    blocks = [(i, 0, j) for j in range(2) for i in reversed(range(10))]
+    with record_history() as h:
+        arrays = client.read_blocks(blocks)
+    assert len(h.requests) == num_gets_expected
+    assert all("/array/blocks" in req.url.path for req in h.requests)
+    for (i, _, j), actual in zip(blocks, arrays):
+        numpy.testing.assert_equal(
+            actual, expected[i : i + 1, :, j * 200 : (j + 1) * 200]  # noqa: E203
+        )
+    for block in [(0, 0), (0, slice(None), 0)]:
+        with pytest.raises(ValueError):
+            client.read_blocks([block])
+
+
+def test_too_many_blocks(context, monkeypatch):
+    "Requests for too many blocks are rejected before any are read."
+    monkeypatch.setattr(tiled.server.router, "MAX_BLOCKS_PER_REQUEST", 19)
+    client = from_context(context)["cube/chunked"]
+    response = client.context.http_client.get(
+        client.item["links"]["blocks"],
+        headers={"Accept": "application/octet-stream"},
+        params={"block": "0:10,0,0:2"},
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert "20 blocks" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 1, 4])
+def test_iter_with_prefetch(context, prefetch_depth, monkeypatch):
+    "Blocks and frames are iterated in order, with requests made ahead."
+    client = from_context(context)["cube/chunked"]
+    expected = numpy.asarray(cube_cases["chunked"])
+    blocks = [(9, 0, 1), (0, 0, 0), (4, 0, 1)]
+    arrays = list(client.iter_blocks(blocks, prefetch_depth=prefetch_depth))
+    for (i, _, j), actual in zip(blocks, arrays):
+        numpy.testing.assert_equal(
+            actual, expected[i : i + 1, :, j * 200 : (j + 1) * 200]  # noqa: E203
+        )
+    assert len(list(client.iter_blocks(prefetch_depth=prefetch_depth))) == 20
+
+    # One request per chunk along the first axis
+    monkeypatch.setattr(ArrayClient, "PREFETCH_DEPTH", prefetch_depth)
+    with record_history() as h:
+        frames = list(client)
+    assert len(h.requests) == 10
+    numpy.testing.assert_equal(numpy.stack(frames), expected)
+
+    # Stopping early does not fetch everything.
+    with record_history() as h:
+        for _ in zip(range(2), client.iter_frames()):
+            pass
+    assert len(h.requests) <= 2 + prefetch_depth
+
+
+def test_blocks_range(context):
+    "A range of blocks can be requested, and is validated against the chunks."
+    client = from_context(context)["cube/chunked"]
+    blocks_url = client.item["links"]["blocks"]
+    response = client.context.http_client.get(
+        blocks_url, params={"block": ["3:5,0,1", "0,0,0"]}
+    )
+    response.raise_for_status()
+    content = response.read()
+    # Three blocks, each preceded by its length in bytes
+    nbytes = 300 * 200 * 8
+    assert len(content) == 3 * (8 + nbytes)
+    assert int.from_bytes(content[:8], "little") == nbytes
+    for index, (i, j) in enumerate([(3, 1), (4, 1), (0, 0)]):
+        start = index * (8 + nbytes) + 8
+        data = content[start : start + nbytes]  # noqa: E203
+        actual = numpy.frombuffer(data, dtype="uint64")
+        numpy.testing.assert_equal(
+            actual.reshape((1, 300, 200)),
+            cube_cases["chunked"][i : i + 1, :, j * 200 : (j + 1) * 200],  # noqa: E203
+        )
+    for block in ("0,0", "0:11,0,0"):
+        with fail_with_status_code(HTTP_422_UNPROCESSABLE_CONTENT):
+            client.context.http_client.get(
+                blocks_url, params={"block": block}
+            ).raise_for_status()
+
+
 def test_request_empty_slice(context):
     # When reading an entire array, `slice=` should not be requested
     client = from_context(context)["cube/chunked"]
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import numpy
+import pandas
+import pandas.testing
+import pytest
+
+import tiled.client.aio
+from tiled.adapters.array import ArrayAdapter
+from tiled.adapters.dataframe import DataFrameAdapter
+from tiled.adapters.mapping import MapAdapter
+from tiled.client.aio import (
+    AsyncArrayClient,
+    AsyncContainer,
+    AsyncContext,
+    AsyncDataFrameClient,
+    from_context,
+)
+from tiled.queries import Key
+from tiled.server.app import build_app
+
+arr = numpy.arange(24 * 5).reshape((24, 5))
+df = pandas.DataFrame({"x": numpy.arange(30), "y": numpy.arange(30) * 2.0})
+tree = MapAdapter(
+    {
+        "many": MapAdapter(
+            {
+                f"a{i:02}": ArrayAdapter.from_array(
+                    numpy.full(3, i), metadata={"even": i % 2 == 0}
+                )
+                for i in range(25)
+            }
+        ),
+        "arr": ArrayAdapter.from_array(arr, chunks=((8, 8, 8), (5,))),
+        "df": DataFrameAdapter.from_pandas(df, npartitions=3),
+    }
+)
+
+
+@pytest.mark.asyncio
+async def test_async_client():
+    context = await AsyncContext.from_app(build_app(tree))
+    async with context:
+        client = await from_context(context)
+        assert isinstance(client, AsyncContainer)
+        many = await client.get("many")
+        assert await many.count() == 25
+        # Iterate over several pages.
+        keys = [key async for key in many.keys(page_size=10)]
+        assert keys == [f"a{i:02}" for i in range(25)]
+        values = [value async for value in many.values(page_size=10)]
+        assert [value.metadata["even"] for value in values] == [
+            i % 2 == 0 for i in range(25)
+        ]
+        evens = many.search(Key("even") == True)  # noqa: E712
+        assert await evens.count() == 13
+        assert (await evens.get("a02")).item["id"] == "a02"
+        with pytest.raises(KeyError):
+            await evens.get("a03")
+        with pytest.raises(KeyError):
+            await client.get("does_not_exist")
+
+        array_client = await client.get("arr")
+        assert isinstance(array_client, AsyncArrayClient)
+        numpy.testing.assert_equal(await array_client.read(), arr)
+        numpy.testing.assert_equal(
+            await array_client.read((slice(3, 20), 1)), arr[3:20, 1]
+        )
+        blocks = await array_client.read_blocks([(2, 0), (0, 0)])
+        numpy.testing.assert_equal(blocks[0], arr[16:])
+        numpy.testing.assert_equal(blocks[1], arr[:8])
+        # Split a large read into concurrent requests.
+        array_client.RESPONSE_BYTESIZE_LIMIT = 10 * arr.itemsize * arr.shape[1]
+        numpy.testing.assert_equal(await array_client.read(), arr)
+        child = await client.get("many/a07")
+        numpy.testing.assert_equal(await child.read(), [7] * 3)
+
+        df_client = await client.get("df")
+        assert isinstance(df_client, AsyncDataFrameClient)
+        pandas.testing.assert_frame_equal(await df_client.read(), df)
+        pandas.testing.assert_frame_equal(await df_client.read(["y"]), df[["y"]])
+
+
+@pytest.mark.asyncio
+async def test_async_client_bounds_concurrency(monkeypatch):
+    "Reads that fan out make no more requests at once than there are connections."
+    in_flight = 0
+    max_in_flight = 0
+    original_get = tiled.client.aio._get
+
+    async def _get(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await original_get(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(tiled.client.aio, "_get", _get)
+    context = await AsyncContext.from_app(
+        build_app(tree), limits=httpx.Limits(max_connections=2)
+    )
+    async with context:
+        client = await from_context(context)
+        array_client = await client.get("arr")
+        blocks = await array_client.read_blocks([(i, 0) for i in range(3)] * 2)
+        numpy.testing.assert_equal(numpy.concatenate(blocks[:3]), arr)
+        df_client = await client.get("df")
+        pandas.testing.assert_frame_equal(await df_client.read(), df)
+    assert max_in_flight == 2
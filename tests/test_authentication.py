@@ -5,6 +5,7 @@ import shutil
 import subprocess
 import sys
 import time
+from datetime import timedelta
 
 import numpy
 import pytest
@@ -473,6 +474,38 @@ def test_api_key_expiration(enter_username_password, config):
             from_context(context)
 
 
+def test_api_key_verification_cached(enter_username_password, config, monkeypatch):
+    """
+    A verified API key is reused within and across requests.
+    """
+    calls = []
+    original = authentication.lookup_valid_api_key
+
+    async def lookup_valid_api_key(db, secret):
+        calls.append(secret)
+        return await original(db, secret)
+
+    monkeypatch.setattr(authentication, "lookup_valid_api_key", lookup_valid_api_key)
+    with Context.from_app(build_app_from_config(config)) as context:
+        with enter_username_password("alice", "secret1"):
+            context.authenticate()
+        key_info = context.create_api_key()
+        context.logout()
+        context.api_key = key_info["secret"]
+        client = from_context(context)
+        client["A1"].read()
+        client["A2"].read()
+        # Principal, scopes, and access tags were resolved with one lookup.
+        assert len(calls) == 1
+
+        # With the cache disabled, each request looks up the key once.
+        app = context.http_client.app
+        settings = app.dependency_overrides[authentication.get_settings]()
+        monkeypatch.setattr(settings, "api_key_cache_ttl", timedelta(0))
+        context.http_client.get("/api/v1/array/full/A1").raise_for_status()
+        assert len(calls) == 2
+
+
 def test_api_key_limit(enter_username_password, config):
     # Decrease the limit so this test runs faster.
     original_limit = authentication.API_KEY_LIMIT
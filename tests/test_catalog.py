@@ -1,5 +1,6 @@
 import random
 import string
+import time
 from contextlib import closing
 from dataclasses import asdict
 from typing import cast
@@ -22,7 +23,7 @@ from tiled.adapters.csv import CSVAdapter
 from tiled.adapters.dataframe import ArrayAdapter
 from tiled.adapters.tiff import TiffAdapter
 from tiled.catalog import in_memory
-from tiled.catalog.adapter import WouldDeleteData
+from tiled.catalog.adapter import AdapterCache, WouldDeleteData
 from tiled.catalog.explain import record_explanations
 from tiled.client import Context, from_context
 from tiled.client.register import register
@@ -244,6 +245,149 @@ async def test_write_array_external(a, tmpdir):
     assert x.data_sources[0].properties == {"chunks": [[5], [3]]}
 
 
+@pytest.mark.asyncio
+async def test_create_nodes(a, tmpdir):
+    "Many nodes, sharing structures and assets, are created in one transaction."
+    arr = numpy.ones((5, 3))
+    filepath = str(tmpdir / "file.tiff")
+    data_uri = ensure_uri(filepath)
+    tifffile.imwrite(filepath, arr)
+    structure = asdict(TiffAdapter(data_uri).structure())
+
+    def node(key):
+        return {
+            "key": key,
+            "structure_family": "array",
+            "metadata": {"key": key},
+            "data_sources": [
+                DataSource(
+                    structure_family="array",
+                    mimetype="image/tiff",
+                    structure=structure,
+                    parameters={},
+                    management="external",
+                    assets=[
+                        Asset(
+                            parameter="data_uri",
+                            num=None,
+                            data_uri=str(data_uri),
+                            is_directory=False,
+                        )
+                    ],
+                )
+            ],
+        }
+
+    nodes = await a.create_nodes(
+        [
+            node("x"),
+            {"key": "c", "structure_family": "container", "metadata": {}},
+            node("y"),
+        ]
+    )
+    assert [n.node.key for n in nodes] == ["x", "c", "y"]
+    assert nodes[0].data_sources[0].assets[0].id == (
+        nodes[2].data_sources[0].assets[0].id
+    )
+    for key in ["x", "y"]:
+        x = await a.lookup_adapter([key])
+        assert x.metadata() == {"key": key}
+        assert numpy.array_equal(await x.read(), arr)
+    c = await a.lookup_adapter(["c"])
+    assert await c.path_segments() == ["c"]
+
+    # If any key is taken, no nodes are created.
+    with pytest.raises(Conflicts):
+        await a.create_nodes([node("z"), node("x")])
+    with pytest.raises(Conflicts):
+        await a.create_nodes([node("z"), node("z")])
+    assert "z" not in await a.keys_range(0, 10)
+
+
+@pytest.mark.asyncio
+async def test_adapter_cache(a, tmpdir):
+    "Adapters are reused across lookups until the node is changed."
+    arr = numpy.ones((5, 3))
+    filepath = str(tmpdir / "file.tiff")
+    data_uri = ensure_uri(filepath)
+    tifffile.imwrite(filepath, arr)
+    structure = asdict(TiffAdapter(data_uri).structure())
+    await a.create_node(
+        key="x",
+        structure_family="array",
+        metadata={"color": "red"},
+        data_sources=[
+            DataSource(
+                structure_family="array",
+                mimetype="image/tiff",
+                structure=structure,
+                parameters={},
+                management="external",
+                assets=[
+                    Asset(
+                        parameter="data_uri",
+                        num=None,
+                        data_uri=str(data_uri),
+                        is_directory=False,
+                    )
+                ],
+            )
+        ],
+    )
+    x = await a.lookup_adapter(["x"])
+    adapter = await x.get_adapter()
+    assert await (await a.lookup_adapter(["x"])).get_adapter() is adapter
+
+    # Changing the metadata invalidates the cached adapter.
+    await x.replace_metadata(metadata={"color": "blue"})
+    x = await a.lookup_adapter(["x"])
+    new_adapter = await x.get_adapter()
+    assert new_adapter is not adapter
+    assert new_adapter.metadata()["color"] == "blue"
+
+
+def test_adapter_cache_ttl_is_absolute():
+    "Using a cached adapter does not extend its lifetime."
+    cache = AdapterCache(ttl=0.2)
+    adapter = object()
+    cache.set("key", adapter)
+    time.sleep(0.15)
+    assert cache.get("key") is adapter
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_path(a):
+    "A whole path is looked up at once, applying conditions at every level."
+
+    async def create(parent, key, color):
+        await parent.create_node(
+            key=key,
+            metadata={"color": color},
+            structure_family=StructureFamily.container,
+            specs=[],
+        )
+        return await parent.lookup_adapter([key])
+
+    b = await create(a, "b", "red")
+    c = await create(b, "c", "red")
+    d = await create(c, "d", "blue")
+    assert (await a.lookup_path(["b", "c", "d"])).node.id == d.node.id
+    assert (a.node.id, ("b", "c", "d")) in a.context.path_cache
+    assert await a.lookup_path(["b", "c", "missing"]) is None
+    assert await a.lookup_path(["c", "d"]) is None
+    red = a.search(Eq("color", "red"))
+    assert (await red.lookup_path(["b", "c"])).node.id == c.node.id
+    assert await red.lookup_path(["b", "c", "d"]) is None
+
+    # A cached node id is checked, and not used once it is stale.
+    await d.delete()
+    assert await a.lookup_path(["b", "c", "d"]) is None
+    d = await create(c, "d", "green")
+    assert (await a.lookup_path(["b", "c", "d"])).node.id == d.node.id
+
+
 @pytest.mark.asyncio
 async def test_write_table_external_direct(a, tmpdir):
     df = pandas.DataFrame(numpy.ones((5, 3)), columns=list("abc"))
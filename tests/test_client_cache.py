@@ -4,6 +4,7 @@ import sqlite3
 import threading
 import time
 from contextlib import closing
+from pathlib import Path
 
 import numpy
 import pytest
@@ -175,6 +176,36 @@ def test_clear_cache(client):
     assert cache.size() == cache.count() == 0
 
 
+def test_size_tracked(client):
+    cache = client.context.cache
+    for i in range(5):
+        client.values()[i]
+    with closing(cache._conn.cursor()) as cur:
+        (expected,) = cur.execute("SELECT SUM(size) FROM responses").fetchone()
+    assert cache.size() == expected
+    cache.capacity = expected
+    client.values()[5]
+    assert cache.size() <= expected
+
+
+def test_blob_store(client, tmpdir):
+    cache = client.context.cache = Cache(Path(tmpdir, "cache.db"), blob_threshold=0)
+    blob_directory = Path(f"{cache.filepath}.blobs")
+
+    # First time: not cached, and stored outside the database
+    client.values()[0]
+    assert any(blob_directory.iterdir())
+
+    # Second time: cached
+    with record_history() as h:
+        client.values()[0]
+    for response in h.responses:
+        assert isinstance(response, CachedResponse)
+
+    cache.clear()
+    assert not blob_directory.exists()
+
+
 def test_not_thread_safe(client, monkeypatch):
     # Check that writes fail if thread safety is disabled
     monkeypatch.setattr(sqlite3, "threadsafety", ThreadingMode.SINGLE_THREAD)
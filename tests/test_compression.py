@@ -1,12 +1,18 @@
+import collections
+import gzip
+
 import numpy
 import pytest
+from starlette.responses import Response, StreamingResponse
 from starlette.status import HTTP_200_OK
 from starlette.testclient import TestClient
 
 from tiled.adapters.array import ArrayAdapter
 from tiled.adapters.mapping import MapAdapter
 from tiled.config import Authentication
+from tiled.media_type_registration import default_compression_registry
 from tiled.server.app import build_app
+from tiled.server.compression import CompressionMiddleware
 
 
 @pytest.fixture
@@ -50,3 +56,60 @@ def test_zstd_preferred(app):
     assert data_response.status_code == HTTP_200_OK
     assert "zstd" in metadata_response.headers["Content-Encoding"]
     assert "zstd" in data_response.headers["Content-Encoding"]
+
+
+def test_large_body_compressed_in_worker(app):
+    with TestClient(app=app) as client:
+        client.headers["Authorization"] = "Apikey secret"
+        client.headers["Accept-Encoding"] = "gzip"
+        response = client.get(
+            "/api/v1/array/full/compresses_well", headers={"Accept": "text/csv"}
+        )
+    assert response.status_code == HTTP_200_OK
+    assert "gzip" in response.headers["Content-Encoding"]
+    assert "compress_queue" in response.headers["Server-Timing"]
+
+
+def build_raw_app(response):
+    "Wrap a Response in CompressionMiddleware, with state for metrics."
+
+    async def endpoint(scope, receive, send):
+        await response(scope, receive, send)
+
+    compressed = CompressionMiddleware(
+        endpoint, default_compression_registry, offload_size=1000
+    )
+
+    async def raw_app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            # There is nothing to start up or shut down.
+            while True:
+                message = await receive()
+                await send({"type": f"{message['type']}.complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+        metrics = collections.defaultdict(lambda: collections.defaultdict(lambda: 0))
+        scope.setdefault("state", {})["metrics"] = metrics
+        await compressed(scope, receive, send)
+
+    return raw_app
+
+
+def test_already_compressed_passes_through():
+    body = gzip.compress(numpy.zeros(10_000).tobytes())
+    app = build_raw_app(Response(body, media_type="application/octet-stream"))
+    with TestClient(app=app) as client:
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.content == body
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_streaming_compressed_chunk_by_chunk(encoding):
+    chunks = [f"{i},{i * 2}\n".encode() * 1000 for i in range(10)]
+    app = build_raw_app(StreamingResponse(iter(chunks), media_type="text/csv"))
+    with TestClient(app=app) as client:
+        response = client.get("/", headers={"Accept-Encoding": encoding})
+    assert encoding in response.headers["Content-Encoding"]
+    # The client transparently decompresses.
+    assert response.content == b"".join(chunks)
@@ -234,3 +234,35 @@ def test_redundant_query_parameters(context):
         context.http_client.get(url_path, params=params).raise_for_status()
         assert "'field'" in response.text
         assert "'column'" in response.text
+
+
+@pytest.mark.parametrize("link", ("full", "partition"))
+def test_http_fetch_rows(context, link):
+    "Rows can be selected with filters and an offset and limit."
+    client = from_context(context)
+    url_path = client["diverse"].item["links"][link]
+    params = {
+        **parse_qs(urlparse(url_path).query),
+        "partition": 0,  # Used by /table/partition; ignored by /table/full
+        "filter": ["A>1", 'C!="three"'],
+    }
+    response = context.http_client.get(url_path, params=params)
+    response.raise_for_status()
+    actual = deserialize_arrow(response.read())
+    assert list(actual["C"]) == ["two"]
+
+    params = {**params, "filter": "B>=1", "offset": 1, "limit": 1}
+    response = context.http_client.get(url_path, params=params)
+    response.raise_for_status()
+    actual = deserialize_arrow(response.read())
+    assert list(actual["A"]) == [2]
+
+
+def test_http_fetch_rows_bad_filter(context):
+    client = from_context(context)
+    url_path = client["diverse"].item["links"]["full"]
+    for filter in ("A", "missing>1"):
+        with fail_with_status_code(HTTP_400_BAD_REQUEST):
+            context.http_client.get(
+                url_path, params={"filter": filter}
+            ).raise_for_status()
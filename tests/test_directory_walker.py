@@ -74,6 +74,29 @@ async def test_collision(example_data_dir, tmpdir):
         assert "a" in client
 
 
+@pytest.mark.asyncio
+async def test_concurrent_batched_register(example_data_dir, tmpdir):
+    "Registering concurrently, in batches, gives the same result."
+    catalog = in_memory(
+        writable_storage=str(tmpdir), readable_storage=[example_data_dir]
+    )
+    with Context.from_app(build_app(catalog)) as context:
+        client = from_context(context)
+        await register(client, example_data_dir, prefix="/serial", batch_size=1)
+        await register(
+            client, example_data_dir, prefix="/concurrent", concurrency=4, batch_size=3
+        )
+
+        def tree(node):
+            return {
+                key: tree(child) if child.structure_family == "container" else None
+                for key, child in node.items()
+            }
+
+        assert tree(client["concurrent"]) == tree(client["serial"])
+        assert tree(client["serial"])
+
+
 @pytest.mark.parametrize(
     ("filename", "expected"), [("a.txt", "a"), ("a.tar.gz", "a"), ("a", "a")]
 )
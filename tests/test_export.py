@@ -7,6 +7,7 @@ import pandas
 import pytest
 import xarray
 
+import tiled.serialization.table
 from tiled.adapters.array import ArrayAdapter
 from tiled.adapters.dataframe import DataFrameAdapter
 from tiled.adapters.mapping import MapAdapter
@@ -14,6 +15,7 @@ from tiled.adapters.xarray import DatasetAdapter
 from tiled.client import Context, from_context
 from tiled.client.utils import ClientError
 from tiled.server.app import build_app
+from tiled.utils import SerializationError
 
 data = numpy.random.random((10, 10))
 temp = 15 + 8 * numpy.random.randn(2, 2, 3)
@@ -116,6 +118,53 @@ def test_streaming_export(client, buffer):
         json.loads(line)
 
 
+@pytest.mark.parametrize(
+    "format", ["application/json", "application/json-seq", "text/csv"]
+)
+def test_streaming_export_in_batches(client, buffer, monkeypatch, format):
+    "Text formats are encoded in batches of rows, which must join seamlessly."
+    monkeypatch.setattr(tiled.serialization.table, "ROWS_PER_BATCH", 7)
+    expected = client["C"].read()
+    client["C"].export(buffer, format=format)
+    buffer.seek(0)
+    if format == "application/json":
+        actual = pandas.DataFrame(json.loads(buffer.read()))
+    elif format == "application/json-seq":
+        actual = pandas.DataFrame(map(json.loads, buffer.read().splitlines()))
+    else:
+        actual = pandas.read_csv(buffer)
+    pandas.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("kind", ["pandas", "arrow"])
+def test_streaming_export_in_batches_nullable_ints(monkeypatch, kind):
+    "Integers are written as such in every batch, whether it has nulls or not."
+    pyarrow = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(tiled.serialization.table, "ROWS_PER_BATCH", 7)
+    # Only the second batch has a null.
+    df = pandas.DataFrame({"i": pandas.array([*range(10), None], dtype="Int64")})
+    # An Arrow table without pandas metadata, as read from SQL, for example
+    table = df if kind == "pandas" else pyarrow.table({"i": [*range(10), None]})
+    actual = b"".join(tiled.serialization.table.serialize_csv("text/csv", table, {}))
+    assert actual == df.to_csv(index=False).encode()
+
+
+@pytest.mark.parametrize(
+    "format", ["application/json", "application/json-seq", "text/csv"]
+)
+def test_streaming_export_error_before_first_batch(client, buffer, monkeypatch, format):
+    "An error encoding the first batch is reported with an error status."
+
+    def row_batches(df):
+        raise SerializationError("cannot encode this")
+        yield
+
+    monkeypatch.setattr(tiled.serialization.table, "row_batches", row_batches)
+    with pytest.raises(ClientError, match="cannot encode this") as exc_info:
+        client["C"].export(buffer, format=format)
+    assert exc_info.value.response.status_code == 406
+
+
 def test_streaming_export_empty(client, buffer):
     "The application/json-seq format is streamed via a generator."
     client["empty_table"].export(buffer, format="application/json-seq")
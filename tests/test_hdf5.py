@@ -1,3 +1,4 @@
+import gc
 import os
 from types import SimpleNamespace
 from unittest.mock import patch
@@ -6,6 +7,7 @@ import numpy
 import pytest
 
 from tiled.adapters import hdf5 as hdf5_adapters
+from tiled.adapters.array import ArrayAdapter
 from tiled.adapters.hdf5 import HDF5Adapter, HDF5ArrayAdapter
 from tiled.adapters.mapping import MapAdapter
 from tiled.catalog import in_memory
@@ -248,6 +250,38 @@ def test_from_multiple(example_file, buffer):
     assert file["B"]["a"]["b"]["c"]["d"] is not None
 
 
+def test_export_chunked_arrays(buffer):
+    """Export arrays that span many blocks, and a nested tree, as HDF5."""
+    h5py = pytest.importorskip("h5py")
+    dask_array = pytest.importorskip("dask.array")
+    a = numpy.arange(1000 * 7, dtype="float32").reshape((1000, 7))
+    b = numpy.arange(55, dtype="int16")
+    chunked = dask_array.from_array(a, chunks=(64, 3))
+    tree = MapAdapter(
+        {
+            "x": MapAdapter(
+                {
+                    "a": ArrayAdapter.from_array(chunked),
+                    "y": MapAdapter(
+                        {"b": ArrayAdapter.from_array(b, chunks=((10, 20, 25),))},
+                        metadata={"color": "red"},
+                    ),
+                },
+                metadata={"color": "blue"},
+            ),
+        }
+    )
+    with Context.from_app(build_app(tree)) as context:
+        client = from_context(context)
+        client.export(buffer, format="application/x-hdf5")
+    file = h5py.File(buffer, "r")
+    assert file["x/a"].dtype == a.dtype
+    assert numpy.array_equal(file["x/a"][()], a)
+    assert numpy.array_equal(file["x/y/b"][()], b)
+    assert file["x"].attrs["color"] == "blue"
+    assert file["x/y"].attrs["color"] == "red"
+
+
 def test_inlined_contents(example_file):
     """Test that the recursive structure and metadata are inlined into one request."""
     tree = HDF5Adapter.from_uris(example_file)
@@ -715,93 +749,52 @@ def test_chunked_arrays_from_catalog(
 
 
 @pytest.mark.parametrize("swmr", [True, False])
-def test_files_opened_and_closed(example_files_with_chunked_arrays, swmr):
-    "Test that only the necessary files are opened and that they are closed after reading"
-    import tiled
-
+def test_files_opened_once(example_files_with_chunked_arrays, swmr):
+    "Test that only the necessary files are opened and that open files are reused"
     h5py = pytest.importorskip("h5py")
 
     # Use the example with two files chunked along a single dimension;
     # total chunks across the two files: ((3, 3, 3, 1)*2, )
     file_uris = example_files_with_chunked_arrays[:2]
     file_paths = [path_from_uri(uri) for uri in file_uris]
-    with patch(
-        "tiled.adapters.hdf5.h5open", wraps=tiled.adapters.hdf5.h5open
-    ) as mock_h5open:
-        mock_h5open.assert_not_called()  # No files should be opened yet
+    hdf5_adapters._open_files.clear()
+    with patch("h5py.File", wraps=h5py.File) as mock_file:
+        mock_file.assert_not_called()  # No files should be opened yet
 
         # Tree initialized from the entire file, no dataset provided
         tree = HDF5Adapter.from_uris(*file_uris, swmr=swmr)
-        mock_h5open.assert_called()
-        assert mock_h5open.call_count == 1
+        assert mock_file.call_count == 1
 
         # Adapter initialized directly from the dataset:
-        # Each file is read once to get the structure, and the first one
-        # is also read once again to get the metadata
-        mock_h5open.reset_mock()
+        # only the second file has not been opened yet
+        mock_file.reset_mock()
         HDF5ArrayAdapter.from_uris(*file_uris, dataset="a/d", swmr=swmr)
-        assert mock_h5open.call_count == 3
-        files_opened = [call.args[0].name for call in mock_h5open.call_args_list]
-        assert files_opened.count(file_paths[0].name) == 2
-        assert files_opened.count(file_paths[1].name) == 1
-        assert set(files_opened) == set([fp.name for fp in file_paths])
-
-        # Build the app fromn the tree (HDF5Adapter): all datasets in the file are parsed
-        mock_h5open.reset_mock()
+        files_opened = [call.args[0].name for call in mock_file.call_args_list]
+        assert files_opened == [file_paths[1].name]
+
+        # Serve the tree and read every chunk: the open files are reused
+        mock_file.reset_mock()
         with Context.from_app(build_app(tree)) as context:
             client = from_context(context)
-        mock_h5open.assert_called()
-
-        # Initialize the array client -- no need to reopen the files
-        mock_h5open.reset_mock()
-        arr = client["a"]["d"]
-        assert arr.structure().shape == (20,)
-        assert arr.structure().chunks == ((3, 3, 3, 1) * 2,)
-        assert arr.metadata is not None
-        mock_h5open.assert_not_called()
-
-        # Read the entire array: files are opened once to get the specs and then again,
-        # four times each, to fetch each chunk separately. Additionally, the first file is opened once
-        # adain when initialized from catalog to get the metadata
-        assert arr.read() is not None
-        # 2 for specs, 4*2 for chunks, 1 for metadata
-        assert mock_h5open.call_count == 2 + 4 * 2 + 1
-        files_opened = [call.args[0].name for call in mock_h5open.call_args_list]
-        # First file: 1 for specs, 4 for chunks, 1 for metadata
-        assert files_opened.count(file_paths[0].name) == 4 + 1 + 1
-        # Second file: 1 for specs, 4 for chunks
-        assert files_opened.count(file_paths[1].name) == 4 + 1
-
-        # Read a slice that only touches one file: only the relevant file should be opened
-        mock_h5open.reset_mock()
-        assert arr[:1] is not None
-        assert mock_h5open.call_count == 4  # 2 for specs, 1 for chunks, 1 for metadata
-        files_opened = [call.args[0].name for call in mock_h5open.call_args_list]
-        assert files_opened.count(file_paths[0].name) == 3
-        assert files_opened.count(file_paths[1].name) == 1  # only to get the specs
-
-        # Read everything from the second file
-        mock_h5open.reset_mock()
-        assert arr[-10:] is not None
-        assert mock_h5open.call_count == 7
-        files_opened = [call.args[0].name for call in mock_h5open.call_args_list]
-        # First file: 1 for specs, 1 for metadata
-        assert files_opened.count(file_paths[0].name) == 1 + 1
-        # Second file: 4 for chunks, 1 for specs
-        assert files_opened.count(file_paths[1].name) == 4 + 1
-
-        # Read a slice that has one value from each of the files
-        mock_h5open.reset_mock()
-        assert arr[9:11] is not None
-        assert mock_h5open.call_count == 2 + 2 + 1
-        files_opened = [call.args[0].name for call in mock_h5open.call_args_list]
-        # First file: # 1 for specs, 1 for chunk, 1 for metadata
-        assert files_opened.count(file_paths[0].name) == 3
-        assert files_opened.count(file_paths[1].name) == 2  # 1 for specs, 1 for chunk
-
-    # Try opening the files directly to check that they are closed after reading
-    h5py.File(file_paths[0], "r", swmr=swmr).close()
-    h5py.File(file_paths[1], "r", swmr=swmr).close()
-
+            arr = client["a"]["d"]
+            assert arr.structure().shape == (20,)
+            assert arr.structure().chunks == ((3, 3, 3, 1) * 2,)
+            assert arr.read() is not None
+            assert arr[9:11] is not None
+            mock_file.assert_not_called()
+
+            # A file modified on disk is reopened
+            stat = os.stat(file_paths[0])
+            os.utime(file_paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert arr[:1] is not None
+            files_opened = [call.args[0].name for call in mock_file.call_args_list]
+            assert files_opened == [file_paths[0].name]
+
+    # A file open with the other SWMR flag is dropped from the cache and reopened
+    hdf5_adapters.open_hdf5_file(file_paths[1], swmr=not swmr)
+    hdf5_adapters._open_files.clear()
+    gc.collect()
+
+    # Try opening the files directly to check that they are closed once evicted
     h5py.File(file_paths[0], "r", swmr=not swmr).close()
-    h5py.File(file_paths[1], "r", swmr=not swmr).close()
+    h5py.File(file_paths[1], "r", swmr=swmr).close()
@@ -208,3 +208,67 @@ def test_unbounded_keys_slice(client):
     actual_nums = [int(key) for key in keys]
     expected_nums = [3, 4, 5, 6, 7, 8, 9]
     assert actual_nums == expected_nums
+
+
+def test_cursor_keys(client):
+    "Pages after the first continue from a cursor given in links.next."
+    with record_history() as history:
+        keys = list(client.keys().page_size(3))
+    assert [int(key) for key in keys] == list(range(N))
+    assert len(history.requests) == 4
+    assert "page[cursor]" not in history.requests[0].url.params
+    for request in history.requests[1:]:
+        assert "page[cursor]" in request.url.params
+        assert "page[offset]" not in request.url.params
+
+
+def test_cursor_values_reversed(client):
+    "Cursors also work when the default sorting is reversed."
+    with record_history() as history:
+        items = list(client.sort(("", -1)).values().page_size(3))
+    assert [item.metadata["num"] for item in items] == list(reversed(range(N)))
+    # Reversing the sort makes the client count the entries first.
+    count_request, first_page, *later_pages = history.requests
+    assert count_request.url.params["fields"] == "count"
+    assert "page[offset]" in first_page.url.params
+    assert len(later_pages) == 3
+    for request in later_pages:
+        assert "page[cursor]" in request.url.params
+
+
+def test_cursor_not_used_for_metadata_sort(client):
+    "Sorting on metadata falls back to offsets."
+    with record_history() as history:
+        items = list(client.sort(("num", -1)).values().page_size(3))
+    assert [item.metadata["num"] for item in items] == list(reversed(range(N)))
+    for request in history.requests:
+        assert "page[cursor]" not in request.url.params
+
+
+def test_invalid_cursor(client):
+    response = client.context.http_client.get(
+        client.item["links"]["search"], params={"page[cursor]": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+def test_cursor_row_deleted(client):
+    "If the row a cursor continues from is deleted, the page offset is used."
+    container = client.create_container("deleted_anchor")
+    try:
+        for i in range(N):
+            container.create_container(key=str(i))
+        response = client.context.http_client.get(
+            container.item["links"]["search"], params={"page[limit]": 3}
+        )
+        response.raise_for_status()
+        next_url = response.json()["links"]["next"]
+        assert "page[cursor]" in next_url
+        container["2"].delete()
+        response = client.context.http_client.get(next_url)
+        response.raise_for_status()
+        keys = [item["id"] for item in response.json()["data"]]
+        # Offset 3 now begins at "4", as "2" has gone.
+        assert keys == ["4", "5", "6"]
+    finally:
+        container.delete(recursive=True)
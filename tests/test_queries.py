@@ -77,10 +77,16 @@ def event_loop():
     loop.close()
 
 
-@pytest_asyncio.fixture(scope="module", params=["map", "sqlite", "postgresql"])
+@pytest_asyncio.fixture(
+    scope="module", params=["map", "indexed-map", "sqlite", "postgresql"]
+)
 async def client(request, tmpdir_module):
-    if request.param == "map":
-        tree = MapAdapter(mapping, metadata={"backend": request.param})
+    if request.param in {"map", "indexed-map"}:
+        tree = MapAdapter(
+            mapping,
+            metadata={"backend": "map"},
+            indexed=request.param == "indexed-map",
+        )
         app = build_app(tree)
         with Context.from_app(app) as context:
             client = from_context(context)
@@ -381,3 +387,18 @@ def test_like(client):
     expected = ["full_text_test_case", "full_text_test_case_urple"]
     results = client.search(Like("color", "%urple"))
     assert set(results) == set(expected)
+
+
+def test_indexed_map_adapter():
+    tree = MapAdapter(mapping, indexed=True)
+    results = tree.search(Comparison("ge", "number", 20)).search(
+        SpecsQuery(include=["z"])
+    )
+    assert list(results) == ["z"]
+    # The results share the index, which is built once.
+    assert results.get_index() is tree.get_index()
+    assert list(tree.search(In("number", [3, 1]))) == ["b", "d"]
+    # Queries that the index cannot answer exactly fall back to a scan.
+    assert list(tree.search(Eq("letters", list(string.ascii_lowercase)))) == [
+        "does_contain_z"
+    ]
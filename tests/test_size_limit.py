@@ -71,6 +71,20 @@ def test_array(client, tmpdir):
             client["small_array"].export(path)  # too big
 
 
+def test_array_rejected_before_read(client, monkeypatch):
+    """
+    An array over the size limit is rejected without reading it.
+    """
+
+    def read(*args, **kwargs):
+        raise AssertionError("The array should not be read.")
+
+    monkeypatch.setattr(ArrayAdapter, "read", read)
+    with low_size_limit():
+        with fail_with_status_code(HTTP_400_BAD_REQUEST):
+            client["small_array"].read()
+
+
 def test_dataframe(client, tmpdir):
     """
     Download an dataframe over the size limit.
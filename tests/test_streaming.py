@@ -110,6 +110,47 @@ async def test_in_memory_cache_datastore_close_sets_end_of_stream():
     assert orjson.loads(metadata_bytes)["end_of_stream"] is True
 
 
+@pytest.mark.asyncio
+async def test_replay_fetches_history_in_batches():
+    datastore = streaming.TTLCacheDatastore(
+        {"maxsize": 100, "seq_ttl": 60, "data_ttl": 60, "replay_batch_size": 2}
+    )
+    node_id = "node-3"
+    for i in range(5):
+        sequence = await datastore.incr_seq(node_id)
+        await datastore.set(node_id, sequence, {"type": "table-data", "i": i}, b"")
+    await datastore.close(node_id)
+
+    fetched = []
+    get_many = datastore.get_many
+
+    async def counting_get_many(keys, *fields):
+        fetched.append(keys)
+        return await get_many(keys, *fields)
+
+    datastore.get_many = counting_get_many
+    sent = []
+
+    async def formatter(websocket, metadata, payload):
+        sent.append(metadata)
+
+    class FakeWebSocket:
+        async def accept(self):
+            pass
+
+        async def close(self, code, reason):
+            pass
+
+    handler = datastore.make_ws_handler(
+        FakeWebSocket(), formatter, "uri", node_id, {"type": "table-schema"}
+    )
+    await asyncio.wait_for(handler(1), timeout=5)
+    # The schema, then the five messages, replayed in order
+    assert [msg.get("i") for msg in sent] == [None, 0, 1, 2, 3, 4]
+    # Six sequence numbers, counting the end of the stream, in batches of 2
+    assert [len(keys) for keys in fetched] == [2, 2, 2]
+
+
 @pytest.mark.asyncio
 async def test_pubsub_fanout_and_cleanup():
     pubsub = streaming.PubSub()
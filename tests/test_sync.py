@@ -161,3 +161,26 @@ def test_copy_dict():
             select_dict = dict(source.items()[:2])
             copy(select_dict, dest)
             assert list(select_dict) == list(dest)
+
+
+def test_copy_resume(tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    with client_factory() as dest:
+        with client_factory() as source:
+            populate_internal(source)
+            copy(source, dest, max_workers=4, batch_size=2, checkpoint=checkpoint)
+            assert list(source) == list(dest)
+            assert list(source["c"]) == list(dest["c"])
+
+            # Pretend that the copy was interrupted after creating the nodes
+            # but before writing any data.
+            lines = checkpoint.read_text().splitlines()
+            assert '["block", ["c", "A"], [0]]' in lines
+            kept = [line for line in lines if line.startswith('["node"')]
+            checkpoint.write_text("\n".join(kept) + "\n")
+
+            # Resuming creates nothing twice, so it does not conflict.
+            copy(source, dest, checkpoint=checkpoint)
+            assert list(source) == list(dest)
+            assert list(source["c"]) == list(dest["c"])
+            read(dest, strict=True)
@@ -30,6 +30,7 @@ from starlette.status import (
     HTTP_422_UNPROCESSABLE_CONTENT,
 )
 
+from tiled.adapters.parquet import ParquetDatasetAdapter
 from tiled.catalog import in_memory
 from tiled.catalog.adapter import CatalogContainerAdapter
 from tiled.client import Context, from_context, record_history
@@ -37,7 +38,8 @@ from tiled.client.utils import ClientError
 from tiled.mimetypes import PARQUET_MIMETYPE
 from tiled.queries import Key
 from tiled.server.app import build_app
-from tiled.structures.array import BuiltinDtype
+from tiled.server.schemas import MAX_BATCH_NODES
+from tiled.structures.array import ArrayStructure, BuiltinDtype
 from tiled.structures.core import Spec, StructureFamily
 from tiled.structures.data_source import DataSource
 from tiled.structures.sparse import COOStructure
@@ -772,6 +774,130 @@ def test_write_with_specified_mimetype(tree):
             )
 
 
+def test_new_batch(tree, tmpdir):
+    with Context.from_app(build_app(tree)) as context:
+        client = from_context(context)
+        arr = numpy.arange(10)
+        structure = ArrayStructure.from_array(arr)
+        with record_history() as history:
+            a, b, c = client.new_batch(
+                [
+                    {
+                        "key": "a",
+                        "structure_family": "array",
+                        "data_sources": [
+                            DataSource(structure_family="array", structure=structure)
+                        ],
+                        "metadata": {"color": "red"},
+                    },
+                    {"key": "b", "structure_family": "container", "data_sources": []},
+                    {
+                        "structure_family": "array",
+                        "data_sources": [
+                            DataSource(structure_family="array", structure=structure)
+                        ],
+                    },
+                ]
+            )
+        assert len(history.requests) == 1
+        a.write(arr)
+        c.write(arr + 1)
+        assert client["a"].metadata["color"] == "red"
+        numpy.testing.assert_equal(client["a"].read(), arr)
+        numpy.testing.assert_equal(client[c.item["id"]].read(), arr + 1)
+        b.create_container("d")
+        assert list(client["b"]) == ["d"]
+
+        # If any key is taken, no nodes are created.
+        with fail_with_status_code(HTTP_409_CONFLICT):
+            client.new_batch(
+                [
+                    {"key": "e", "structure_family": "container", "data_sources": []},
+                    {"key": "b", "structure_family": "container", "data_sources": []},
+                ]
+            )
+        assert "e" not in client
+
+        # If any node cannot be created, storage allocated for the others is
+        # deleted.
+        with fail_with_status_code(HTTP_415_UNSUPPORTED_MEDIA_TYPE):
+            client.new_batch(
+                [
+                    {
+                        "key": key,
+                        "structure_family": "array",
+                        "data_sources": [
+                            DataSource(
+                                structure_family="array",
+                                structure=structure,
+                                mimetype=mimetype,
+                            )
+                        ],
+                    }
+                    for key, mimetype in [
+                        ("f", None),
+                        ("g", "application/x-does-not-exist"),
+                    ]
+                ]
+            )
+        assert "f" not in client
+        assert "f" not in os.listdir(tmpdir / "data")
+
+        # Batches are limited in size.
+        with fail_with_status_code(HTTP_422_UNPROCESSABLE_CONTENT):
+            client.new_batch(
+                [
+                    {"structure_family": "container", "data_sources": []}
+                    for _ in range(MAX_BATCH_NODES + 1)
+                ]
+            )
+
+
+def test_precomputed_etag(tree, monkeypatch):
+    "Conditional requests for file-backed data are answered without reading it."
+    with Context.from_app(build_app(tree)) as context:
+        client = from_context(context)
+        df = pandas.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]})
+        x = client.new(
+            "table",
+            [
+                DataSource(
+                    structure_family=StructureFamily.table,
+                    structure=TableStructure.from_pandas(df),
+                    mimetype=PARQUET_MIMETYPE,
+                ),
+            ],
+        )
+        x.write_partition(0, df)
+        url = x.item["links"]["full"]
+        headers = {"Accept": APACHE_ARROW_FILE_MIME_TYPE}
+        response = context.http_client.get(url, headers=headers)
+        response.raise_for_status()
+        etag = response.headers["ETag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("The data should not have been read.")
+
+        with monkeypatch.context() as m:
+            m.setattr(ParquetDatasetAdapter, "read_arrow", fail)
+            response = context.http_client.get(
+                url, headers={**headers, "If-None-Match": etag}
+            )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        # The ETag depends on the request...
+        response = context.http_client.get(url, params={"field": "A"}, headers=headers)
+        assert response.headers["ETag"] != etag
+        # ...and changes when the data does.
+        x.write_partition(0, pandas.DataFrame({"A": [1, 2], "B": [4, 5]}))
+        response = context.http_client.get(
+            url, headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
 @pytest.mark.parametrize(
     "orig_file, file_to_append, expected_file",
     [
@@ -1,3 +1,4 @@
+import json
 import math
 import string
 import warnings
@@ -342,3 +343,42 @@ def test_writing_not_implemented(prefix, server_url, fs):
     with pytest.raises(zarr.errors.ReadOnlyError if ZARR_LIB_V2 else ValueError):
         grp = zarr.open(fs.get_mapper(url), mode="r")
         grp["random_2d"][0, 0] = 0.0
+
+
+@pytest.mark.asyncio
+async def test_stored_chunks_passed_through(prefix, tmp_path):
+    "Chunks of an array stored as Zarr are served as stored, not re-encoded."
+    from tiled.adapters.zarr import ZarrAdapter
+    from tiled.utils import ensure_uri
+
+    zarr_format = 2 if prefix == "/zarr/v2" else 3
+    kwargs = {} if ZARR_LIB_V2 else {"zarr_format": zarr_format}
+    expected = rng.random((10, 10))
+    stored = zarr.open(
+        str(tmp_path / "a.zarr"), mode="w", shape=(10, 10), chunks=(5, 5), **kwargs
+    )
+    stored[:] = expected
+    tree = MapAdapter({"a": ZarrAdapter.from_uris(ensure_uri(tmp_path / "a.zarr"))})
+    app = build_app(tree, authentication=Authentication(single_user_api_key="secret"))
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": "Apikey secret"},
+        follow_redirects=True,
+    ) as client:
+        if zarr_format == 2:
+            metadata = (await client.get(f"{prefix}/a/.zarray")).json()
+            stored_metadata = json.loads((tmp_path / "a.zarr" / ".zarray").read_text())
+            assert metadata["compressor"] == stored_metadata["compressor"]
+            response = await client.get(f"{prefix}/a/1.0")
+            chunk = (tmp_path / "a.zarr" / "1.0").read_bytes()
+        else:
+            metadata = (await client.get(f"{prefix}/a/zarr.json")).json()
+            stored_metadata = json.loads(
+                (tmp_path / "a.zarr" / "zarr.json").read_text()
+            )
+            assert metadata["codecs"] == stored_metadata["codecs"]
+            response = await client.get(f"{prefix}/a/c/1/0")
+            chunk = (tmp_path / "a.zarr" / "c" / "1" / "0").read_bytes()
+    assert response.status_code == HTTP_200_OK
+    assert response.content == chunk
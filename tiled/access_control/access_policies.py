@@ -1,8 +1,10 @@
+import asyncio
 import logging
 import os
 from abc import ABC, abstractmethod
 from typing import Generic, Optional, Tuple, TypeVar
 
+import cachetools
 import httpx
 from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError
 
@@ -17,6 +19,11 @@ from .scopes import ALL_SCOPES, NO_SCOPES, PUBLIC_SCOPES
 ALL_ACCESS = []
 NO_ACCESS = Sentinel("NO_ACCESS")
 
+# Decisions on what may be read are reused, for a short time, by
+# ExternalPolicyDecisionPoint.
+DEFAULT_DECISION_CACHE_SIZE = 1024
+DEFAULT_DECISION_CACHE_TTL = 5  # seconds
+
 
 logger = logging.getLogger(__name__)
 handler = logging.StreamHandler()
@@ -31,6 +38,8 @@ if log_level:
 class DummyAccessPolicy(AccessPolicy):
     "Impose no access restrictions."
 
+    node_independent_filters = True
+
     async def init_node(
         self,
         principal: Principal,
@@ -64,6 +73,8 @@ class DummyAccessPolicy(AccessPolicy):
 
 
 class TagBasedAccessPolicy(AccessPolicy):
+    node_independent_filters = True
+
     def __init__(
         self,
         *,
@@ -77,12 +88,6 @@ class TagBasedAccessPolicy(AccessPolicy):
 
         access_tags_parser = import_object(access_tags_parser)
         self.access_tags_parser = access_tags_parser.from_uri(tags_db["uri"])
-        self.is_tag_defined = self.access_tags_parser.is_tag_defined
-        self.get_public_tags = self.access_tags_parser.get_public_tags
-        self.get_scopes_from_tag = self.access_tags_parser.get_scopes_from_tag
-        self.is_tag_owner = self.access_tags_parser.is_tag_owner
-        self.is_tag_public = self.access_tags_parser.is_tag_public
-        self.get_tags_from_scope = self.access_tags_parser.get_tags_from_scope
 
         self.read_scopes = PUBLIC_SCOPES
         self.unremovable_scopes = ["read:metadata", "write:metadata"]
@@ -130,6 +135,8 @@ class TagBasedAccessPolicy(AccessPolicy):
                     )
             access_tags = set(access_blob["tags"])
             include_public_tag = False
+            # Answer every lookup for this request from one snapshot.
+            access_tags_snapshot = await self.access_tags_parser.snapshot()
             for tag in access_tags:
                 if authn_access_tags is not None:
                     if tag not in authn_access_tags:
@@ -142,9 +149,9 @@ class TagBasedAccessPolicy(AccessPolicy):
                         raise ValueError(
                             "Cannot apply 'public' tag to node: only Tiled admins can apply the 'public' tag."
                         )
-                elif not await self.is_tag_defined(tag):
+                elif not access_tags_snapshot.is_tag_defined(tag):
                     raise ValueError(f"Cannot apply tag to node: {tag=} is not defined")
-                elif not await self.is_tag_owner(tag, identifier):
+                elif not access_tags_snapshot.is_tag_owner(tag, identifier):
                     # admins can ignore the tag ownership check
                     if not self._is_admin(authn_scopes):
                         raise ValueError(
@@ -169,7 +176,9 @@ class TagBasedAccessPolicy(AccessPolicy):
                 # check that the access_blob would not result in invalid scopes for user.
                 new_scopes = set()
                 for tag in access_tags_from_policy:
-                    new_scopes.update(await self.get_scopes_from_tag(tag, identifier))
+                    new_scopes.update(
+                        access_tags_snapshot.get_scopes_from_tag(tag, identifier)
+                    )
                 if not all(scope in new_scopes for scope in self.unremovable_scopes):
                     raise ValueError(
                         f"Cannot init node with tags: operation does not grant necessary scopes.\n"
@@ -224,6 +233,8 @@ class TagBasedAccessPolicy(AccessPolicy):
                 )
         access_tags = set(access_blob["tags"])
         include_public_tag = False
+        # Answer every lookup for this request from one snapshot.
+        access_tags_snapshot = await self.access_tags_parser.snapshot()
         # check for tags that need to be added
         for tag in access_tags:
             if authn_access_tags is not None:
@@ -245,9 +256,9 @@ class TagBasedAccessPolicy(AccessPolicy):
                     raise ValueError(
                         "Cannot apply 'public' tag to node: only Tiled admins can apply the 'public' tag."
                     )
-            elif not await self.is_tag_defined(tag):
+            elif not access_tags_snapshot.is_tag_defined(tag):
                 raise ValueError(f"Cannot apply tag to node: {tag=} is not defined")
-            elif not await self.is_tag_owner(tag, identifier):
+            elif not access_tags_snapshot.is_tag_owner(tag, identifier):
                 # admins can ignore the tag ownership check
                 if not self._is_admin(authn_scopes):
                     raise ValueError(
@@ -280,11 +291,11 @@ class TagBasedAccessPolicy(AccessPolicy):
                         raise ValueError(
                             "Cannot remove 'public' tag from node: only Tiled admins can remove the 'public' tag."
                         )
-                elif not await self.is_tag_defined(tag):
+                elif not access_tags_snapshot.is_tag_defined(tag):
                     raise ValueError(
                         f"Cannot remove tag from node: {tag=} is not defined"
                     )
-                elif not await self.is_tag_owner(tag, identifier):
+                elif not access_tags_snapshot.is_tag_owner(tag, identifier):
                     # admins can ignore the tag ownership check
                     if not self._is_admin(authn_scopes):
                         raise ValueError(
@@ -305,7 +316,9 @@ class TagBasedAccessPolicy(AccessPolicy):
             # converting from user-owned node to shared (tagged) node
             new_scopes = set()
             for tag in access_tags_from_policy:
-                new_scopes.update(await self.get_scopes_from_tag(tag, identifier))
+                new_scopes.update(
+                    access_tags_snapshot.get_scopes_from_tag(tag, identifier)
+                )
             if not all(scope in new_scopes for scope in self.unremovable_scopes):
                 raise ValueError(
                     f"Cannot modify tags on node: operation removes unremovable scopes.\n"
@@ -347,18 +360,21 @@ class TagBasedAccessPolicy(AccessPolicy):
                 if authn_access_tags is None and identifier == node.access_blob["user"]:
                     allowed = self.scopes
             elif "tags" in node.access_blob:
+                access_tags_snapshot = await self.access_tags_parser.snapshot()
                 for tag in node.access_blob["tags"]:
                     if authn_access_tags is not None:
                         if tag not in authn_access_tags:
                             continue
-                    if await self.is_tag_public(tag):
+                    if access_tags_snapshot.is_tag_public(tag):
                         allowed.update(self.read_scopes)
                         if tag == self.public_tag:
                             continue
-                    elif not await self.is_tag_defined(tag):
+                    elif not access_tags_snapshot.is_tag_defined(tag):
                         continue
                     if identifier is not None:
-                        tag_scopes = await self.get_scopes_from_tag(tag, identifier)
+                        tag_scopes = access_tags_snapshot.get_scopes_from_tag(
+                            tag, identifier
+                        )
                         allowed.update(
                             tag_scopes if tag_scopes.issubset(self.scopes) else set()
                         )
@@ -378,6 +394,7 @@ class TagBasedAccessPolicy(AccessPolicy):
         if not scopes.issubset(self.scopes):
             return NO_ACCESS
 
+        access_tags_snapshot = await self.access_tags_parser.snapshot()
         tag_list = set()
         if principal is None:
             identifier = None
@@ -391,7 +408,7 @@ class TagBasedAccessPolicy(AccessPolicy):
             tag_list.update(
                 set.intersection(
                     *[
-                        await self.get_tags_from_scope(scope, identifier)
+                        access_tags_snapshot.get_tags_from_scope(scope, identifier)
                         for scope in scopes
                     ]
                 )
@@ -400,7 +417,9 @@ class TagBasedAccessPolicy(AccessPolicy):
         tag_list.update(
             set.intersection(
                 *[
-                    await self.get_public_tags() if scope in self.read_scopes else set()
+                    access_tags_snapshot.get_public_tags()
+                    if scope in self.read_scopes
+                    else set()
                     for scope in scopes
                 ]
             )
@@ -421,6 +440,15 @@ class ResultHolder(BaseModel, Generic[T]):
 
 
 class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
+    # filters() below does not depend on the node. A subclass that overrides
+    # filters() must opt in again, as its filters() may.
+    node_independent_filters = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if ("filters" in vars(cls)) and ("node_independent_filters" not in vars(cls)):
+            cls.node_independent_filters = False
+
     def __init__(
         self,
         authorization_provider: HttpUrl,
@@ -430,6 +458,9 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         modify_node_endpoint: Optional[str] = None,
         provider: Optional[str] = None,
         empty_access_blob_public: Optional[bool] = None,
+        max_connections: int = 100,
+        decision_cache_size: int = DEFAULT_DECISION_CACHE_SIZE,
+        decision_cache_ttl: float = DEFAULT_DECISION_CACHE_TTL,
     ):
         """
         Initialize an access policy configuration.
@@ -456,6 +487,14 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         empty_tag_list_include_all: bool, optional, default False
             Should an empty list of filters the unfiltered list of child nodes, rather
             than filtering out all nodes with any tags? Default False
+        max_connections: int, optional
+            Maximum number of connections to the authorization provider, which
+            are pooled and kept alive between decisions. Default 100.
+        decision_cache_size: int, optional
+            Number of decisions on which tags a user may view, and which scopes
+            they have on a node, to keep. Set to 0 to disable. Default 1024.
+        decision_cache_ttl: float, optional
+            Time in seconds for which those decisions are kept. Default 5.
         """
         self._create_node = str(authorization_provider) + create_node_endpoint
         self._modify_node = str(authorization_provider) + (
@@ -465,6 +504,30 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         self._node_scopes = str(authorization_provider) + scopes_endpoint
         self._empty_access_blob_public = empty_access_blob_public
         self._provider = provider
+        self._limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self._client = None
+        # Decisions keyed on (endpoint, input), where the input encodes the
+        # principal, their access tags and scopes, and the node's access blob
+        self._decision_cache = (
+            cachetools.TTLCache(decision_cache_size, decision_cache_ttl)
+            if decision_cache_size
+            else None
+        )
+        self._pending_decisions = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        "A client with a connection pool, shared by all decisions"
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self._limits)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @abstractmethod
     def build_input(
@@ -476,6 +539,38 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
     ) -> str:
         ...
 
+    async def _get_cached_external_decision(
+        self,
+        decision_endpoint: str,
+        input: str,
+        decision_type: type[T],
+    ) -> Optional[T]:
+        """
+        Get a decision from the cache or else from the authorization provider.
+
+        Concurrent requests for the same decision share one round trip.
+        """
+        if self._decision_cache is None:
+            return await self._get_external_decision(
+                decision_endpoint, input, decision_type
+            )
+        key = (decision_endpoint, input)
+        try:
+            return self._decision_cache[key]
+        except KeyError:
+            pass
+        pending = self._pending_decisions.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._get_external_decision(decision_endpoint, input, decision_type)
+            )
+            self._pending_decisions[key] = pending
+            pending.add_done_callback(lambda _: self._pending_decisions.pop(key, None))
+        # Shield the shared request from the cancellation of any one caller.
+        decision = await asyncio.shield(pending)
+        self._decision_cache[key] = decision
+        return decision
+
     async def _get_external_decision(
         self,
         decision_endpoint: str,
@@ -483,8 +578,7 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         decision_type: type[T],
     ) -> Optional[T]:
         logger.debug(f"Requesting auth {decision_endpoint=} for {input=}")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(decision_endpoint, content=input)
+        response = await self.client.post(decision_endpoint, content=input)
         response.raise_for_status()
         try:
             logger.debug(f"Deserializing auth {response.text=} as {decision_type=}")
@@ -540,7 +634,7 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         authn_scopes: Scopes,
         scopes: Scopes,
     ) -> Filters:
-        tags = await self._get_external_decision(
+        tags = await self._get_cached_external_decision(
             self._user_tags,
             self.build_input(principal, authn_access_tags, authn_scopes),
             ResultHolder[list[str]],
@@ -557,7 +651,7 @@ class ExternalPolicyDecisionPoint(AccessPolicy, ABC):
         authn_access_tags: Optional[AccessTags],
         authn_scopes: Scopes,
     ) -> Scopes:
-        scopes = await self._get_external_decision(
+        scopes = await self._get_cached_external_decision(
             self._node_scopes,
             self.build_input(
                 principal,
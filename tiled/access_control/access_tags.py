@@ -1,8 +1,10 @@
 import sqlite3
 import warnings
+from collections import defaultdict
 from contextlib import closing
 from pathlib import Path
 from sys import intern
+from urllib.parse import unquote
 
 import aiosqlite
 import yaml
@@ -10,6 +12,73 @@ import yaml
 from ..utils import InterningLoader, ensure_specified_sql_driver
 
 
+class AccessTagsSnapshot:
+    """
+    An immutable, in-memory copy of a compiled access tags database
+
+    Policy questions are answered from this with no I/O. When the database
+    changes, a new snapshot is loaded and replaces this one whole.
+    """
+
+    def __init__(self, tags, public_tags, user_tag_scopes, user_tag_owners):
+        self.tags = frozenset(tags)
+        self.public_tags = frozenset(public_tags)
+        scopes_by_user_tag = defaultdict(set)
+        tags_by_user_scope = defaultdict(set)
+        for user_name, tag_name, scope_name in user_tag_scopes:
+            scopes_by_user_tag[user_name, tag_name].add(scope_name)
+            tags_by_user_scope[user_name, scope_name].add(tag_name)
+        self.scopes_by_user_tag = {
+            key: frozenset(value) for key, value in scopes_by_user_tag.items()
+        }
+        self.tags_by_user_scope = {
+            key: frozenset(value) for key, value in tags_by_user_scope.items()
+        }
+        self.tag_owners = frozenset(user_tag_owners)
+
+    @classmethod
+    async def load(cls, db):
+        "Read the whole database, in one transaction so that it is consistent."
+        await db.execute("BEGIN;")
+        try:
+            results = []
+            for query in [
+                "SELECT name FROM tags;",
+                "SELECT name FROM public_tags;",
+                "SELECT user_name, tag_name, scope_name FROM user_tag_scopes;",
+                "SELECT tag_name, user_name FROM user_tag_owners;",
+            ]:
+                async with db.execute(query) as cursor:
+                    results.append(await cursor.fetchall())
+        finally:
+            await db.execute("COMMIT;")
+        tags, public_tags, user_tag_scopes, user_tag_owners = results
+        return cls(
+            (name for (name,) in tags),
+            (name for (name,) in public_tags),
+            user_tag_scopes,
+            user_tag_owners,
+        )
+
+    def is_tag_defined(self, name):
+        return name in self.tags
+
+    def get_public_tags(self):
+        return set(self.public_tags)
+
+    def get_scopes_from_tag(self, tagname, username):
+        return set(self.scopes_by_user_tag.get((username, tagname), ()))
+
+    def is_tag_owner(self, tagname, username):
+        return (tagname, username) in self.tag_owners
+
+    def is_tag_public(self, name):
+        return name in self.public_tags
+
+    def get_tags_from_scope(self, scope, username):
+        return set(self.tags_by_user_scope.get((username, scope), ()))
+
+
 class AccessTagsParser:
     @classmethod
     def from_uri(cls, uri):
@@ -35,60 +104,98 @@ class AccessTagsParser:
     def __init__(self, db=None, uri=None):
         self._uri = uri
         self._db = db
+        self._path = _path_from_uri(uri)
+        self._snapshot = None
+        self._version = None
 
     async def connect(self):
+        await self._open()
+        # Load the snapshot now, so that any problem surfaces at startup.
+        await self.snapshot()
+
+    async def _open(self):
         if self._db is None:
             self._db = await aiosqlite.connect(
                 self._uri, uri=True, check_same_thread=False
             )
 
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def snapshot(self):
+        """
+        Return an in-memory snapshot of the database.
+
+        Check whether the database has changed on every call, so that revoked
+        access takes effect immediately, and if so load a new snapshot. For a
+        database file this costs a stat of the file; for a database in memory,
+        a PRAGMA data_version query.
+        """
+        version = await self._database_version()
+        if (self._snapshot is None) or (version != self._version):
+            await self._open()
+            self._snapshot = await AccessTagsSnapshot.load(self._db)
+            self._version = version
+        return self._snapshot
+
+    async def _database_version(self):
+        if self._path is not None:
+            return _file_version(self._path)
+        # data_version changes whenever another connection commits a change.
+        await self._open()
+        async with self._db.execute("PRAGMA data_version;") as cursor:
+            (version,) = await cursor.fetchone()
+        return version
+
     async def is_tag_defined(self, name):
-        async with self._db.cursor() as cursor:
-            await cursor.execute("SELECT 1 FROM tags WHERE name = ?;", (name,))
-            row = await cursor.fetchone()
-            found_tagname = bool(row)
-        return found_tagname
+        return (await self.snapshot()).is_tag_defined(name)
 
     async def get_public_tags(self):
-        async with self._db.cursor() as cursor:
-            await cursor.execute("SELECT name FROM public_tags;")
-            public_tags = {name for (name,) in await cursor.fetchall()}
-        return public_tags
+        return (await self.snapshot()).get_public_tags()
 
     async def get_scopes_from_tag(self, tagname, username):
-        async with self._db.cursor() as cursor:
-            await cursor.execute(
-                "SELECT scope_name FROM user_tag_scopes WHERE tag_name = ? AND user_name = ?;",
-                (tagname, username),
-            )
-            user_tag_scopes = {scope for (scope,) in await cursor.fetchall()}
-        return user_tag_scopes
+        return (await self.snapshot()).get_scopes_from_tag(tagname, username)
 
     async def is_tag_owner(self, tagname, username):
-        async with self._db.cursor() as cursor:
-            await cursor.execute(
-                "SELECT 1 FROM user_tag_owners WHERE tag_name = ? AND user_name = ?;",
-                (tagname, username),
-            )
-            row = await cursor.fetchone()
-            found_owner = bool(row)
-        return found_owner
+        return (await self.snapshot()).is_tag_owner(tagname, username)
 
     async def is_tag_public(self, name):
-        async with self._db.cursor() as cursor:
-            await cursor.execute("SELECT 1 FROM public_tags WHERE name = ?;", (name,))
-            row = await cursor.fetchone()
-            found_public = bool(row)
-        return found_public
+        return (await self.snapshot()).is_tag_public(name)
 
     async def get_tags_from_scope(self, scope, username):
-        async with self._db.cursor() as cursor:
-            await cursor.execute(
-                "SELECT tag_name FROM user_tag_scopes WHERE user_name = ? AND scope_name = ?;",
-                (username, scope),
-            )
-            user_scope_tags = {tag for (tag,) in await cursor.fetchall()}
-        return user_scope_tags
+        return (await self.snapshot()).get_tags_from_scope(scope, username)
+
+
+def _path_from_uri(uri):
+    "Return the path of the database file named by a SQLite URI, or None."
+    if uri is None:
+        return None
+    path, _, query = uri.removeprefix("file:").partition("?")
+    if ("mode=memory" in query) or (path in {"", ":memory:"}):
+        return None
+    return Path(unquote(path))
+
+
+def _file_version(path):
+    """
+    Identify the current version of a database file, or return None.
+
+    In WAL mode, changes are written to a separate -wal file and only later
+    copied into the main file, so both files are considered.
+    """
+    if path is None:
+        return None
+    version = []
+    for filepath in [path, path.with_name(path.name + "-wal")]:
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            version.append(None)
+        else:
+            version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
 
 
 def create_access_tags_tables(db):
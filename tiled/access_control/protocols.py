@@ -7,6 +7,11 @@ from ..type_aliases import AccessBlob, AccessTags, Filters, Scopes
 
 
 class AccessPolicy(ABC):
+    # Set True if filters() gives the same result for every node, given the
+    # same principal, access tags, and scopes. The server may then evaluate it
+    # once for a whole path, rather than once per node along the path.
+    node_independent_filters: bool = False
+
     @abstractmethod
     async def init_node(
         self,
@@ -1,12 +1,13 @@
 import copy
+import os
+import uuid
 from collections.abc import Set
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import quote_plus
 
 import pandas
 import pyarrow
-import pyarrow.feather as feather
 
 from tiled.adapters.core import Adapter
 
@@ -18,6 +19,7 @@ from ..structures.table import TableStructure
 from ..type_aliases import JSON
 from ..utils import ensure_uri, path_from_uri
 from .array import ArrayAdapter
+from .table_filters import Filter, check_columns, select_batches
 from .utils import init_adapter_from_catalog
 
 
@@ -37,8 +39,11 @@ class ArrowAdapter(Adapter[TableStructure]):
         # TODO Store data_uris instead and generalize to non-file schemes.
         self._partition_paths = [path_from_uri(uri) for uri in data_uris]
         if structure is None:
-            table = feather.read_table(self._partition_paths)
-            structure = TableStructure.from_arrow_table(table)
+            # Only the schema is needed, and it is read from the file footer.
+            schema = _open_file(self._partition_paths[0]).schema
+            structure = TableStructure.from_schema(
+                schema, npartitions=len(self._partition_paths)
+            )
         super().__init__(structure, metadata=metadata, specs=specs)
 
     @classmethod
@@ -95,7 +100,7 @@ class ArrowAdapter(Adapter[TableStructure]):
     def get(self, key: str) -> Union[ArrayAdapter, None]:
         if key not in self.structure().columns:
             return None
-        return ArrayAdapter.from_array(self.read([key])[key].values)
+        return self[key]
 
     def generate_data_sources(
         self,
@@ -176,14 +181,12 @@ class ArrowAdapter(Adapter[TableStructure]):
         -------
 
         """
-        # Must compute to determine shape.
-        return ArrayAdapter.from_array(self.read([key])[key].values)
+        # Must compute to determine shape. Only this column is read, and
+        # where Arrow allows it the array is a view on the memory-mapped file.
+        return ArrayAdapter.from_array(self.read_arrow([key]).column(key).to_numpy())
 
     def items(self) -> Iterator[Tuple[str, ArrayAdapter]]:
-        yield from (
-            (key, ArrayAdapter.from_array(self.read([key])[key].values))
-            for key in self._structure.columns
-        )
+        yield from ((key, self[key]) for key in self._structure.columns)
 
     def reader_handle_partiton(self, partition: int) -> pyarrow.RecordBatchFileReader:
         """Initialize and return the reader handle.
@@ -199,7 +202,7 @@ class ArrowAdapter(Adapter[TableStructure]):
         if not Path(self._partition_paths[partition]).exists():
             raise ValueError(f"partition {partition} has not been stored yet")
         else:
-            return pyarrow.ipc.open_file(self._partition_paths[partition])
+            return _open_file(self._partition_paths[partition])
 
     def reader_handle_all(self) -> Iterator[pyarrow.RecordBatchFileReader]:
         """Initialize and return the reader handle.
@@ -212,7 +215,7 @@ class ArrowAdapter(Adapter[TableStructure]):
             if not Path(path).exists():
                 raise ValueError(f"path {path} has not been stored yet")
             else:
-                with pyarrow.ipc.open_file(path) as reader:
+                with _open_file(path) as reader:
                     yield reader
 
     def write_partition(
@@ -240,11 +243,7 @@ class ArrowAdapter(Adapter[TableStructure]):
 
         schema = batches[0].schema
 
-        uri = self._partition_paths[partition]
-
-        with pyarrow.ipc.new_file(uri, schema) as file_writer:
-            for batch in batches:
-                file_writer.write_batch(batch)
+        _write_file(self._partition_paths[partition], schema, batches)
 
     def write(
         self,
@@ -271,11 +270,7 @@ class ArrowAdapter(Adapter[TableStructure]):
 
         if self.structure().npartitions != 1:
             raise NotImplementedError
-        uri = self._partition_paths[0]
-
-        with pyarrow.ipc.new_file(uri, schema) as file_writer:
-            for batch in data:
-                file_writer.write_batch(batch)
+        _write_file(self._partition_paths[0], schema, batches)
 
     def read(self, fields: Optional[Union[str, List[str]]] = None) -> pandas.DataFrame:
         """
@@ -286,13 +281,9 @@ class ArrowAdapter(Adapter[TableStructure]):
         -------
         Returns the concatenated pyarrow table as pandas dataframe.
         """
-        data = pyarrow.concat_tables(
-            [partition.read_all() for partition in self.reader_handle_all()]
-        )
-        table = data.to_pandas()
-        if fields is not None:
-            return table[fields]
-        return table
+        if isinstance(fields, str):
+            return self.read_arrow([fields]).to_pandas()[fields]
+        return self.read_arrow(fields).to_pandas()
 
     def read_partition(
         self,
@@ -310,8 +301,138 @@ class ArrowAdapter(Adapter[TableStructure]):
         -------
         The pyarrow table corresponding to a given partition and batch as pandas dataframe.
         """
-        reader = self.reader_handle_partiton(partition)
-        table = reader.read_all().to_pandas()
-        if fields is not None:
-            return table[fields]
-        return table
+        if isinstance(fields, str):
+            return self.read_partition_arrow(partition, [fields]).to_pandas()[fields]
+        return self.read_partition_arrow(partition, fields).to_pandas()
+
+    def read_arrow(
+        self,
+        fields: Optional[Union[str, List[str]]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """
+        The concatenated data from given set of partitions, without pandas.
+        Parameters
+        ----------
+        fields : optional fields parameter.
+        filters : optional list of (column, operator, value) to select rows.
+        offset : number of (selected) rows to skip.
+        limit : optional maximum number of rows to return.
+
+        Returns
+        -------
+        Returns the concatenated pyarrow table.
+        """
+        return _read_table(
+            self.reader_handle_all(),
+            self.structure().arrow_schema_decoded,
+            fields,
+            filters,
+            offset,
+            limit,
+        )
+
+    def read_partition_arrow(
+        self,
+        partition: int,
+        fields: Optional[Union[str, List[str]]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """
+        Function to read a batch of data from a given partition, without pandas.
+        Parameters
+        ----------
+        partition : the index of the partition to read.
+        fields : optional fields parameter.
+        filters : optional list of (column, operator, value) to select rows.
+        offset : number of (selected) rows to skip.
+        limit : optional maximum number of rows to return.
+
+        Returns
+        -------
+        The pyarrow table corresponding to a given partition.
+        """
+        return _read_table(
+            [self.reader_handle_partiton(partition)],
+            self.structure().arrow_schema_decoded,
+            fields,
+            filters,
+            offset,
+            limit,
+        )
+
+
+def _open_file(path: Union[str, Path]) -> pyarrow.RecordBatchFileReader:
+    "Open an Arrow IPC file, memory-mapped so that reads do not copy."
+    return pyarrow.ipc.open_file(pyarrow.memory_map(str(path), "r"))
+
+
+def _write_file(
+    path: Union[str, Path], schema: pyarrow.Schema, batches: List[pyarrow.RecordBatch]
+) -> None:
+    """
+    Write an Arrow IPC file by writing a temporary file and renaming it.
+
+    Readers may hold memory maps of the existing file; replacing it, rather
+    than truncating it in place, leaves their views valid.
+    """
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with pyarrow.ipc.new_file(temp_path, schema) as file_writer:
+            for batch in batches:
+                file_writer.write_batch(batch)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _read_table(
+    readers: Iterable[pyarrow.RecordBatchFileReader],
+    schema: pyarrow.Schema,
+    fields: Optional[Union[str, List[str]]],
+    filters: Optional[List[Filter]],
+    offset: int,
+    limit: Optional[int],
+) -> pyarrow.Table:
+    """
+    Read the given columns and rows, raising KeyError like pandas would for a
+    missing column.
+
+    The readers are memory-mapped, so the batches are views on the files and
+    only the pages of the selected columns are ever touched. Batches are read
+    lazily, so those past the limit (or, with no filters, before the offset)
+    are skipped.
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    if fields is not None:
+        for field in fields:
+            if field not in schema.names:
+                raise KeyError(field)
+    check_columns(filters, schema.names)
+    # Read any columns needed to evaluate the filters, and drop them after.
+    columns = None
+    if fields is not None:
+        columns = fields + [
+            column for column, _, _ in filters or [] if column not in fields
+        ]
+    batches = (
+        (batch if columns is None else batch.select(columns))
+        for reader in readers
+        for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+    )
+    selected = list(select_batches(batches, filters, offset, limit))
+    if selected:
+        table = pyarrow.Table.from_batches(selected)
+    else:
+        table = schema.empty_table()
+    if fields is not None:
+        table = table.select(fields)
+    return table
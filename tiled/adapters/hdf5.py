@@ -1,12 +1,15 @@
 import builtins
+import contextlib
 import copy
 import itertools
 import os
 import sys
+import threading
 import warnings
 from pathlib import Path
 from typing import Any, Iterator, List, Optional, Tuple, Union
 
+import cachetools
 import dask
 import dask.array
 import h5py
@@ -29,10 +32,12 @@ from ..structures.data_source import DataSource
 from ..type_aliases import JSON
 from ..utils import BrokenLink, Sentinel, node_repr, path_from_uri
 from .array import ArrayAdapter
+from .resource_cache import DEFAULT_MAX_SIZE
 from .utils import split_chunks
 
 SWMR_DEFAULT = bool(int(os.getenv("TILED_HDF5_SWMR_DEFAULT", "0")))
 INLINED_DEPTH = int(os.getenv("TILED_HDF5_INLINED_CONTENTS_MAX_DEPTH", "7"))
+HDF5_FILE_CACHE_TTL = float(os.getenv("TILED_HDF5_FILE_CACHE_TTL", "5."))
 
 HDF5_DATASET = Sentinel("HDF5_DATASET")
 HDF5_BROKEN_LINK = Sentinel("HDF5_BROKEN_LINK")
@@ -76,7 +81,7 @@ def get_hdf5_attrs(
 ) -> JSON:
     """Get attributes of an HDF5 dataset"""
     file_path = path_from_uri(file_uri)
-    with h5open(
+    with h5open_cached(
         file_path, dataset=dataset, swmr=swmr, libver=libver, locking=locking
     ) as node:
         d = dict(getattr(node, "attrs", {}))
@@ -122,13 +127,108 @@ class h5open(h5py.File):  # type: ignore
         super().__exit__(exc_type, exc_value, exc_tb)
 
         if exc_type == KeyError:
-            if "file" in str(exc_value):
-                # External link is broken
-                raise BrokenLink(exc_value.args[0]) from exc_value
+            _raise_if_broken_link(exc_value)
 
-            elif "component not found" in str(exc_value):
-                # Soft link is broken
-                raise BrokenLink(exc_value.args[0]) from exc_value
+
+def _raise_if_broken_link(exc_value: KeyError) -> None:
+    "Translate a KeyError raised by h5py for a broken link into BrokenLink"
+    if "file" in str(exc_value):
+        # External link is broken
+        raise BrokenLink(exc_value.args[0]) from exc_value
+
+    elif "component not found" in str(exc_value):
+        # Soft link is broken
+        raise BrokenLink(exc_value.args[0]) from exc_value
+
+
+def open_hdf5_file(
+    file_path: Union[str, Path],
+    swmr: bool = SWMR_DEFAULT,
+    libver: str = "latest",
+    locking: Optional[Union[bool, str]] = None,
+) -> h5py.File:
+    """Open an HDF5 file for reading, reusing an open handle if one is available
+
+    Open files are cached by path. A cached handle opened with other options,
+    or before the file was last modified, is dropped from the cache and a new
+    one is opened. The old handle is not closed, as other readers may still be
+    using it; like any handle evicted from the cache, it is closed once it is
+    no longer referenced. (Files are opened with HDF5's default "weak" close
+    degree, so datasets already obtained from it remain readable.)
+
+    Handles are dropped HDF5_FILE_CACHE_TTL seconds after they were opened,
+    however often they are used, so that readers do not hold file locks
+    against writers for long.
+    """
+    file_path = Path(file_path)
+    options = (swmr, libver, locking, os.stat(file_path).st_mtime_ns)
+    with _open_files_lock:
+        _open_files.expire()
+        cached = _open_files.get(file_path)
+        if cached is not None:
+            cached_options, cached_file = cached
+            if cached_options == options:
+                return cached_file
+            del _open_files[file_path]
+    # Release our references to the stale handle before opening a new one,
+    # and open outside the lock, so that opening one file does not hold up
+    # reads of others.
+    cached = cached_file = None
+    file = h5py.File(file_path, mode="r", swmr=swmr, libver=libver, locking=locking)
+    if _open_files.maxsize:  # handle size 0 cache
+        with _open_files_lock:
+            cached = _open_files.get(file_path)
+            if (cached is not None) and (cached[0] == options):
+                # Another thread opened the same file meanwhile; share that.
+                return cached[1]
+            _open_files[file_path] = (options, file)
+            _schedule_expiry()
+    return file
+
+
+def _schedule_expiry() -> None:
+    "Drop expired handles even if no further files are opened."
+    global _expiry_timer
+    if _expiry_timer is None or not _expiry_timer.is_alive():
+        _expiry_timer = threading.Timer(HDF5_FILE_CACHE_TTL, _expire_open_files)
+        _expiry_timer.daemon = True
+        _expiry_timer.start()
+
+
+def _expire_open_files() -> None:
+    global _expiry_timer
+    with _open_files_lock:
+        _open_files.expire()
+        _expiry_timer = None
+        if _open_files:
+            _schedule_expiry()
+
+
+_open_files: cachetools.TTLCache[
+    Path, Tuple[Tuple[Any, ...], h5py.File]
+] = cachetools.TTLCache(DEFAULT_MAX_SIZE, HDF5_FILE_CACHE_TTL)
+_open_files_lock = threading.Lock()
+_expiry_timer: Optional[threading.Timer] = None
+
+
+@contextlib.contextmanager
+def h5open_cached(
+    filename: Union[str, Path],
+    dataset: Optional[str] = None,
+    swmr: bool = SWMR_DEFAULT,
+    libver: str = "latest",
+    locking: Optional[Union[bool, str]] = None,
+) -> Iterator[Union[h5py.File, h5py.Group, h5py.Dataset]]:
+    """A context manager like h5open, but backed by open_hdf5_file
+
+    The file is left open on exit, to be reused by subsequent reads.
+    """
+    file = open_hdf5_file(filename, swmr=swmr, libver=libver, locking=locking)
+    try:
+        yield file[dataset] if dataset else file
+    except KeyError as exc_value:
+        _raise_if_broken_link(exc_value)
+        raise
 
 
 class HDF5ArrayAdapter(ArrayAdapter):
@@ -168,7 +268,7 @@ class HDF5ArrayAdapter(ArrayAdapter):
         def _read_hdf5_array(
             fpath: Union[str, Path], slice: tuple[builtins.slice, ...]
         ) -> NDArray:
-            with h5open(
+            with h5open_cached(
                 fpath, dataset, swmr=swmr, libver=libver, locking=locking
             ) as ds:
                 return ds[slice]
@@ -176,7 +276,7 @@ class HDF5ArrayAdapter(ArrayAdapter):
         def _get_hdf5_specs(
             fpath: Union[str, Path]
         ) -> Tuple[Tuple[int, ...], Tuple[int, ...], numpy.dtype]:
-            with h5open(
+            with h5open_cached(
                 fpath, dataset, swmr=swmr, libver=libver, locking=locking
             ) as ds:
                 result = ds.shape, ds.chunks or ds.shape, ds.dtype
@@ -201,7 +301,7 @@ class HDF5ArrayAdapter(ArrayAdapter):
             check_str_dtype = h5py.check_string_dtype(dtype)
             if check_str_dtype.length is None:
                 # TODO: refactor and test
-                with h5open(
+                with h5open_cached(
                     file_paths[0],
                     dataset=dataset,
                     swmr=swmr,
@@ -477,7 +577,7 @@ class HDF5Adapter(
             ast.data_uri for ast in assets if ast.parameter == "data_uris"
         ] or [assets[0].data_uri]
         file_path = path_from_uri(data_uris[0])
-        with h5open(
+        with h5open_cached(
             file_path, dataset, swmr=swmr, libver=libver, locking=locking
         ) as file:
             tree = parse_hdf5_tree(file)
@@ -510,7 +610,9 @@ class HDF5Adapter(
         **kwargs: Any,  # Optional kwargs for HDF5ArrayAdapter
     ) -> Union["HDF5Adapter", HDF5ArrayAdapter]:
         fpath = path_from_uri(data_uris[0])
-        with h5open(fpath, dataset, swmr=swmr, libver=libver, locking=locking) as file:
+        with h5open_cached(
+            fpath, dataset, swmr=swmr, libver=libver, locking=locking
+        ) as file:
             tree = parse_hdf5_tree(file)
 
         if tree == HDF5_DATASET:
@@ -531,7 +633,7 @@ class HDF5Adapter(
         return node_repr(self, list(self))
 
     def metadata(self) -> JSON:
-        d = get_hdf5_attrs(self.uris[0], self.dataset)
+        d = get_hdf5_attrs(self.uris[0], self.dataset, **self._kwargs)
         return {**d, **super().metadata()}
 
     def __iter__(self) -> Iterator[Any]:
@@ -1,7 +1,10 @@
+import bisect
 import copy
 import itertools
+import math
+import numbers
 import operator
-from collections import Counter
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import (
     TYPE_CHECKING,
@@ -68,6 +71,7 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
         entries_stale_after: Optional[timedelta] = None,
         metadata_stale_after: Optional[timedelta] = None,
         must_revalidate: bool = True,
+        indexed: bool = False,
     ) -> None:
         """
         Create a simple Adapter from any mapping (e.g. dict, OneShotCachedMap).
@@ -87,8 +91,18 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
             it should rely on a local cache before checking back for changes.
         must_revalidate : bool
             Whether the client should strictly refresh stale cache items.
+        indexed : bool
+            If True, answer queries on metadata, specs, and structure family
+            using indexes of the children, built on first use and shared by
+            the results of searches. This assumes that the children and their
+            metadata do not change after the first search; if the number of
+            children changes, the indexes are rebuilt.
         """
         self._mapping = mapping
+        self._indexed = indexed
+        self._index: Optional[_MapIndex] = None
+        # Whether the keys are in the order of the mapping that was indexed
+        self._index_ordered = True
         if sorting is None:
             # This is a special case that means, "the given ordering".
             # By giving that a name ("_") we enable requests to asking for the
@@ -265,7 +279,7 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
             sorting = self._sorting
         if must_revalidate is UNCHANGED:
             must_revalidate = self.must_revalidate
-        return type(self)(
+        variation = type(self)(
             # *args,
             mapping=cast(Dict[str, A], mapping),
             sorting=cast(List[SortingItem], sorting),
@@ -276,6 +290,38 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
             must_revalidate=cast(bool, must_revalidate),
             **kwargs,
         )
+        if self._indexed:
+            # Share the indexes, so they are built once for a chain of searches.
+            variation._indexed = True
+            variation._index = self.get_index()
+            variation._index_ordered = self._index_ordered
+        return variation
+
+    def get_index(self) -> Optional["_MapIndex"]:
+        "Return the index of the children, or None if this is not indexed."
+        if not self._indexed:
+            return None
+        if self._index is None:
+            self._index = _MapIndex(self._mapping)
+        return self._index
+
+    def new_variation_from_keys(self, keys: Any) -> "MapAdapter[A]":
+        """
+        Return a variation with the children whose keys are in the given set.
+
+        The order of the children is kept.
+        """
+        mapping = self._mapping
+        index = self.get_index()
+        if (index is not None) and self._index_ordered:
+            # Order the (few) matches, rather than filtering all the keys.
+            ordered = sorted(
+                (key for key in keys if key in mapping),
+                key=index.positions.__getitem__,
+            )
+        else:
+            ordered = [key for key in mapping if key in keys]
+        return self.new_variation(mapping={key: mapping[key] for key in ordered})
 
     def read(self, fields: Optional[str] = None) -> "MapAdapter[A]":
         """
@@ -292,7 +338,9 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
             new_mapping = {}
             for field in fields:
                 new_mapping[field] = self._mapping[field]
-            return self.new_variation(mapping=new_mapping)
+            variation = self.new_variation(mapping=new_mapping)
+            variation._index_ordered = False
+            return variation
         return self
 
     def search(self, query: Any) -> Any:
@@ -382,7 +430,9 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
                 to_reverse = list(mapping.items())
                 mapping = dict(reversed(to_reverse))
 
-        return self.new_variation(mapping=mapping, sorting=sorting)
+        variation = self.new_variation(mapping=mapping, sorting=sorting)
+        variation._index_ordered = False
+        return variation
 
     # The following two methods are used by keys(), values(), items().
 
@@ -441,6 +491,158 @@ class MapAdapter(Generic[A], ContainerAdapter[A], IndexersMixin):
         )
 
 
+class _MapIndex:
+    """
+    Indexes of the children of a mapping, each built on first use
+
+    - for each metadata key, a hash index, for Eq and In, and, if its values
+      are all numbers or all strings, a sorted index, for Comparison
+    - an inverted index of the words in the metadata, for FullText
+    - sets of keys by spec and by structure family
+
+    Each lookup returns a set of keys, or None if the index cannot answer
+    the query exactly, in which case the caller falls back to a scan.
+    """
+
+    def __init__(self, mapping: Mapping[str, Any]) -> None:
+        self._mapping = mapping
+        self._reset()
+
+    def _reset(self) -> None:
+        self.positions = {key: i for i, key in enumerate(self._mapping)}
+        self._hashed: Dict[str, Tuple[Dict[Any, set], List[Tuple[str, Any]]]] = {}
+        self._sorted: Dict[str, Optional[Tuple[List[Any], List[str]]]] = {}
+        self._words: Optional[Dict[str, set]] = None
+        self._specs: Optional[Dict[Any, set]] = None
+        self._structure_families: Optional[Dict[Any, set]] = None
+
+    def _check_current(self) -> None:
+        if len(self._mapping) != len(self.positions):
+            # The mapping has changed. Start over.
+            self._reset()
+
+    def _terms(self, query_key: str) -> Iterator[Tuple[str, Any]]:
+        for key, value in self._mapping.items():
+            term = value.metadata()
+            for subkey in query_key.split("."):
+                if subkey not in term:
+                    break
+                term = term[subkey]
+            else:
+                yield key, term
+
+    def _hash_index(
+        self, query_key: str
+    ) -> Tuple[Dict[Any, set], List[Tuple[str, Any]]]:
+        self._check_current()
+        if query_key not in self._hashed:
+            by_term: Dict[Any, set] = defaultdict(set)
+            unhashable = []
+            for key, term in self._terms(query_key):
+                try:
+                    by_term[term].add(key)
+                except TypeError:
+                    unhashable.append((key, term))
+            self._hashed[query_key] = (dict(by_term), unhashable)
+        return self._hashed[query_key]
+
+    def equal(self, query_key: str, value: Any) -> Optional[set]:
+        "Keys of children whose metadata has query_key equal to value"
+        return self.isin(query_key, [value])
+
+    def isin(self, query_key: str, values: Any) -> Optional[set]:
+        "Keys of children whose metadata has query_key equal to one of values"
+        by_term, unhashable = self._hash_index(query_key)
+        keys: set = set()
+        for value in values:
+            try:
+                keys.update(by_term.get(value, ()))
+            except TypeError:
+                # An unhashable value may equal an unhashable term.
+                return None
+        keys.update(key for key, term in unhashable if term in values)
+        return keys
+
+    def compare(self, query_key: str, op: str, value: Any) -> Optional[set]:
+        "Keys of children whose metadata has query_key satisfying op(term, value)"
+        self._check_current()
+        if query_key not in self._sorted:
+            items = list(self._terms(query_key))
+            terms = [term for _, term in items]
+            if _sortable(terms):
+                items.sort(key=operator.itemgetter(1))
+                self._sorted[query_key] = (
+                    [term for _, term in items],
+                    [key for key, _ in items],
+                )
+            else:
+                self._sorted[query_key] = None
+        sorted_index = self._sorted[query_key]
+        if (sorted_index is None) or not _sortable(sorted_index[0][:1] + [value]):
+            # Comparing different types may raise or follow rules of their own.
+            return None
+        terms, keys = sorted_index
+        if op == "lt":
+            return set(keys[: bisect.bisect_left(terms, value)])
+        if op == "le":
+            return set(keys[: bisect.bisect_right(terms, value)])
+        if op == "gt":
+            return set(keys[bisect.bisect_right(terms, value) :])  # noqa: E203
+        if op == "ge":
+            return set(keys[bisect.bisect_left(terms, value) :])  # noqa: E203
+        return None
+
+    def words(self, query_words: Iterable[str]) -> set:
+        "Keys of children with any of query_words in (the strings in) their metadata"
+        self._check_current()
+        if self._words is None:
+            words: Dict[str, set] = defaultdict(set)
+            for key, value in self._mapping.items():
+                for s in walk_string_values(value.metadata()):
+                    for word in s.lower().split():
+                        words[word].add(key)
+            self._words = dict(words)
+        keys: set = set()
+        for word in query_words:
+            keys.update(self._words.get(word, ()))
+        return keys
+
+    def specs(self, include: Iterable[Any], exclude: Iterable[Any]) -> set:
+        "Keys of children with all the specs in include and none in exclude"
+        self._check_current()
+        if self._specs is None:
+            by_spec: Dict[Any, set] = defaultdict(set)
+            for key, value in self._mapping.items():
+                for spec in value.specs:
+                    by_spec[spec].add(key)
+            self._specs = dict(by_spec)
+        keys = set(self.positions)
+        for spec in include:
+            keys &= self._specs.get(spec, set())
+        for spec in exclude:
+            keys -= self._specs.get(spec, set())
+        return keys
+
+    def structure_family(self, structure_family: Any) -> set:
+        "Keys of children of the given structure family"
+        self._check_current()
+        if self._structure_families is None:
+            by_family: Dict[Any, set] = defaultdict(set)
+            for key, value in self._mapping.items():
+                by_family[value.structure_family].add(key)
+            self._structure_families = dict(by_family)
+        return self._structure_families.get(structure_family, set())
+
+
+def _sortable(terms: List[Any]) -> bool:
+    "Whether terms can be ordered consistently: all real numbers or all strings"
+    if all(isinstance(term, str) for term in terms):
+        return True
+    return all(
+        isinstance(term, numbers.Real) and not math.isnan(term) for term in terms
+    )
+
+
 def walk_string_values(
     tree: MapAdapter[Any], node: Optional[Any] = None
 ) -> Iterator[str]:
@@ -537,6 +739,9 @@ def full_text_search(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     matches = {}
     text = query.text
     query_words = set(text.split())
+    index = tree.get_index()
+    if index is not None:
+        return tree.new_variation_from_keys(index.words(query_words))
     for key, value in tree.items():
         words = set(
             word
@@ -593,6 +798,11 @@ def eq(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     -------
 
     """
+    index = tree.get_index()
+    if index is not None:
+        keys = index.equal(query.key, query.value)
+        if keys is not None:
+            return tree.new_variation_from_keys(keys)
     matches = {}
     for key, value, term in iter_child_metadata(query.key, tree):
         if term == query.value:
@@ -663,10 +873,15 @@ def comparison(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     -------
 
     """
+    if query.operator not in {"le", "lt", "ge", "gt"}:
+        raise ValueError(f"Unexpected operator {query.operator}.")
+    index = tree.get_index()
+    if index is not None:
+        keys = index.compare(query.key, query.operator, query.value)
+        if keys is not None:
+            return tree.new_variation_from_keys(keys)
     matches = {}
     for key, value, term in iter_child_metadata(query.key, tree):
-        if query.operator not in {"le", "lt", "ge", "gt"}:
-            raise ValueError(f"Unexpected operator {query.operator}.")
         comparison_func = getattr(operator, query.operator)
         if comparison_func(term, query.value):
             matches[key] = value
@@ -688,6 +903,11 @@ def _in(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     -------
 
     """
+    index = tree.get_index()
+    if index is not None:
+        keys = index.isin(query.key, query.value)
+        if keys is not None:
+            return tree.new_variation_from_keys(keys)
     matches = {}
     for key, value, term in iter_child_metadata(query.key, tree):
         if term in query.value:
@@ -759,6 +979,9 @@ def specs(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     matches = {}
     include = set(query.include)
     exclude = set(query.exclude)
+    index = tree.get_index()
+    if index is not None:
+        return tree.new_variation_from_keys(index.specs(include, exclude))
 
     for key, value in tree.items():
         specs = set(value.specs)
@@ -783,6 +1006,9 @@ def structure_family(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     -------
 
     """
+    index = tree.get_index()
+    if index is not None:
+        return tree.new_variation_from_keys(index.structure_family(query.value))
     matches = {}
     for key, value in tree.items():
         if value.structure_family == query.value:
@@ -806,6 +1032,9 @@ def keys_filter(query: Any, tree: MapAdapter[A]) -> MapAdapter[A]:
     -------
 
     """
+    if tree.get_index() is not None:
+        # Look up the keys, without touching the other children.
+        return tree.new_variation_from_keys(set(query.keys))
     matches = {}
     for key, value in tree.items():
         if key in query.keys:
@@ -6,6 +6,8 @@ from urllib.parse import quote_plus
 
 import dask.dataframe
 import pandas
+import pyarrow
+import pyarrow.dataset
 
 from tiled.adapters.core import Adapter
 
@@ -18,6 +20,7 @@ from ..type_aliases import JSON
 from ..utils import path_from_uri
 from .array import ArrayAdapter
 from .dataframe import DataFrameAdapter
+from .table_filters import Filter, check_columns, filter_expression, select_batches
 from .utils import init_adapter_from_catalog
 
 
@@ -168,5 +171,116 @@ class ParquetDatasetAdapter(Adapter[TableStructure]):
         """
         return self.dataframe_adapter.read_partition(*args, **kwargs)
 
+    def read_arrow(
+        self,
+        fields: Optional[List[str]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """Read the concatenated data from all partitions, without pandas.
+
+        Parameters
+        ----------
+        fields :
+            Optional list of column names to read. By default read all.
+        filters :
+            Optional list of (column, operator, value) to select rows.
+        offset :
+            Number of (selected) rows to skip.
+        limit :
+            Optional maximum number of rows to return.
+
+        Returns
+        -------
+
+        """
+        if any(not Path(path).exists() for path in self._partition_paths):
+            raise ValueError("Not all partitions have been stored.")
+        return self._read_parquet_table(
+            self._partition_paths, fields, filters, offset, limit
+        )
+
+    def read_partition_arrow(
+        self,
+        partition: int,
+        fields: Optional[List[str]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """Read one partition, without pandas.
+
+        Parameters
+        ----------
+        partition :
+        fields :
+            Optional list of column names to read. By default read all.
+        filters :
+            Optional list of (column, operator, value) to select rows.
+        offset :
+            Number of (selected) rows to skip.
+        limit :
+            Optional maximum number of rows to return.
+
+        Returns
+        -------
+
+        """
+        if not Path(self._partition_paths[partition]).exists():
+            raise RuntimeError(f"Partition {partition} has not been stored yet.")
+        return self._read_parquet_table(
+            [self._partition_paths[partition]], fields, filters, offset, limit
+        )
+
+    def _read_parquet_table(
+        self,
+        paths: List[Path],
+        fields: Optional[List[str]],
+        filters: Optional[List[Filter]],
+        offset: int,
+        limit: Optional[int],
+    ) -> pyarrow.Table:
+        for field in fields or []:
+            if field not in self.structure().columns:
+                raise KeyError(field)
+        check_columns(filters, self.structure().columns)
+        # Files are read in the order given, as they are by dask.
+        dataset = pyarrow.dataset.dataset(
+            [str(path) for path in paths], format="parquet"
+        )
+        if fields is not None:
+            # Include any stored index, as reading with pandas metadata would.
+            fields = fields + [
+                name
+                for name in _pandas_index_columns(dataset.schema)
+                if name not in fields
+            ]
+        # The filter is checked against row-group statistics, so row groups
+        # that cannot match are skipped, and only the requested columns are
+        # read from the files. Batches past the limit are never read.
+        scanner = dataset.scanner(
+            columns=fields, filter=filter_expression(filters, dataset.schema)
+        )
+        batches = list(select_batches(scanner.to_batches(), None, offset, limit))
+        if batches:
+            table = pyarrow.Table.from_batches(batches)
+        else:
+            table = scanner.projected_schema.empty_table()
+        # Keep the pandas metadata, which records the index, if any.
+        return table.replace_schema_metadata(dataset.schema.metadata)
+
     def get(self, key: str) -> Union[ArrayAdapter, None]:
         return self.dataframe_adapter.get(key)
+
+
+def _pandas_index_columns(schema: pyarrow.Schema) -> List[str]:
+    "Names of the index columns stored by pandas, if any"
+    pandas_metadata = schema.pandas_metadata or {}
+    return [
+        name
+        for name in pandas_metadata.get("index_columns", [])
+        if isinstance(name, str) and name in schema.names
+    ]
@@ -1,4 +1,5 @@
 import os
+import threading
 from pathlib import Path
 from typing import Any, Callable, Optional, Tuple
 
@@ -92,14 +93,19 @@ def with_resource_cache(
     else:
         cache = _resource_cache
     # Return cached value if found.
-    value = cache.get(cache_key)
+    # The cache is shared by worker threads, and cachetools caches are not
+    # thread-safe, so guard lookups and insertions (but not the factory).
+    with _lock:
+        value = cache.get(cache_key)
     if value is not None:
         return value
     # Generate value and offer it to the cache.
     value = factory(*args, **kwargs)
     if cache.maxsize:  # handle size 0 cache
-        cache[cache_key] = value
+        with _lock:
+            cache[cache_key] = value
     return value
 
 
 _cache: AnyCache = default_resource_cache()
+_lock = threading.Lock()
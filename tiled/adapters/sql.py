@@ -8,6 +8,7 @@ from typing import Any, Callable, Iterator, List, Literal, Optional, Tuple, Unio
 import numpy
 import pandas
 import pyarrow
+from adbc_driver_manager.dbapi import DataError, ProgrammingError
 from sqlalchemy.sql.compiler import RESERVED_WORDS
 
 from tiled.adapters.core import Adapter
@@ -25,9 +26,16 @@ from ..structures.data_source import Asset, DataSource
 from ..structures.table import TableStructure
 from ..type_aliases import JSON
 from .array import ArrayAdapter
+from .table_filters import Filter, FilterError, check_columns, sql_conditions
 from .utils import init_adapter_from_catalog
 
 DIALECTS = Literal["postgresql", "sqlite", "duckdb"]
+# Pseudo-columns giving the physical location or id of each row, in each dialect.
+# They order rows the same way from one query to the next, so long as the table
+# is not rewritten (e.g. by VACUUM FULL in PostgreSQL, or VACUUM in SQLite), but
+# they do not promise insertion order: PostgreSQL may put new rows in the space
+# freed by deleted ones.
+ROW_ORDER_COLUMNS = {"postgresql": "ctid", "sqlite": "rowid", "duckdb": "rowid"}
 TABLE_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
 COLUMN_NAME_PATTERN = re.compile(r"^[a-zA-Z_].*$")
 FORBIDDEN_CHARACTERS = re.compile(
@@ -309,7 +317,13 @@ class SQLAdapter(Adapter[TableStructure]):
             conn.commit()
 
     def _read_full_table_or_partition(
-        self, fields: Optional[List[str]] = None, partition: Optional[int] = None
+        self,
+        fields: Optional[List[str]] = None,
+        partition: Optional[int] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> pyarrow.Table:
         """Read the data from the database
 
@@ -321,6 +335,10 @@ class SQLAdapter(Adapter[TableStructure]):
         ----------
         fields : optional string to return the data in the specified field.
         partition : optional int to return the data in the specified partition.
+        filters : optional list of (column, operator, value) to select rows.
+        offset : number of (selected) rows to skip. Pages are consistent with
+            one another while the table is not rewritten.
+        limit : optional maximum number of rows to return.
 
         Returns
         -------
@@ -330,22 +348,53 @@ class SQLAdapter(Adapter[TableStructure]):
         # Make sure that requested columns exist and safe to put in SQL query.
         schema = self.structure().arrow_schema_decoded
         req_cols = set(schema.names).intersection(fields) if fields else schema.names
-
+        check_columns(filters, schema.names)
+
+        dialect = self.storage.dialect
+        # Row selection is pushed down into the query, with filter values
+        # passed as bind parameters.
+        conditions, parameters = sql_conditions(
+            filters,
+            lambda c: f'"{c.lower()}"',
+            lambda i: f"${i}" if dialect == "postgresql" else "?",
+        )
+        conditions.insert(0, f"_dataset_id={self.dataset_id}")
+        if partition is not None:
+            conditions.append(f"_partition_id={int(partition)}")
         query = (
             "SELECT " + ", ".join([f'"{c.lower()}"' for c in req_cols]) + " "
             f'FROM "{self.table_name}" '
-            f"WHERE _dataset_id={self.dataset_id} "
-        )
-        query += (
-            f"AND _partition_id={int(partition)}"
-            if partition is not None
-            else "ORDER BY _partition_id"
+            "WHERE " + " AND ".join(conditions)
         )
+        # A read of the whole table returns the partitions in order.
+        order_by = ["_partition_id"] if partition is None else []
+        if (limit is not None) or offset:
+            # Without a total order, which rows LIMIT and OFFSET select is up
+            # to the database. Order within each partition by row id, so that
+            # consecutive pages neither overlap nor skip rows. (There is no
+            # column recording insertion order; see ROW_ORDER_COLUMNS.)
+            order_by.append(ROW_ORDER_COLUMNS[dialect])
+        if order_by:
+            query += " ORDER BY " + ", ".join(order_by)
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        elif offset and dialect == "sqlite":
+            # SQLite does not accept OFFSET without LIMIT.
+            query += " LIMIT -1"
+        if offset:
+            query += f" OFFSET {int(offset)}"
 
         with closing(self.storage.connect()) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
-                data = cursor.fetch_arrow_table()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, parameters or None)
+                    data = cursor.fetch_arrow_table()
+            except (DataError, ProgrammingError) as err:
+                if not filters:
+                    raise
+                # The database could not compare a column with a filter value.
+                conn.rollback()
+                raise FilterError(f"Cannot apply filters {filters!r}: {err}") from err
             conn.commit()
 
         # The database may have stored this in a coarser type, such as
@@ -393,6 +442,67 @@ class SQLAdapter(Adapter[TableStructure]):
             fields=fields, partition=partition
         ).to_pandas()
 
+    def read_arrow(
+        self,
+        fields: Optional[List[str]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """Read the concatenated data from the entire table, without pandas.
+
+        Parameters
+        ----------
+        fields: optional string to return the data in the specified field.
+        filters : optional list of (column, operator, value) to select rows.
+        offset : number of (selected) rows to skip. Pages are consistent with
+            one another while the table is not rewritten.
+        limit : optional maximum number of rows to return.
+
+        Returns
+        -------
+        The concatenated table as pyarrow table.
+        """
+
+        return self._read_full_table_or_partition(
+            fields=fields, filters=filters, offset=offset, limit=limit
+        )
+
+    def read_partition_arrow(
+        self,
+        partition: int,
+        fields: Optional[List[str]] = None,
+        *,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> pyarrow.Table:
+        """Read a batch of data from a given partition, without pandas.
+
+        Parameters
+        ----------
+        partition : int
+        fields : Optional[List[str]]
+            Optional list of field names to select. By default return all.
+        filters : optional list of (column, operator, value) to select rows.
+        offset : number of (selected) rows to skip. Pages are consistent with
+            one another while the table is not rewritten.
+        limit : optional maximum number of rows to return.
+
+        Returns
+        -------
+        The table as pyarrow table.
+        """
+
+        return self._read_full_table_or_partition(
+            fields=fields,
+            partition=partition,
+            filters=filters,
+            offset=offset,
+            limit=limit,
+        )
+
 
 # Mapping between Arrow types and PostgreSQL column type name.
 ARROW_TO_PG_TYPES: dict[pyarrow.Field, str] = {
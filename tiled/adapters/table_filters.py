@@ -0,0 +1,179 @@
+"""
+Row selection for tables: simple column predicates plus a row offset and limit.
+
+Adapters that can push these down into their storage (a SQL WHERE clause,
+Parquet row-group statistics, skipping Arrow record batches) accept them as
+the keyword arguments ``filters``, ``offset``, and ``limit`` on
+``read_arrow`` and ``read_partition_arrow``. The functions here serve both
+those adapters and the fallback that applies the selection after reading.
+
+Each filter is a tuple ``(column, operator, value)``, and multiple filters
+are combined with AND. The offset and limit apply to the filtered rows.
+"""
+import json
+import operator
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+Filter = Tuple[str, str, Any]
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+_FILTER_PATTERN = re.compile(
+    r"^\s*(?P<column>[^<>=!]+?)\s*(?P<op>==|!=|>=|<=|>|<)(?P<value>.*)$"
+)
+
+
+class FilterError(ValueError):
+    "A filter is malformed or cannot be applied to the column it names."
+
+
+def parse_filter(string: str) -> Filter:
+    """
+    Parse a filter like 'temperature>300' or 'sample=="A"'.
+
+    The value is parsed as JSON if possible (numbers, true, false, null,
+    quoted strings) and otherwise taken as a bare string.
+    """
+    match = _FILTER_PATTERN.match(string)
+    if match is None:
+        raise FilterError(
+            f"Could not parse filter {string!r}. Expected a column name, "
+            f"one of the operators {', '.join(OPERATORS)}, and a value."
+        )
+    value = match.group("value").strip()
+    try:
+        value = json.loads(value)
+    except json.JSONDecodeError:
+        pass
+    if isinstance(value, (list, dict)):
+        raise FilterError(f"Filter values must be scalars, not {value!r}.")
+    if (value is None) and (match.group("op") not in {"==", "!="}):
+        raise FilterError("Only == and != can be used to compare with null.")
+    return (match.group("column"), match.group("op"), value)
+
+
+def check_columns(filters: Optional[List[Filter]], columns: Iterable[str]) -> None:
+    "Raise KeyError, like pandas, if a filter names a column that does not exist."
+    columns = set(columns)
+    for column, _, _ in filters or []:
+        if column not in columns:
+            raise KeyError(column)
+
+
+def filter_expression(filters: Optional[List[Filter]], schema):
+    """
+    Combine filters into a pyarrow.compute.Expression, or None if there are none.
+
+    Values are cast to the type of the column so that the comparison is
+    well-defined and can be checked against Parquet row-group statistics.
+    """
+    import pyarrow
+    import pyarrow.compute
+
+    check_columns(filters, schema.names)
+    expression = None
+    for column, op, value in filters or []:
+        field = pyarrow.compute.field(column)
+        if value is None:
+            term = field.is_null() if op == "==" else field.is_valid()
+        else:
+            try:
+                scalar = pyarrow.scalar(value).cast(schema.field(column).type)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+                raise FilterError(
+                    f"Cannot compare column {column!r} with {value!r}."
+                ) from None
+            term = OPERATORS[op](field, scalar)
+        expression = term if expression is None else (expression & term)
+    return expression
+
+
+def select_batches(
+    batches: Iterable,
+    filters: Optional[List[Filter]],
+    offset: int,
+    limit: Optional[int],
+) -> Iterator:
+    """
+    Apply filters, offset, and limit to an iterable of pyarrow.RecordBatch.
+
+    Batches are consumed lazily, so batches past the limit are never read,
+    and batches before the offset are only read if there are filters.
+    """
+    import pyarrow
+
+    expression = None
+    remaining = limit
+    for batch in batches:
+        if (remaining is not None) and (remaining <= 0):
+            return
+        if filters:
+            if expression is None:
+                expression = filter_expression(filters, batch.schema)
+            table = pyarrow.Table.from_batches([batch]).filter(expression)
+        elif offset >= batch.num_rows:
+            # Skip this batch entirely, without touching its data.
+            offset -= batch.num_rows
+            continue
+        else:
+            table = pyarrow.Table.from_batches([batch])
+        if offset:
+            skipped = min(offset, table.num_rows)
+            table = table.slice(skipped)
+            offset -= skipped
+        if remaining is not None:
+            table = table.slice(0, remaining)
+            remaining -= table.num_rows
+        yield from table.to_batches()
+
+
+def select_rows_pandas(
+    df, filters: Optional[List[Filter]], offset: int, limit: Optional[int]
+):
+    "Apply filters, offset, and limit to a pandas.DataFrame."
+    check_columns(filters, df.columns)
+    for column, op, value in filters or []:
+        if value is None:
+            mask = df[column].isna() if op == "==" else df[column].notna()
+        else:
+            try:
+                mask = OPERATORS[op](df[column], value)
+            except TypeError:
+                raise FilterError(
+                    f"Cannot compare column {column!r} with {value!r}."
+                ) from None
+        df = df[mask]
+    stop = None if limit is None else offset + limit
+    return df.iloc[offset:stop]
+
+
+def sql_conditions(
+    filters: Optional[List[Filter]], quote, placeholder
+) -> Tuple[List[str], List[Any]]:
+    """
+    Render filters as SQL conditions, to be combined with AND, and their values.
+
+    Values are passed as bind parameters, never spliced into the SQL. The
+    caller must check that the columns exist; quote maps a column name to a
+    quoted SQL identifier, and placeholder maps the 1-based position of a
+    parameter to its marker, e.g. '?' or '$1'.
+    """
+    conditions = []
+    parameters = []
+    for column, op, value in filters or []:
+        if value is None:
+            conditions.append(f"{quote(column)} IS {'NOT ' if op == '!=' else ''}NULL")
+        else:
+            parameters.append(value)
+            sql_op = "=" if op == "==" else op
+            conditions.append(
+                f"{quote(column)} {sql_op} {placeholder(len(parameters))}"
+            )
+    return conditions, parameters
@@ -1,6 +1,7 @@
 # mypy: ignore-errors
 import builtins
 import copy
+import json
 import os
 from importlib.metadata import version
 from typing import Any, Iterator, List, Optional, Set, Tuple, Union, cast
@@ -38,6 +39,8 @@ if ZARR_LIB_V2:
     from zarr.storage import init_array as create_array
 else:
     from zarr import create_array
+    from zarr.core.buffer import default_buffer_prototype
+    from zarr.core.sync import sync
     from zarr.storage import LocalStore, ObjectStore
 
 
@@ -58,6 +61,7 @@ class ZarrArrayAdapter(Adapter[ArrayStructure]):
         specs: Optional[List[Spec]] = None,
     ) -> None:
         self._array = array
+        self._zarr_metadata = None
         super().__init__(structure, metadata=metadata, specs=specs)
 
     @classmethod
@@ -116,6 +120,44 @@ class ZarrArrayAdapter(Adapter[ArrayStructure]):
         block_slice = block.slice_from_chunks(self.structure().chunks)
         return self._array[self._stencil[block_slice][slice or ...]]
 
+    def zarr_metadata(self) -> Tuple[int, JSON]:
+        """
+        Return the Zarr format and the metadata document of the stored array.
+
+        Together with read_raw_chunk, this lets the Zarr routes serve the stored
+        chunks as they are, without decoding and re-encoding them.
+        """
+        if self._zarr_metadata is None:
+            # The codecs and chunk grid never change, so this is read once.
+            zarr_format = 2 if ZARR_LIB_V2 else self._array.metadata.zarr_format
+            key = ".zarray" if zarr_format == 2 else "zarr.json"
+            self._zarr_metadata = (zarr_format, json.loads(self._read_store(key)))
+        return self._zarr_metadata
+
+    def read_raw_chunk(self, chunk_coords: Tuple[int, ...]) -> Optional[bytes]:
+        "Return the stored (encoded) bytes of a chunk, or None if it is not stored."
+        if ZARR_LIB_V2:
+            # Zero-dimensional arrays have one chunk, stored at "0".
+            key = self._array._chunk_key(chunk_coords or (0,))
+            try:
+                return bytes(self._array.store[key])
+            except KeyError:
+                return None
+        return self._read_store(self._array.metadata.encode_chunk_key(chunk_coords))
+
+    def _read_store(self, key: str) -> Optional[bytes]:
+        "Read a key, relative to the array, from the underlying store."
+        if ZARR_LIB_V2:
+            prefix = f"{self._array.path}/" if self._array.path else ""
+            try:
+                return bytes(self._array.store[prefix + key])
+            except KeyError:
+                return None
+        buffer = sync(
+            (self._array.store_path / key).get(prototype=default_buffer_prototype())
+        )
+        return None if buffer is None else buffer.to_bytes()
+
     def write(self, data: NDArray[Any], slice: NDSlice = NDSlice(...)) -> None:
         if slice:
             raise NotImplementedError
@@ -1,15 +1,17 @@
+import base64
 import collections
 import copy
 import dataclasses
 import importlib
 import itertools as it
+import json
 import logging
 import operator
 import os
 import shutil
 import sys
 import uuid
-from contextlib import closing
+from contextlib import asynccontextmanager, closing
 from datetime import datetime, timezone
 from functools import partial, reduce
 from pathlib import Path
@@ -17,8 +19,10 @@ from typing import Callable, Dict, List, Optional, Union, cast
 from urllib.parse import urlparse
 
 import anyio
+import cachetools
 from fastapi import HTTPException
 from sqlalchemy import (
+    and_,
     delete,
     exists,
     false,
@@ -57,6 +61,7 @@ from tiled.queries import (
     StructureFamilyQuery,
 )
 
+from ..adapters.table_filters import select_rows_pandas
 from ..mimetypes import (
     APACHE_ARROW_FILE_MIME_TYPE,
     AWKWARD_BUFFERS_MIMETYPE,
@@ -112,6 +117,17 @@ from .utils import compute_structure_id
 
 logger = logging.getLogger(__name__)
 
+# Adapters constructed from data sources are cached for reuse across requests.
+# An adapter is evicted when it was constructed more than the TTL ago, however
+# often it is used, or when the cache is at capacity and it is the least
+# recently used.
+DEFAULT_ADAPTER_CACHE_MAX_SIZE = int(os.getenv("TILED_ADAPTER_CACHE_MAX_SIZE", "256"))
+DEFAULT_ADAPTER_CACHE_TTL = float(os.getenv("TILED_ADAPTER_CACHE_TTL", "60."))
+# The ids of nodes at recently resolved paths are cached briefly. A cached id
+# is only a hint: the path and access conditions are checked again on each use.
+DEFAULT_PATH_CACHE_MAX_SIZE = int(os.getenv("TILED_PATH_CACHE_MAX_SIZE", "4096"))
+DEFAULT_PATH_CACHE_TTL = float(os.getenv("TILED_PATH_CACHE_TTL", "5."))
+
 # When data is uploaded, how is it saved?
 # TODO: Make this configurable at Catalog construction time.
 DEFAULT_CREATION_MIMETYPE = {
@@ -172,6 +188,43 @@ class RootNode:
         self.access_blob = top_level_access_blob or {}
 
 
+class AdapterCache:
+    """
+    Hold Adapters constructed from a Node's DataSource, for reuse across requests.
+
+    Entries are keyed on (node id, time updated, data source id, structure id),
+    so a change of structure, including one made by another server process,
+    never serves a stale Adapter. Operations that otherwise change a Node's data
+    source, metadata, or existence invalidate its entries.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_ADAPTER_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_ADAPTER_CACHE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Entries expire ttl seconds after they are set; using them does not
+        # extend their lifetime.
+        self._cache = cachetools.TTLCache(max(maxsize, 1), ttl)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, adapter):
+        if self.maxsize:  # handle size 0 cache
+            self._cache[key] = adapter
+
+    def invalidate(self, node_id):
+        "Drop any Adapters constructed for the Node with this id."
+        for key in [key for key in self._cache if key[0] == node_id]:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        self._cache.clear()
+
+
 class Context:
     def __init__(
         self,
@@ -184,6 +237,10 @@ class Context:
         storage_pool_size=5,
         storage_max_overflow=10,
         webhook_secret_keys: Optional[List[str]] = None,
+        adapter_cache_max_size=DEFAULT_ADAPTER_CACHE_MAX_SIZE,
+        adapter_cache_ttl=DEFAULT_ADAPTER_CACHE_TTL,
+        path_cache_max_size=DEFAULT_PATH_CACHE_MAX_SIZE,
+        path_cache_ttl=DEFAULT_PATH_CACHE_TTL,
     ):
         self.engine = get_database_engine(database_settings)
         self.database_settings = database_settings
@@ -231,6 +288,11 @@ class Context:
         self.cache_config = cache_config
         self.webhook_secret_keys: List[str] = webhook_secret_keys or []
         self.webhook_dispatcher = None
+        self.adapter_cache = AdapterCache(adapter_cache_max_size, adapter_cache_ttl)
+        # Map (root node id, path segments) to the id of the node at that path.
+        self.path_cache = cachetools.TTLCache(
+            max(path_cache_max_size, 1), path_cache_ttl
+        )
 
     def session(self):
         "Convenience method for constructing an AsyncSession context"
@@ -559,8 +621,92 @@ class CatalogNodeAdapter:
 
         return STRUCTURES[node.structure_family](self.context, node)
 
+    async def lookup_path(self, segments: list[str]):
+        """
+        Look up a node below this one, and check access to it, in one query.
+
+        This node's conditions are applied to every node along the path, as
+        they would be if each node were looked up in turn from a parent
+        carrying the same conditions. Return None if the path does not lie
+        entirely within the database or if a node along it does not satisfy
+        the conditions; then the caller should look up one segment at a time.
+        """
+        if (not segments) or any(
+            isinstance(condition.type, MatchType) for condition in self.conditions
+        ):
+            return None
+        cache_key = (self.node.id, tuple(segments))
+        chain = None
+        node_id = self.context.path_cache.get(cache_key)
+        if node_id is not None:
+            chain = await self._path_chain(node_id, segments)
+            if chain is None:
+                # The node was moved or deleted.
+                self.context.path_cache.pop(cache_key, None)
+        if chain is None:
+            node_id = (
+                node_from_segments(segments, root_id=self.node.id)
+                .with_only_columns(orm.Node.id)
+                .correlate(None)
+                .scalar_subquery()
+            )
+            chain = await self._path_chain(node_id, segments)
+            if chain is None:
+                return None
+        *_, (node, _) = chain
+        self.context.path_cache[cache_key] = node.id
+        if not all(allowed for _, allowed in chain):
+            return None
+        return STRUCTURES[node.structure_family](self.context, node)
+
+    async def _path_chain(self, node_id, segments):
+        """
+        Fetch the nodes along a path ending at node_id, and whether each one
+        satisfies this node's conditions, from this node's child downward.
+
+        Return None unless the nodes are at the path given by segments.
+        """
+        statement = (
+            select(orm.Node, and_(true(), *self.conditions).label("allowed"))
+            .join(orm.NodesClosure, orm.NodesClosure.ancestor == orm.Node.id)
+            .where(orm.NodesClosure.descendant == node_id)
+            .where(orm.NodesClosure.depth < len(segments))
+            .order_by(orm.NodesClosure.depth.desc())
+            .options(
+                selectinload(orm.Node.data_sources).selectinload(
+                    orm.DataSource.structure
+                )
+            )
+        )
+        async with self.context.session() as db:
+            chain = (await db.execute(statement)).all()
+        if (
+            (not chain)
+            or (chain[0][0].parent != self.node.id)
+            or ([node.key for node, _ in chain] != list(segments))
+        ):
+            return None
+        return chain
+
     async def get_adapter(self):
         (data_source,) = self.data_sources
+        (data_source_orm,) = self.node.data_sources
+        cache_key = (
+            self.node.id,
+            self.node.time_updated,
+            data_source.id,
+            data_source_orm.structure_id,
+        )
+        adapter = self.context.adapter_cache.get(cache_key)
+        if adapter is None:
+            adapter = await self._construct_adapter(data_source)
+            self.context.adapter_cache.set(cache_key, adapter)
+        for query in self.queries:
+            if hasattr(adapter, "search"):
+                adapter = adapter.search(query)
+        return adapter
+
+    async def _construct_adapter(self, data_source):
         try:
             adapter_cls = self.context.adapters_by_mimetype[data_source.mimetype]
         except KeyError:
@@ -589,7 +735,7 @@ class CatalogNodeAdapter:
                         f"Refusing to serve {asset.data_uri} because it is outside "
                         "the readable storage area for this server."
                     )
-        adapter = await anyio.to_thread.run_sync(
+        return await anyio.to_thread.run_sync(
             partial(
                 adapter_cls.from_catalog,
                 data_source,
@@ -597,10 +743,6 @@ class CatalogNodeAdapter:
                 **data_source.parameters,
             ),
         )
-        for query in self.queries:
-            if hasattr(adapter, "search"):
-                adapter = adapter.search(query)
-        return adapter
 
     def new_variation(
         self,
@@ -707,6 +849,108 @@ class CatalogNodeAdapter:
 
         return insert
 
+    async def _init_data_source(self, structure_family, data_source, path_parts):
+        """
+        Check that the mimetype of a new data source is supported.
+
+        If the data source is managed by Tiled, allocate its storage, and
+        return the updated data source, which lists the new assets.
+        """
+        if data_source.management != Management.external:
+            if structure_family == StructureFamily.container:
+                raise NotImplementedError(structure_family)
+            if data_source.mimetype is None:
+                data_source.mimetype = DEFAULT_CREATION_MIMETYPE[
+                    data_source.structure_family
+                ]
+            if data_source.mimetype not in STORAGE_ADAPTERS_BY_MIMETYPE:
+                raise HTTPException(
+                    status_code=415,
+                    detail=(
+                        f"The given data source mimetype, {data_source.mimetype}, "
+                        "is not one that the Tiled server knows how to write."
+                    ),
+                )
+            adapter_cls = STORAGE_ADAPTERS_BY_MIMETYPE[data_source.mimetype]
+            # Choose writable storage. Use the first writable storage item
+            # with a scheme that is supported by this adapter.
+            # For back-compat, if an adapter does not declare `supported_storage`
+            # assume it supports file-based storage only.
+            supported_storage = getattr(
+                adapter_cls, "supported_storage", lambda: {FileStorage}
+            )()
+            for storage in self.context.writable_storage.values():
+                if isinstance(storage, tuple(supported_storage)):
+                    break
+            else:
+                raise RuntimeError(
+                    f"The adapter {adapter_cls} supports storage types "
+                    f"{[cls.__name__ for cls in supported_storage]} "
+                    "but the only available storage types "
+                    f"are {self.context.writable_storage.values()}."
+                )
+            data_source = await ensure_awaitable(
+                adapter_cls.init_storage,
+                storage,
+                data_source,
+                path_parts,
+            )
+        else:
+            if data_source.mimetype not in self.context.adapters_by_mimetype:
+                raise HTTPException(
+                    status_code=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail=(
+                        f"The given data source mimetype, {data_source.mimetype}, "
+                        "is not one that the Tiled server knows how to read."
+                    ),
+                )
+        return data_source
+
+    async def _notify_child_created(
+        self, key, structure_family, specs, data_sources, node, segments=None
+    ):
+        "Tell subscribers and webhooks about a new child of this node."
+        if self.context.streaming_cache:
+            # Include IDs assigned by database in response.
+            data_sources_with_ids = []
+            for data_source, data_source_orm in zip(data_sources, node.data_sources):
+                ds = data_source.model_copy()
+                ds.id = data_source_orm.id
+                data_sources_with_ids.append(ds)
+
+            # Notify subscribers of the *parent* node about the new child.
+            sequence = await self.context.streaming_cache.incr_seq(self.node.id)
+            metadata = {
+                "type": "container-child-created",
+                "sequence": sequence,
+                "timestamp": datetime.now().isoformat(),
+                "key": key,
+                "structure_family": structure_family,
+                "specs": [spec.model_dump() for spec in (specs or [])],
+                "metadata": node.metadata_,
+                "data_sources": [d.model_dump() for d in data_sources_with_ids],
+                "access_blob": node.access_blob,
+            }
+
+            # Cache data in Redis with a TTL, and publish
+            # a notification about it.
+            await self.context.streaming_cache.set(self.node.id, sequence, metadata)
+        if self.context.webhook_dispatcher:
+            if segments is None:
+                segments = list(await self.path_segments())
+            child_path = segments + [key]
+            await self.context.webhook_dispatcher.dispatch(
+                ContainerChildCreatedEvent(
+                    timestamp=datetime.now(tz=timezone.utc),
+                    key=key,
+                    structure_family=structure_family,
+                    specs=[spec.model_dump() for spec in (specs or [])],
+                    metadata=node.metadata_ or {},
+                    path=child_path,
+                ),
+                node_id=self.node.id,
+            )
+
     async def create_node(
         self,
         structure_family,
@@ -743,55 +987,11 @@ class CatalogNodeAdapter:
                 raise
             await db.refresh(node)
             for data_source in data_sources:
-                if data_source.management != Management.external:
-                    if structure_family == StructureFamily.container:
-                        raise NotImplementedError(structure_family)
-                    if data_source.mimetype is None:
-                        data_source.mimetype = DEFAULT_CREATION_MIMETYPE[
-                            data_source.structure_family
-                        ]
-                    if data_source.mimetype not in STORAGE_ADAPTERS_BY_MIMETYPE:
-                        raise HTTPException(
-                            status_code=415,
-                            detail=(
-                                f"The given data source mimetype, {data_source.mimetype}, "
-                                "is not one that the Tiled server knows how to write."
-                            ),
-                        )
-                    adapter_cls = STORAGE_ADAPTERS_BY_MIMETYPE[data_source.mimetype]
-                    # Choose writable storage. Use the first writable storage item
-                    # with a scheme that is supported by this adapter.
-                    # For back-compat, if an adapter does not declare `supported_storage`
-                    # assume it supports file-based storage only.
-                    supported_storage = getattr(
-                        adapter_cls, "supported_storage", lambda: {FileStorage}
-                    )()
-                    for storage in self.context.writable_storage.values():
-                        if isinstance(storage, tuple(supported_storage)):
-                            break
-                    else:
-                        raise RuntimeError(
-                            f"The adapter {adapter_cls} supports storage types "
-                            f"{[cls.__name__ for cls in supported_storage]} "
-                            "but the only available storage types "
-                            f"are {self.context.writable_storage.values()}."
-                        )
-                    data_source = await ensure_awaitable(
-                        adapter_cls.init_storage,
-                        storage,
-                        data_source,
-                        await self.path_segments() + [key],
-                    )
-                else:
-                    if data_source.mimetype not in self.context.adapters_by_mimetype:
-                        raise HTTPException(
-                            status_code=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                            detail=(
-                                f"The given data source mimetype, {data_source.mimetype}, "
-                                "is not one that the Tiled server knows how to read."
-                            ),
-                        )
-
+                data_source = await self._init_data_source(
+                    structure_family,
+                    data_source,
+                    await self.path_segments() + [key],
+                )
                 if data_source.structure is None:
                     structure_id = None
                 else:
@@ -841,48 +1041,220 @@ class CatalogNodeAdapter:
                     )
                 )
             ).scalar()
-            if self.context.streaming_cache:
-                # Include IDs assigned by database in response.
-                data_sources_with_ids = []
-                for data_source, data_source_orm in zip(
-                    data_sources, refreshed_node.data_sources
-                ):
-                    ds = data_source.model_copy()
-                    ds.id = data_source_orm.id
-                    data_sources_with_ids.append(ds)
-
-                # Notify subscribers of the *parent* node about the new child.
-                sequence = await self.context.streaming_cache.incr_seq(self.node.id)
-                metadata = {
-                    "type": "container-child-created",
-                    "sequence": sequence,
-                    "timestamp": datetime.now().isoformat(),
-                    "key": key,
-                    "structure_family": structure_family,
-                    "specs": [spec.model_dump() for spec in (specs or [])],
-                    "metadata": metadata,
-                    "data_sources": [d.model_dump() for d in data_sources_with_ids],
-                    "access_blob": refreshed_node.access_blob,
-                }
+            await self._notify_child_created(
+                key, structure_family, specs, data_sources, refreshed_node
+            )
+            return type(self)(self.context, refreshed_node)
 
-                # Cache data in Redis with a TTL, and publish
-                # a notification about it.
-                await self.context.streaming_cache.set(self.node.id, sequence, metadata)
-            if self.context.webhook_dispatcher:
-                segments = list(await self.path_segments())
-                child_path = segments + [key]
-                await self.context.webhook_dispatcher.dispatch(
-                    ContainerChildCreatedEvent(
-                        timestamp=datetime.now(tz=timezone.utc),
-                        key=key,
-                        structure_family=structure_family,
-                        specs=[spec.model_dump() for spec in (specs or [])],
-                        metadata=refreshed_node.metadata_ or {},
-                        path=child_path,
+    async def create_nodes(self, nodes):
+        """
+        Create many child nodes, with their data sources, in one transaction.
+
+        Each item of nodes is a dict of keyword arguments to create_node.
+        Structures and assets are deduplicated across the whole batch, and
+        each table is written with one multi-row INSERT (split into batches
+        by the database driver as needed), so the per-node cost is a share
+        of a few statements rather than several round trips.
+
+        If any key is already taken, or given twice, raise Collision and
+        create none of the nodes. Return the new nodes in the order given.
+        """
+        nodes = [
+            {
+                "structure_family": node["structure_family"],
+                "metadata": node.get("metadata") or {},
+                "key": node.get("key") or self.context.key_maker(),
+                "specs": node.get("specs") or [],
+                "data_sources": node.get("data_sources") or [],
+                "access_blob": node.get("access_blob") or {},
+            }
+            for node in nodes
+        ]
+        if not nodes:
+            return []
+        segments = list(await self.path_segments())
+        keys = [node["key"] for node in nodes]
+        for key, count in collections.Counter(keys).items():
+            if count > 1:
+                raise Collision(f"/{'/'.join(segments + [key])}")
+        # Data sources whose storage is allocated below
+        allocated = []
+        async with self.context.session() as db, _delete_storage_on_error(allocated):
+            for batch in _batched(keys, _IN_CLAUSE_BATCH_SIZE):
+                statement = select(orm.Node.key).where(
+                    (orm.Node.parent == self.node.id) & orm.Node.key.in_(batch)
+                )
+                taken = (await db.execute(statement)).scalars().first()
+                if taken is not None:
+                    raise Collision(f"/{'/'.join(segments + [taken])}")
+            for node in nodes:
+                data_sources = []
+                for data_source in node["data_sources"]:
+                    data_source = await self._init_data_source(
+                        node["structure_family"],
+                        data_source,
+                        segments + [node["key"]],
+                    )
+                    if data_source.management != Management.external:
+                        allocated.append(data_source)
+                    data_sources.append(data_source)
+                node["data_sources"] = data_sources
+
+            # Obtain and hash the canonical (RFC 8785) representation of each
+            # distinct JSON structure.
+            structures = {}
+            structure_ids = {}
+            for i, node in enumerate(nodes):
+                for j, data_source in enumerate(node["data_sources"]):
+                    if data_source.structure is None:
+                        structure_ids[i, j] = None
+                        continue
+                    structure = _prepare_structure(
+                        node["structure_family"], data_source.structure
+                    )
+                    structure_id = compute_structure_id(structure)
+                    structures[structure_id] = structure
+                    structure_ids[i, j] = structure_id
+            if structures:
+                await db.execute(
+                    self.insert(orm.Structure.__table__).on_conflict_do_nothing(
+                        index_elements=["id"]
                     ),
-                    node_id=self.node.id,
+                    [{"id": id_, "structure": s} for id_, s in structures.items()],
                 )
-            return type(self)(self.context, refreshed_node)
+
+            nodes_table = orm.Node.__table__
+            try:
+                result = await db.execute(
+                    self.insert(nodes_table).returning(
+                        nodes_table.c.id, nodes_table.c.key
+                    ),
+                    [
+                        {
+                            "key": node["key"],
+                            "parent": self.node.id,
+                            "metadata": node["metadata"],
+                            "structure_family": node["structure_family"],
+                            "specs": node["specs"],
+                            "access_blob": node["access_blob"],
+                        }
+                        for node in nodes
+                    ],
+                )
+            except IntegrityError as exc:
+                # Another request took one of the keys since we checked.
+                UNIQUE_CONSTRAINT_FAILED = "gkpj"
+                if exc.code == UNIQUE_CONSTRAINT_FAILED:
+                    await db.rollback()
+                    raise Collision(f"/{'/'.join(segments)}")
+                raise
+            node_ids = {key: id_ for id_, key in result.all()}
+
+            # Insert the first data source of every node, then the second,
+            # and so on, so that within each INSERT the node id identifies the
+            # data source row that the database returns.
+            data_sources_table = orm.DataSource.__table__
+            data_source_ids = {}
+            for j in range(max(len(node["data_sources"]) for node in nodes)):
+                indexes = []
+                rows = []
+                for i, node in enumerate(nodes):
+                    if j >= len(node["data_sources"]):
+                        continue
+                    data_source = node["data_sources"][j]
+                    indexes.append(i)
+                    rows.append(
+                        {
+                            "node_id": node_ids[node["key"]],
+                            "structure_family": data_source.structure_family,
+                            "mimetype": data_source.mimetype,
+                            "management": data_source.management,
+                            "parameters": data_source.parameters,
+                            "properties": data_source.properties,
+                            "structure_id": structure_ids[i, j],
+                        }
+                    )
+                result = await db.execute(
+                    self.insert(data_sources_table).returning(
+                        data_sources_table.c.id, data_sources_table.c.node_id
+                    ),
+                    rows,
+                )
+                ids_by_node_id = {node_id: id_ for id_, node_id in result.all()}
+                for i in indexes:
+                    data_source_ids[i, j] = ids_by_node_id[node_ids[nodes[i]["key"]]]
+
+            # Find the assets that already exist and insert the rest.
+            is_directory = {}
+            for node in nodes:
+                for data_source in node["data_sources"]:
+                    for asset in data_source.assets:
+                        is_directory.setdefault(asset.data_uri, asset.is_directory)
+            asset_ids = {}
+            for batch in _batched(is_directory, _IN_CLAUSE_BATCH_SIZE):
+                statement = select(orm.Asset.data_uri, orm.Asset.id).where(
+                    orm.Asset.data_uri.in_(batch)
+                )
+                asset_ids.update((await db.execute(statement)).all())
+            new_assets = [
+                {"data_uri": data_uri, "is_directory": value}
+                for data_uri, value in is_directory.items()
+                if data_uri not in asset_ids
+            ]
+            if new_assets:
+                assets_table = orm.Asset.__table__
+                result = await db.execute(
+                    self.insert(assets_table).returning(
+                        assets_table.c.data_uri, assets_table.c.id
+                    ),
+                    new_assets,
+                )
+                asset_ids.update(result.all())
+            associations = [
+                {
+                    "asset_id": asset_ids[asset.data_uri],
+                    "data_source_id": data_source_ids[i, j],
+                    "parameter": asset.parameter,
+                    "num": asset.num,
+                }
+                for i, node in enumerate(nodes)
+                for j, data_source in enumerate(node["data_sources"])
+                for asset in data_source.assets
+            ]
+            if associations:
+                await db.execute(
+                    self.insert(orm.DataSourceAssetAssociation.__table__),
+                    associations,
+                )
+            await db.commit()
+
+            # Load with DataSources each DataSource's Structure.
+            created = {}
+            for batch in _batched(node_ids.values(), _IN_CLAUSE_BATCH_SIZE):
+                statement = (
+                    select(orm.Node)
+                    .filter(orm.Node.id.in_(batch))
+                    .options(
+                        selectinload(orm.Node.data_sources).selectinload(
+                            orm.DataSource.structure
+                        ),
+                    )
+                )
+                for refreshed_node in (await db.execute(statement)).scalars():
+                    created[refreshed_node.key] = refreshed_node
+        adapters = []
+        for node in nodes:
+            refreshed_node = created[node["key"]]
+            await self._notify_child_created(
+                node["key"],
+                node["structure_family"],
+                node["specs"],
+                node["data_sources"],
+                refreshed_node,
+                segments,
+            )
+            adapters.append(type(self)(self.context, refreshed_node))
+        return adapters
 
     async def _put_asset(self, db: AsyncSession, asset):
         # Find an asset_id if it exists, otherwise create a new one
@@ -951,6 +1323,7 @@ class CatalogNodeAdapter:
                     db.add(assoc_orm)
 
             await db.commit()
+        self.context.adapter_cache.invalidate(self.node.id)
         if self.context.streaming_cache:
             sequence = await self.context.streaming_cache.incr_seq(self.node.id)
             metadata = {
@@ -1180,6 +1553,11 @@ class CatalogNodeAdapter:
                 .where(orm.Node.parent.isnot(None))
             )
             await db.commit()
+        if recursive:
+            # The ids of the deleted descendants are not known here.
+            self.context.adapter_cache.clear()
+        else:
+            self.context.adapter_cache.invalidate(self.node.id)
 
         # Physical deletion -- outside database transaction
         # Delete assets backed by files and blobs written by Tiled
@@ -1255,6 +1633,8 @@ class CatalogNodeAdapter:
                 update(orm.Node).where(orm.Node.id == self.node.id).values(**values)
             )
             await db.commit()
+            # Adapters may carry the Node's metadata and specs.
+            self.context.adapter_cache.invalidate(self.node.id)
             # Upon successful update, inform websocket subscribers through redis
             if self.context.streaming_cache:
                 sequence = await self.context.streaming_cache.incr_seq(self.node.parent)
@@ -1325,6 +1705,92 @@ class CatalogNodeAdapter:
 
 
 class CatalogContainerAdapter(CatalogNodeAdapter):
+    @property
+    def supports_cursor(self):
+        "Whether keys_page and items_page can continue from an opaque cursor"
+        return (not self.data_sources) and (keyset_columns(self.sorting) is not None)
+
+    def _page_statement(self, statement, offset, limit, anchor_id):
+        statement = self.apply_conditions(statement)
+        if anchor_id is not None:
+            # Continue from the row identified by the cursor. This uses the
+            # index on the sort columns instead of counting past 'offset' rows.
+            anchor = aliased(orm.Node)
+            statement = statement.join(anchor, anchor.id == anchor_id).filter(
+                keyset_condition(keyset_columns(self.sorting), anchor)
+            )
+        else:
+            statement = statement.offset(offset)
+        # Fetch one extra row to learn whether there is a next page.
+        return statement.order_by(*self.order_by_clauses).limit(limit + 1)
+
+    async def _fetch_page(self, statement, limit, offset, cursor, scalars=False):
+        """
+        Fetch a page of rows and a cursor for the next page, or None.
+
+        If the row that the cursor continues from has since been deleted, fall
+        back to the offset of the page, which the cursor also records.
+        """
+        anchor_id = None
+        if cursor is not None:
+            anchor_id, offset = decode_cursor(cursor)
+
+        async def fetch(db, anchor_id):
+            result = await db.execute(
+                self._page_statement(statement, offset, limit, anchor_id)
+            )
+            return result.scalars().all() if scalars else result.all()
+
+        async with self.context.session() as db:
+            rows = await fetch(db, anchor_id)
+            if (anchor_id is not None) and not rows:
+                anchor_exists = await db.scalar(
+                    select(orm.Node.id).filter(orm.Node.id == anchor_id)
+                )
+                if anchor_exists is None:
+                    rows = await fetch(db, None)
+        next_cursor = (
+            encode_cursor(rows[limit - 1].id, offset + limit)
+            if len(rows) > limit
+            else None
+        )
+        return rows[:limit], next_cursor
+
+    async def keys_page(self, limit, *, offset=0, cursor=None):
+        """
+        Fetch a page of keys and a cursor for the next page, or None.
+
+        If cursor is given, the page begins after the row it identifies and
+        offset is ignored.
+        """
+        rows, next_cursor = await self._fetch_page(
+            select(orm.Node.key, orm.Node.id).filter(orm.Node.parent == self.node.id),
+            limit,
+            offset,
+            cursor,
+        )
+        return [row.key for row in rows], next_cursor
+
+    async def items_page(self, limit, *, offset=0, cursor=None):
+        """
+        Fetch a page of (key, adapter) pairs and a cursor for the next page, or None.
+
+        If cursor is given, the page begins after the row it identifies and
+        offset is ignored.
+        """
+        nodes, next_cursor = await self._fetch_page(
+            select(orm.Node).filter(orm.Node.parent == self.node.id),
+            limit,
+            offset,
+            cursor,
+            scalars=True,
+        )
+        items = [
+            (node.key, STRUCTURES[node.structure_family](self.context, node))
+            for node in nodes
+        ]
+        return items, next_cursor
+
     async def keys_range(self, offset, limit):
         if self.data_sources:
             return it.islice(
@@ -1402,6 +1868,20 @@ class CatalogArrayAdapter(CatalogNodeAdapter):
             (await self.get_adapter()).read_block, *args, **kwargs
         )
 
+    async def zarr_metadata(self):
+        "If this is backed by a stored Zarr array, return its format and metadata."
+        if len(self.data_sources) != 1:
+            return None
+        adapter = await self.get_adapter()
+        if not hasattr(adapter, "zarr_metadata"):
+            return None
+        return await ensure_awaitable(adapter.zarr_metadata)
+
+    async def read_raw_chunk(self, *args, **kwargs):
+        return await ensure_awaitable(
+            (await self.get_adapter()).read_raw_chunk, *args, **kwargs
+        )
+
     async def _stream(self, media_type, entry, body, shape, block=None, offset=None):
         sequence = await self.context.streaming_cache.incr_seq(self.node.id)
         metadata = {
@@ -1496,6 +1976,7 @@ class CatalogArrayAdapter(CatalogNodeAdapter):
             data_source.structure_id = new_structure_id
             db.add(data_source)
             await db.commit()
+            self.context.adapter_cache.invalidate(self.node.id)
             return structure_dict
 
 
@@ -1556,6 +2037,31 @@ class CatalogTableAdapter(CatalogNodeAdapter):
             (await self.get_adapter()).read_partition, *args, **kwargs
         )
 
+    async def read_arrow(self, fields=None, *, filters=None, offset=0, limit=None):
+        adapter = await self.get_adapter()
+        if hasattr(adapter, "read_arrow"):
+            return await ensure_awaitable(
+                adapter.read_arrow, fields, filters=filters, offset=offset, limit=limit
+            )
+        df = await ensure_awaitable(adapter.read, fields)
+        return _arrow_table_from_pandas(select_rows_pandas(df, filters, offset, limit))
+
+    async def read_partition_arrow(
+        self, partition, fields=None, *, filters=None, offset=0, limit=None
+    ):
+        adapter = await self.get_adapter()
+        if hasattr(adapter, "read_partition_arrow"):
+            return await ensure_awaitable(
+                adapter.read_partition_arrow,
+                partition,
+                fields,
+                filters=filters,
+                offset=offset,
+                limit=limit,
+            )
+        df = await ensure_awaitable(adapter.read_partition, partition, fields)
+        return _arrow_table_from_pandas(select_rows_pandas(df, filters, offset, limit))
+
     async def write_partition(self, media_type, deserializer, entry, body, partition):
         if self.context.streaming_cache:
             await self._stream(media_type, entry, body, partition, False)
@@ -1573,6 +2079,38 @@ class CatalogTableAdapter(CatalogNodeAdapter):
         )
 
 
+def _arrow_table_from_pandas(df):
+    import pyarrow
+
+    # This matches what the Arrow serializer would do with the DataFrame.
+    return pyarrow.Table.from_pandas(df, preserve_index=True)
+
+
+@asynccontextmanager
+async def _delete_storage_on_error(data_sources):
+    """
+    Delete the storage allocated for new data sources if creating them fails.
+
+    A Collision is let through without deleting anything: the colliding key
+    names the same storage as the node that holds it.
+    """
+    try:
+        yield
+    except Collision:
+        raise
+    except BaseException:
+        for data_source in data_sources:
+            for asset in data_source.assets:
+                try:
+                    delete_physical_asset(asset.data_uri, asset.is_directory)
+                except FileNotFoundError:
+                    # Not every adapter writes its files when allocating them.
+                    pass
+                except Exception:
+                    logger.exception("Failed to delete storage at %s", asset.data_uri)
+        raise
+
+
 def delete_physical_asset(
     data_uri, is_directory=False, table_name=None, dataset_id=None
 ):
@@ -1656,6 +2194,70 @@ def order_by_clauses(sorting):
     return clauses
 
 
+def keyset_columns(sorting):
+    """
+    Return [(column_name, direction), ...] matching order_by_clauses(sorting).
+
+    Return None if the sorting involves metadata, which may be missing (NULL)
+    and cannot be used for keyset pagination.
+    """
+    columns = []
+    default_sorting_direction = 1
+    for key, direction in sorting:
+        if key == "":
+            default_sorting_direction = direction
+            continue
+        if key not in _STANDARD_SORT_KEYS:
+            return None
+        columns.append((_STANDARD_SORT_KEYS[key], direction))
+    for column in ["time_created", "id"]:
+        columns.append((column, default_sorting_direction))
+    return columns
+
+
+def keyset_condition(columns, anchor):
+    "Match the rows that sort after the anchor row."
+    # (a, b, c) > (a0, b0, c0) expanded as
+    # a > a0 OR (a = a0 AND b > b0) OR (a = a0 AND b = b0 AND c > c0)
+    # with each comparison flipped for descending columns.
+    terms = []
+    for i, (name, direction) in enumerate(columns):
+        column, anchor_column = getattr(orm.Node, name), getattr(anchor, name)
+        after = (column > anchor_column) if direction == 1 else (column < anchor_column)
+        equal = [getattr(orm.Node, n) == getattr(anchor, n) for n, _ in columns[:i]]
+        terms.append(and_(*equal, after))
+    return or_(*terms)
+
+
+def encode_cursor(node_id, offset):
+    """
+    Encode an opaque pagination cursor.
+
+    It identifies the last row of a page, and records the offset of the next
+    page in case that row is deleted.
+    """
+    return (
+        base64.urlsafe_b64encode(
+            json.dumps({"after": node_id, "offset": offset}).encode()
+        )
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor):
+    "Return the id of the row a cursor continues from, and the page offset."
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+        node_id, offset = decoded["after"], decoded["offset"]
+        if not (isinstance(node_id, int) and isinstance(offset, int)):
+            raise TypeError
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid page[cursor].")
+    return node_id, offset
+
+
 _TYPE_CONVERSION_MAP = {
     int: "as_integer",
     float: "as_float",
@@ -1673,6 +2275,17 @@ def _get_value(value, type):
     return getattr(value, _TYPE_CONVERSION_MAP[type])()
 
 
+# The number of values to put in one SQL IN (...) clause
+_IN_CLAUSE_BATCH_SIZE = 500
+
+
+def _batched(iterable, n):
+    "Yield lists of up to n items. (Python 3.12 has itertools.batched.)"
+    iterator = iter(iterable)
+    while batch := list(it.islice(iterator, n)):
+        yield batch
+
+
 def _prepare_structure(structure_family, structure):
     "Convert from pydantic model to dict."
     if structure is None:
@@ -1905,6 +2518,8 @@ def in_memory(
     top_level_access_blob=None,
     cache_config=None,
     webhook_secret_keys: Optional[List[str]] = None,
+    adapter_cache_max_size=DEFAULT_ADAPTER_CACHE_MAX_SIZE,
+    adapter_cache_ttl=DEFAULT_ADAPTER_CACHE_TTL,
 ):
     if not named_memory:
         uri = "sqlite:///:memory:"
@@ -1923,6 +2538,8 @@ def in_memory(
         top_level_access_blob=top_level_access_blob,
         cache_config=cache_config,
         webhook_secret_keys=webhook_secret_keys,
+        adapter_cache_max_size=adapter_cache_max_size,
+        adapter_cache_ttl=adapter_cache_ttl,
     )
 
 
@@ -1989,6 +2606,8 @@ def from_uri(
     storage_pool_size=5,
     catalog_max_overflow=10,
     storage_max_overflow=10,
+    adapter_cache_max_size=DEFAULT_ADAPTER_CACHE_MAX_SIZE,
+    adapter_cache_ttl=DEFAULT_ADAPTER_CACHE_TTL,
 ):
     uri = ensure_specified_sql_driver(uri)
     if init_if_not_exists:
@@ -2027,6 +2646,8 @@ def from_uri(
         storage_pool_size=storage_pool_size,
         storage_max_overflow=storage_max_overflow,
         webhook_secret_keys=webhook_secret_keys,
+        adapter_cache_max_size=adapter_cache_max_size,
+        adapter_cache_ttl=adapter_cache_ttl,
     )
     node = RootNode(metadata, specs, top_level_access_blob)
     mount_path = (
@@ -0,0 +1,697 @@
+"""
+Asynchronous client, for reading many nodes, blocks, or partitions concurrently
+from one thread.
+
+All requests made through one AsyncContext share one pool of connections,
+which may optionally be multiplexed over HTTP/2.
+
+>>> from tiled.client.aio import AsyncContext, from_context
+>>> async with AsyncContext("http://localhost:8000", api_key="secret") as context:
+...     client = await from_context(context)
+...     async for key, child in client.items():
+...         print(key, child)
+...     array_client = await client.get("a")
+...     blocks = await array_client.read_blocks([(0,), (1,), (2,)])
+
+This covers reading. Authenticate by API key, and use the synchronous client,
+tiled.client.from_uri, to log in interactively or to write.
+"""
+import asyncio
+import contextlib
+import itertools
+import math
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import numpy
+from pydantic import TypeAdapter
+
+from ..ndslice import NDBlock, NDSlice, split_slice
+from ..queries import KeyLookup
+from ..schemas import About
+from ..serialization.table import deserialize_arrow
+from ..structures.core import STRUCTURE_TYPES, Spec, StructureFamily
+from ..utils import APACHE_ARROW_FILE_MIME_TYPE, UNSET, DictView, ListView
+from .container import _queries_to_params
+from .context import USER_AGENT, parse_api_uri
+from .decoders import SUPPORTED_DECODERS
+from .transport import AsyncTransport
+from .utils import (
+    DEFAULT_LIMITS_PARAMS,
+    DEFAULT_TIMEOUT_PARAMS,
+    MSGPACK_MIME_TYPE,
+    ClientError,
+    client_for_item,
+    handle_error,
+    retry_context,
+)
+
+_EXTRA_CHARS_PER_ITEM = len("&column=")
+
+
+class AsyncContext:
+    """
+    Wrap an httpx.AsyncClient, authenticated by an optional API key.
+
+    Use it as an async context manager, or await connect() and close().
+
+    Parameters
+    ----------
+    uri : str
+        URI of the root API route, e.g. "http://localhost:8000/api/v1"
+    headers : dict, optional
+        Extra HTTP headers.
+    api_key : str, optional
+        API key based authentication.
+    timeout : httpx.Timeout, optional
+    verify : bool, optional
+        Verify SSL certifications. True by default.
+    http2 : bool, optional
+        Multiplex requests over HTTP/2 connections, if the server supports
+        it. This requires the optional dependency h2.
+    limits : httpx.Limits, optional
+        Limits on the pool of connections shared by all requests. Reads that
+        fan out into many requests make at most max_connections at once, so
+        that the rest do not time out waiting for a connection.
+    app : ASGI app, optional
+        Make requests directly to this app. Primarily for testing.
+    """
+
+    def __init__(
+        self,
+        uri,
+        *,
+        headers=None,
+        api_key=None,
+        timeout=None,
+        verify=True,
+        http2=False,
+        limits=None,
+        app=None,
+        raise_server_exceptions=True,
+    ):
+        headers = dict(headers or {})
+        headers.setdefault(
+            "accept-encoding",
+            ", ".join(key for key in SUPPORTED_DECODERS if key != "identity"),
+        )
+        headers.setdefault("user-agent", USER_AGENT)
+        self.api_uri, api_key = parse_api_uri(uri, api_key)
+        if timeout is None:
+            timeout = httpx.Timeout(**DEFAULT_TIMEOUT_PARAMS)
+        if limits is None:
+            limits = httpx.Limits(**DEFAULT_LIMITS_PARAMS)
+        if app is None:
+            transport = httpx.AsyncHTTPTransport(
+                verify=verify, http2=http2, limits=limits
+            )
+        else:
+            # There is no network, and so no SSL or connection pool, in ASGI mode.
+            transport = httpx.ASGITransport(
+                app=app, raise_app_exceptions=raise_server_exceptions
+            )
+        self.http_client = httpx.AsyncClient(
+            transport=AsyncTransport(transport=transport),
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self.api_key = api_key  # property setter sets Authorization header
+        self.server_info = None
+        if limits.max_connections is None:
+            self._request_slots = contextlib.nullcontext()
+        else:
+            self._request_slots = asyncio.Semaphore(limits.max_connections)
+
+    @classmethod
+    async def from_app(
+        cls,
+        app,
+        *,
+        headers=None,
+        timeout=None,
+        api_key=UNSET,
+        raise_server_exceptions=True,
+        uri=None,
+        limits=None,
+    ):
+        """
+        Construct and connect an AsyncContext around a FastAPI app. For testing.
+        """
+        context = cls(
+            uri="http://local-tiled-app/api/v1" if not uri else uri,
+            headers=headers,
+            api_key=None,
+            timeout=timeout,
+            limits=limits,
+            app=app,
+            raise_server_exceptions=raise_server_exceptions,
+        )
+        await context.connect()
+        if api_key is UNSET:
+            if not context.server_info.authentication.providers:
+                # This is a single-user server.
+                # Extract the API key from the app and set it.
+                from ..server.settings import get_settings
+
+                settings = app.dependency_overrides[get_settings]()
+                api_key = settings.single_user_api_key or None
+            else:
+                api_key = None
+        context.api_key = api_key
+        return context
+
+    def __repr__(self):
+        auth = "(unauthenticated)" if self.api_key is None else "authenticated"
+        return f"<{type(self).__name__} {auth}>"
+
+    async def __aenter__(self):
+        if self.server_info is None:
+            await self.connect()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def connect(self):
+        "Fetch the server info."
+        server_info = (
+            await _get(
+                self,
+                self.api_uri,
+                headers={"Cache-Control": "no-cache, no-store"},
+            )
+        ).json()
+        self.server_info = TypeAdapter(About).validate_python(server_info)
+        return self
+
+    async def close(self):
+        await self.http_client.aclose()
+
+    @property
+    def api_key(self):
+        # Extract from header to ensure that there is one "ground truth" here
+        # and no possibility of state getting mixed up.
+        header = self.http_client.headers.get("Authorization", "")
+        if header.startswith("Apikey "):
+            return header[len("Apikey ") :]  # noqa: E203
+
+    @api_key.setter
+    def api_key(self, api_key):
+        if api_key is None:
+            self.http_client.headers.pop("Authorization", None)
+        else:
+            self.http_client.headers["Authorization"] = f"Apikey {api_key}"
+
+
+async def _get(context, url, *, accept=MSGPACK_MIME_TYPE, params=None, headers=None):
+    "Make a GET request, with retries, and raise if it fails."
+    async for attempt in retry_context():
+        with attempt:
+            response = handle_error(
+                await context.http_client.get(
+                    url,
+                    headers={"Accept": accept, **(headers or {})},
+                    params={**parse_qs(urlparse(str(url)).query), **(params or {})},
+                )
+            )
+    return response
+
+
+async def _gather(context, coroutines):
+    """
+    Await many requests concurrently, and return their results in order.
+
+    At most as many run at once as the connection pool has connections.
+    """
+
+    async def run(coroutine):
+        async with context._request_slots:
+            return await coroutine
+
+    return await asyncio.gather(*map(run, coroutines))
+
+
+async def from_context(
+    context: AsyncContext,
+    structure_clients=None,
+    node_path_parts=None,
+    include_data_sources=False,
+):
+    """
+    Connect to a Node using an AsyncContext.
+
+    Parameters
+    ----------
+    context : AsyncContext
+    structure_clients : dict, optional
+        Map a structure_family or a spec to a client class. By default, use
+        DEFAULT_STRUCTURE_CLIENTS.
+    node_path_parts : list[str], optional
+    include_data_sources : bool, optional
+    """
+    if structure_clients is None:
+        structure_clients = DEFAULT_STRUCTURE_CLIENTS
+    if context.server_info is None:
+        await context.connect()
+    if (context.api_key is None) and context.server_info.authentication.required:
+        raise RuntimeError(
+            "This server requires authentication. The async client supports "
+            "API key authentication only. Set an api_key as in:\n\n"
+            '>>> context = AsyncContext("...", api_key="...")'
+        )
+    # The AsyncContext ensures that context.api_uri has a trailing slash.
+    item_uri = f"{context.api_uri}metadata/{'/'.join(node_path_parts or [])}"
+    params = {}
+    if include_data_sources:
+        params["include_data_sources"] = include_data_sources
+    content = (await _get(context, item_uri, params=params)).json()
+    return client_for_item(
+        context,
+        structure_clients,
+        content["data"],
+        include_data_sources=include_data_sources,
+    )
+
+
+class AsyncBaseClient:
+    "Client-side wrapper around a node, for use with asyncio"
+
+    def __init__(
+        self,
+        context: AsyncContext,
+        *,
+        item,
+        structure_clients,
+        structure=None,
+        include_data_sources=False,
+    ):
+        self._context = context
+        self._item = item
+        self.structure_clients = structure_clients
+        self._include_data_sources = include_data_sources
+        structure_family = item["attributes"]["structure_family"]
+        if structure is not None:
+            self._structure = structure
+        elif structure_family == StructureFamily.container:
+            self._structure = None
+        else:
+            structure_type = STRUCTURE_TYPES[structure_family]
+            self._structure = structure_type.from_json(item["attributes"]["structure"])
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+    @property
+    def context(self):
+        return self._context
+
+    @property
+    def item(self):
+        "JSON payload describing this item. Mostly for internal use."
+        return self._item
+
+    @property
+    def metadata(self):
+        "Metadata about this data source."
+        return DictView(self._item["attributes"]["metadata"])
+
+    @property
+    def specs(self):
+        "List of specifications describing the structure of the metadata and/or data."
+        return ListView([Spec(**spec) for spec in self._item["attributes"]["specs"]])
+
+    @property
+    def uri(self):
+        "Direct link to this entry"
+        return self.item["links"]["self"]
+
+    @property
+    def path_parts(self):
+        "Location of node in tree, given as list of path segments."
+        return self._item["attributes"]["ancestors"] + [self._item["id"]]
+
+    @property
+    def structure_family(self):
+        "Quick access to this entry"
+        return StructureFamily[self.item["attributes"]["structure_family"]]
+
+    def structure(self):
+        """
+        Return a dataclass describing the structure of the data.
+        """
+        return self._structure
+
+    async def refresh(self):
+        params = {}
+        if self._include_data_sources:
+            params["include_data_sources"] = self._include_data_sources
+        content = (await _get(self.context, self.uri, params=params)).json()
+        self._item = content["data"]
+        if self.structure_family != StructureFamily.container:
+            structure_type = STRUCTURE_TYPES[self.structure_family]
+            self._structure = structure_type.from_json(
+                self._item["attributes"]["structure"]
+            )
+        return self
+
+    def _client_for_item(self, item):
+        return client_for_item(
+            self.context,
+            self.structure_clients,
+            item,
+            include_data_sources=self._include_data_sources,
+        )
+
+
+class AsyncContainer(AsyncBaseClient):
+    """
+    Client-side wrapper around a container, for use with asyncio
+
+    Iterate over it with ``async for``. Each page of results is requested
+    while the previous one is being consumed.
+    """
+
+    def __init__(
+        self,
+        context,
+        *,
+        item,
+        structure_clients,
+        queries=None,
+        structure=None,
+        include_data_sources=False,
+    ):
+        super().__init__(
+            context,
+            item=item,
+            structure_clients=structure_clients,
+            structure=structure,
+            include_data_sources=include_data_sources,
+        )
+        self._queries = list(queries or [])
+        self._queries_as_params = _queries_to_params(*self._queries)
+
+    def __aiter__(self):
+        return self.keys()
+
+    def search(self, query):
+        "Make a Node with a subset of this Node's entries, filtered by query."
+        return type(self)(
+            self.context,
+            item=self.item,
+            structure_clients=self.structure_clients,
+            queries=self._queries + [query],
+            include_data_sources=self._include_data_sources,
+        )
+
+    async def count(self):
+        "Number of entries in this Node (like len() in the synchronous client)"
+        content = (
+            await _get(
+                self.context,
+                self.item["links"]["search"],
+                params={"fields": "count", **self._queries_as_params},
+            )
+        ).json()
+        return content["meta"]["count"]
+
+    async def get(self, keys):
+        """
+        Return a client for a child, given a key like 'a', 'a/b', or ('a', 'b').
+        """
+        if not isinstance(keys, tuple):
+            keys = (keys,)
+        for key in keys:
+            if not isinstance(key, str):
+                raise TypeError("Containers can only be indexed by strings")
+        keys = tuple("/".join(keys).strip("/").split("/"))  # Remove any slashes
+        if self._queries:
+            # Lookup the first key *within the search results* of this Node.
+            key, *tail = keys
+            params = {
+                **_queries_to_params(KeyLookup(key)),
+                **self._queries_as_params,
+            }
+            if self._include_data_sources:
+                params["include_data_sources"] = True
+            content = (
+                await _get(self.context, self.item["links"]["search"], params=params)
+            ).json()
+            if not content["data"]:
+                raise KeyError(key)
+            (item,) = content["data"]
+            result = self._client_for_item(item)
+            if tail:
+                result = await result.get(tuple(tail))
+            return result
+        # Jump straight to the node of interest in one request.
+        link = self.item["links"]["self"].rstrip("/") + "".join(
+            f"/{key}" for key in keys
+        )
+        params = {}
+        if self._include_data_sources:
+            params["include_data_sources"] = True
+        try:
+            content = (await _get(self.context, link, params=params)).json()
+        except ClientError as err:
+            if err.response.status_code == httpx.codes.NOT_FOUND:
+                raise KeyError(keys[0] if len(keys) == 1 else keys)
+            raise
+        return self._client_for_item(content["data"])
+
+    async def _pages(self, page_size, **params):
+        """
+        Yield the entries of this Node one page at a time.
+
+        The next page is requested while the caller works through this one.
+        """
+        params = {**params, **self._queries_as_params}
+        if page_size is not None:
+            params["page[limit]"] = page_size
+        link = self.item["links"]["search"]
+        pending = asyncio.ensure_future(_get(self.context, link, params=params))
+        try:
+            while pending is not None:
+                content = (await pending).json()
+                next_page_url = content["links"]["next"]
+                pending = None
+                if next_page_url is not None:
+                    pending = asyncio.ensure_future(
+                        _get(self.context, next_page_url, params=params)
+                    )
+                yield content["data"]
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def keys(self, page_size=None):
+        "Iterate over keys, fetching them one page at a time."
+        async for page in self._pages(page_size, fields=""):
+            for item in page:
+                yield item["id"]
+
+    async def items(self, page_size=None):
+        "Iterate over (key, client) pairs, fetching them one page at a time."
+        params = {}
+        if self._include_data_sources:
+            params["include_data_sources"] = True
+        async for page in self._pages(page_size, **params):
+            for item in page:
+                yield item["id"], self._client_for_item(item)
+
+    async def values(self, page_size=None):
+        "Iterate over clients, fetching them one page at a time."
+        async for _, value in self.items(page_size):
+            yield value
+
+
+class AsyncArrayClient(AsyncBaseClient):
+    "Client-side wrapper around an array-like, for use with asyncio"
+
+    # As in ArrayClient, a read larger than this is split into several requests,
+    # which are made concurrently.
+    RESPONSE_BYTESIZE_LIMIT = 100 * 1024 * 1024  # 100 MiB
+
+    @property
+    def dims(self):
+        return self.structure().dims
+
+    @property
+    def shape(self):
+        return self.structure().shape
+
+    @property
+    def dtype(self):
+        return self.structure().data_type.to_numpy_dtype()
+
+    @property
+    def chunks(self):
+        return self.structure().chunks
+
+    @property
+    def ndim(self):
+        return len(self.structure().shape)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} shape={self.shape} dtype={self.dtype}>"
+
+    async def read_block(self, block, slice=None):
+        """
+        Access the data for one block of this chunked array.
+
+        Optionally, access only a slice *within* this block.
+        """
+        block, block_slice = NDBlock(block), NDSlice(slice)
+        block = block.expand_for_shape([len(dim) for dim in self.chunks])
+        try:
+            shape = block.shape_from_chunks(self.chunks)
+        except IndexError:
+            raise IndexError(f"Block index {block} out of range")
+        exp_shape = block_slice.shape_after_slice(shape) if block_slice else shape
+        if 0 in exp_shape:
+            # An array with 0 as one of the dimensions never contains data.
+            return numpy.array([], dtype=self.dtype).reshape(exp_shape)
+        params = {
+            "block": block.to_numpy_str(),
+            "expected_shape": ",".join(map(str, exp_shape)) or "scalar",
+        }
+        if block_slice:
+            params["slice"] = block_slice.to_numpy_str()
+        response = await _get(
+            self.context,
+            self.item["links"]["block"],
+            accept="application/octet-stream",
+            params=params,
+        )
+        return numpy.frombuffer(response.content, dtype=self.dtype).reshape(exp_shape)
+
+    async def read_blocks(self, blocks):
+        """
+        Access the data for many blocks of this chunked array, concurrently.
+
+        Returns a list of arrays, one per block, in the order given.
+        """
+        return list(
+            await _gather(self.context, (self.read_block(block) for block in blocks))
+        )
+
+    async def _get_slice(self, slice: NDSlice):
+        exp_shape = slice.shape_after_slice(self.shape) if slice else self.shape
+        params = {"expected_shape": ",".join(map(str, exp_shape)) or "scalar"}
+        if slice:
+            params["slice"] = slice.to_numpy_str()
+        response = await _get(
+            self.context,
+            self.item["links"]["full"],
+            accept="application/octet-stream",
+            params=params,
+        )
+        return numpy.frombuffer(response.content, dtype=self.dtype).reshape(exp_shape)
+
+    async def read(self, slice=None):
+        """
+        Access the entire array or a slice.
+
+        A large read is split along the chunk boundaries into several requests,
+        which are made concurrently.
+        """
+        if arr_slice := NDSlice(slice):
+            arr_slice = arr_slice.expand_for_shape(self.shape)  # Remove "..."
+        exp_shape = arr_slice.shape_after_slice(self.shape)
+        if 0 in exp_shape:
+            # An array with 0 as one of the dimensions never contains data.
+            return numpy.array([], dtype=self.dtype).reshape(exp_shape)
+        if math.prod(exp_shape) * self.dtype.itemsize < self.RESPONSE_BYTESIZE_LIMIT:
+            return await self._get_slice(arr_slice)
+        chunk_bounds = tuple(
+            tuple(itertools.accumulate(axis_chunks, initial=0))
+            for axis_chunks in self.chunks
+        )
+        indexed_slices = split_slice(
+            arr_slice.expand_for_shape(self.shape),
+            max_size=self.RESPONSE_BYTESIZE_LIMIT // self.dtype.itemsize,
+            pref_splits=chunk_bounds,
+        )
+        pieces = await _gather(
+            self.context, (self._get_slice(slc) for slc in indexed_slices.values())
+        )
+        # Arrange the pieces in a grid, by their indexes, and stitch them together.
+        grid = numpy.empty(
+            tuple(1 + max(axis) for axis in zip(*indexed_slices)), dtype=object
+        )
+        for index, piece in zip(indexed_slices, pieces):
+            grid[index] = piece
+        return numpy.block(grid.tolist())
+
+
+class AsyncDataFrameClient(AsyncBaseClient):
+    "Client-side wrapper around a dataframe-like, for use with asyncio"
+
+    # See BaseClient.URL_CHARACTER_LIMIT
+    URL_CHARACTER_LIMIT = 2_000  # number of characters
+
+    @property
+    def columns(self):
+        return self.structure().columns
+
+    async def read_partition(self, partition, columns=None):
+        """
+        Access one partition of the table, as a pandas.DataFrame.
+
+        Optionally select a subset of the columns.
+        """
+        npartitions = self.structure().npartitions
+        if not (0 <= partition < npartitions):
+            raise IndexError(f"partition {partition} out of range")
+        link = self.item["links"]["partition"]
+        params = {"partition": partition}
+        url_length_for_get_request = len(link) + sum(
+            _EXTRA_CHARS_PER_ITEM + len(column) for column in (columns or ())
+        )
+        if url_length_for_get_request > self.URL_CHARACTER_LIMIT:
+            async for attempt in retry_context():
+                with attempt:
+                    response = handle_error(
+                        await self.context.http_client.post(
+                            link,
+                            headers={"Accept": APACHE_ARROW_FILE_MIME_TYPE},
+                            json=columns,
+                            params={**parse_qs(urlparse(link).query), **params},
+                        )
+                    )
+        else:
+            if columns:
+                params["column"] = columns
+            response = await _get(
+                self.context, link, accept=APACHE_ARROW_FILE_MIME_TYPE, params=params
+            )
+        return deserialize_arrow(response.content)
+
+    async def read(self, columns=None):
+        """
+        Access the entire table, as a pandas.DataFrame.
+
+        The partitions are requested concurrently. Optionally select a subset
+        of the columns.
+        """
+        import pandas
+
+        partitions = await _gather(
+            self.context,
+            (
+                self.read_partition(partition, columns)
+                for partition in range(self.structure().npartitions)
+            ),
+        )
+        return pandas.concat(partitions)
+
+
+DEFAULT_STRUCTURE_CLIENTS = {
+    "array": AsyncArrayClient,
+    "awkward": AsyncBaseClient,
+    "container": AsyncContainer,
+    "composite": AsyncContainer,
+    "sparse": AsyncBaseClient,
+    "table": AsyncDataFrameClient,
+}
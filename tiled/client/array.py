@@ -1,6 +1,7 @@
 import concurrent.futures
 import itertools
 import math
+import struct
 from typing import TYPE_CHECKING, Optional, Union
 from urllib.parse import parse_qs, urlparse
 
@@ -18,6 +19,7 @@ from .utils import (
     export_util,
     handle_error,
     params_from_slice,
+    prefetch,
     retry_context,
     slices_to_dask_chunks,
 )
@@ -35,6 +37,14 @@ class _DaskArrayClient(BaseClient):
     # requests and will fetch each chunk separately as determiied by the structure.
     RESPONSE_BYTESIZE_LIMIT = 100 * 1024 * 1024  # 100 MiB
 
+    # The limit on the number of blocks requested together when fetching many
+    # blocks at once, which keeps the URL a reasonable length.
+    BLOCKS_PER_REQUEST = 256
+
+    # The number of requests made ahead of the consumer, in background threads,
+    # when iterating over the blocks or frames of an array.
+    PREFETCH_DEPTH = 4
+
     def __init__(self, *args, item, **kwargs):
         super().__init__(*args, item=item, **kwargs)
 
@@ -142,6 +152,65 @@ class _DaskArrayClient(BaseClient):
 
         return numpy.frombuffer(content, dtype=self.dtype).reshape(exp_shape)
 
+    def _get_blocks(self, blocks: list[NDBlock]):
+        """Fetch the data for many chunks (blocks) in a chunked array at once.
+
+        This private method is used internally by the client and requires the
+        `blocks` to be pre-cast as NDBlock types of integers.
+
+        This method uses the `/array/blocks` endpoint to fetch all of the blocks
+        in one request. For servers that do not provide it, it falls back to
+        fetching each block separately.
+
+        See read_blocks() for a public version of this.
+
+        Parameters
+        ----------
+        blocks : list[NDBlock]
+            The chunk indexes, e.g. [(0, 0), (0, 1), (0, 2)].
+
+        Returns
+        -------
+        arrays : list[numpy.ndarray]
+            One array per block, in the order given.
+        """
+        if "blocks" not in self.item["links"]:
+            return [self._get_block(block) for block in blocks]
+
+        media_type = "application/octet-stream"
+        numblocks = [len(dim) for dim in self.chunks]
+        blocks = [block.expand_for_shape(numblocks) for block in blocks]
+        url_path = self.item["links"]["blocks"]
+        params = {
+            **parse_qs(urlparse(url_path).query),
+            "block": [block.to_numpy_str() for block in blocks],
+        }
+        for attempt in retry_context():
+            with attempt:
+                content = handle_error(
+                    self.context.http_client.get(
+                        url_path,
+                        headers={"Accept": media_type},
+                        params=params,
+                    )
+                ).read()
+
+        # Each block is preceded by its length in bytes, as uint64.
+        arrays = []
+        offset = 0
+        for block in blocks:
+            (nbytes,) = struct.unpack_from("<Q", content, offset)
+            offset += 8
+            array = numpy.frombuffer(
+                content,
+                dtype=self.dtype,
+                count=nbytes // self.dtype.itemsize,
+                offset=offset,
+            )
+            arrays.append(array.reshape(block.shape_from_chunks(self.chunks)))
+            offset += nbytes
+        return arrays
+
     def _get_slice(self, slice: NDSlice):
         """Fetch the data for a slice of the full array
 
@@ -213,6 +282,67 @@ class _DaskArrayClient(BaseClient):
         )
         return dask_array
 
+    def read_blocks(self, blocks):
+        """Access the data for many blocks of this chunked (dask) array.
+
+        Neighbouring blocks are fetched together using the `/array/blocks`
+        endpoint, in batches of up to BLOCKS_PER_REQUEST blocks and
+        RESPONSE_BYTESIZE_LIMIT bytes, so that many small blocks do not cost
+        one request each. Compute the results together (e.g. with
+        `dask.compute`) so that each batch is fetched only once. (read() does
+        not need this: it fetches whole slices of up to RESPONSE_BYTESIZE_LIMIT
+        bytes per request, not single blocks.)
+
+        Each block is given as one integer index per dimension, e.g. (0, 1, 2)
+        for a 3-dimensional array.
+
+        Returns a list of dask arrays, one per block, in the order given.
+        """
+
+        numblocks = tuple(map(len, self.chunks))
+        shapes = {}
+        requested = []
+        for block in blocks:
+            if len(block) != len(numblocks) or not all(
+                isinstance(index, (int, numpy.integer)) for index in block
+            ):
+                raise ValueError(
+                    f"Block index {block} must give one integer per dimension "
+                    f"of the {len(numblocks)}-dimensional array"
+                )
+            block = NDBlock(*map(int, block)).expand_for_shape(numblocks)
+            try:
+                shapes[block] = block.shape_from_chunks(self.chunks)
+            except IndexError:
+                raise IndexError(f"Block index {block} out of range")
+            requested.append(block)
+
+        # Group the distinct blocks, in C order, into batches of neighbours.
+        batches = [[]]
+        batch_bytes = 0
+        for block in sorted(shapes):
+            nbytes = math.prod(shapes[block]) * self.dtype.itemsize
+            if batches[-1] and (
+                (len(batches[-1]) >= self.BLOCKS_PER_REQUEST)
+                or (batch_bytes + nbytes > self.RESPONSE_BYTESIZE_LIMIT)
+            ):
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(block)
+            batch_bytes += nbytes
+
+        delayed_blocks = {}
+        for batch in batches:
+            delayed_batch = dask.delayed(self._get_blocks)(batch)
+            for i, block in enumerate(batch):
+                delayed_blocks[block] = delayed_batch[i]
+        return [
+            dask.array.from_delayed(
+                delayed_blocks[block], dtype=self.dtype, shape=shapes[block]
+            )
+            for block in requested
+        ]
+
     def read(self, slice=None):
         """Access the entire array or its slice
 
@@ -517,3 +647,69 @@ class ArrayClient(DaskArrayClient):
         Optionally, access only a slice *within* this block.
         """
         return super().read_block(block, slice).compute()
+
+    def read_blocks(self, blocks):
+        """
+        Access the data for many blocks of this chunked array.
+
+        Neighbouring blocks are fetched together, in as few requests as
+        practical. Returns a list of arrays, one per block, in the order given.
+        """
+        return list(dask.compute(*super().read_blocks(blocks)))
+
+    def iter_blocks(self, blocks=None, prefetch_depth=None):
+        """
+        Iterate over the data for blocks of this chunked array, in order.
+
+        While each block is consumed, the next ones are fetched in the
+        background, up to prefetch_depth (default PREFETCH_DEPTH) at a time.
+
+        Parameters
+        ----------
+        blocks : iterable of tuples, optional
+            Block indexes. By default, all the blocks in C order, e.g.
+            (0, 0), (0, 1), (1, 0), (1, 1) for a 2D array chunked into 2x2.
+        prefetch_depth : int, optional
+        """
+        numblocks = tuple(map(len, self.chunks))
+        if blocks is None:
+            blocks = itertools.product(*map(range, numblocks))
+        if prefetch_depth is None:
+            prefetch_depth = self.PREFETCH_DEPTH
+        return prefetch(
+            lambda block: self._get_block(NDBlock(block)), blocks, prefetch_depth
+        )
+
+    def iter_frames(self, prefetch_depth=None):
+        """
+        Iterate over the array along its first axis, like iter(numpy_array).
+
+        Frames are fetched together, a chunk (or as much of one as fits in
+        RESPONSE_BYTESIZE_LIMIT) per request. While each group of frames is
+        consumed, the next ones are fetched in the background, up to
+        prefetch_depth (default PREFETCH_DEPTH) requests at a time.
+        """
+        if not self.shape:
+            raise TypeError("iteration over a 0-d array")
+        if prefetch_depth is None:
+            prefetch_depth = self.PREFETCH_DEPTH
+        frame_bytes = math.prod(self.shape[1:]) * self.dtype.itemsize
+        max_frames = max(1, self.RESPONSE_BYTESIZE_LIMIT // max(1, frame_bytes))
+        ranges = []
+        start = 0
+        for chunk in self.chunks[0]:
+            for offset in range(0, chunk, max_frames):
+                stop = start + min(chunk, offset + max_frames)
+                ranges.append(slice(start + offset, stop))
+            start += chunk
+        for frames in prefetch(
+            lambda frames: self._get_slice(
+                NDSlice(frames).expand_for_shape(self.shape)
+            ),
+            ranges,
+            prefetch_depth,
+        ):
+            yield from frames
+
+    def __iter__(self):
+        return self.iter_frames()
@@ -1,8 +1,12 @@
 import enum
+import hashlib
 import json
 import os
+import shutil
 import sqlite3
+import tempfile
 import threading
+import time
 import typing as tp
 from contextlib import closing
 from datetime import datetime
@@ -14,7 +18,15 @@ import platformdirs
 
 from .utils import SerializableLock, TiledResponse
 
-CACHE_DATABASE_SCHEMA_VERSION = 1
+CACHE_DATABASE_SCHEMA_VERSION = 2
+
+# Updates to access times from Cache.get are held in memory and written in one
+# transaction once there are this many of them or the oldest is this old, or
+# before the cache next evicts anything.
+ACCESS_FLUSH_COUNT = 100
+ACCESS_FLUSH_INTERVAL = 5  # seconds
+# Number of least recently used entries to consider at a time when evicting
+EVICTION_BATCH_SIZE = 100
 
 
 class CachedResponse(TiledResponse):
@@ -101,8 +113,29 @@ is_stream INTEGER,
 encoding TEXT,
 size INTEGER,
 time_created REAL,
-time_last_accessed REAL
+time_last_accessed REAL,
+blob_name TEXT
 )"""
+        )
+        cur.execute(
+            "CREATE INDEX responses_time_last_accessed "
+            "ON responses (time_last_accessed)"
+        )
+        # Maintain the total size of the bodies, so that it need not be summed
+        # over all the responses on every insert.
+        cur.execute("CREATE TABLE tiled_http_response_cache_size (total INTEGER)")
+        cur.execute("INSERT INTO tiled_http_response_cache_size (total) VALUES (0)")
+        cur.execute(
+            """CREATE TRIGGER responses_insert AFTER INSERT ON responses
+BEGIN
+UPDATE tiled_http_response_cache_size SET total = total + NEW.size;
+END"""
+        )
+        cur.execute(
+            """CREATE TRIGGER responses_delete AFTER DELETE ON responses
+BEGIN
+UPDATE tiled_http_response_cache_size SET total = total - OLD.size;
+END"""
         )
         cur.execute("CREATE TABLE tiled_http_response_cache_version (version INTEGER)")
         cur.execute(
@@ -122,7 +155,7 @@ def _prepare_database(filepath, readonly):
             f"file:{filepath}?mode=ro", uri=True, check_same_thread=False
         )
     else:
-        conn = sqlite3.connect(filepath, check_same_thread=False)
+        conn = _connect(filepath)
     cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
     tables = [row[0] for row in cursor.fetchall()]
     if not tables:
@@ -142,12 +175,30 @@ def _prepare_database(filepath, readonly):
             # *may* never need to change the schema. But if we do, we will
             # not bother with migrations. The cache is highly disposable.
             # Just silently blow it away and start over.
-            Path(filepath).unlink()
-            conn = sqlite3.connect(filepath, check_same_thread=False)
+            conn.close()
+            for suffix in ["", "-wal", "-shm"]:
+                Path(f"{filepath}{suffix}").unlink(missing_ok=True)
+            shutil.rmtree(_blob_directory(filepath), ignore_errors=True)
+            conn = _connect(filepath)
             _create_tables(conn)
     return conn
 
 
+def _connect(filepath):
+    conn = sqlite3.connect(filepath, check_same_thread=False)
+    # Readers do not block the writer, or vice versa, so that several
+    # processes can share a cache. As the cache is disposable, it need not
+    # be synced to disk on every commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _blob_directory(filepath):
+    "Directory holding the bodies stored outside the database"
+    return Path(f"{filepath}.blobs")
+
+
 def with_thread_lock(fn):
     """Makes sure the wrapper isn't accessed concurrently."""
 
@@ -176,12 +227,32 @@ class ThreadingMode(enum.IntEnum):
 
 
 class Cache:
+    """
+    LRU cache of HTTP responses, backed by a SQLite file
+
+    Parameters
+    ----------
+    filepath : str or Path, optional
+        Defaults to ``$TILED_CACHE_DIR/http_response_cache.db``.
+    capacity : int, optional
+        Maximum total size of the response bodies, in bytes
+    max_item_size : int, optional
+        Maximum size of any one response body, in bytes
+    readonly : bool, optional
+        If True, read the cache but never update it.
+    blob_threshold : int, optional
+        If set, store bodies at least this large as files in a directory next
+        to the database, instead of in the database itself, to keep the
+        database small and quick to update.
+    """
+
     def __init__(
         self,
         filepath=None,
         capacity=500_000_000,
         max_item_size=500_000,
         readonly=False,
+        blob_threshold=None,
     ):
         if filepath is None:
             # Resolve this here, not at module scope, because the test suite
@@ -197,10 +268,14 @@ class Cache:
         self._capacity = capacity
         self._max_item_size = max_item_size
         self._readonly = readonly
+        self._blob_threshold = blob_threshold
         self._filepath = filepath
         self._owner_thread = threading.current_thread().ident
         self._conn = _prepare_database(filepath, readonly)
         self._lock = SerializableLock()
+        # Maps cache_key to time of last access, pending a write.
+        self._accessed = {}
+        self._accessed_since = None
 
     def __repr__(self):
         return f"<{type(self).__name__} {str(self._filepath)!r}>"
@@ -225,17 +300,21 @@ class Cache:
             self.max_item_size,
             self._readonly,
             self._lock,
+            self._blob_threshold,
         )
 
     def __setstate__(self, state):
-        (filepath, capacity, max_item_size, readonly, lock) = state
+        (filepath, capacity, max_item_size, readonly, lock, blob_threshold) = state
         self._capacity = capacity
         self._max_item_size = max_item_size
         self._readonly = readonly
+        self._blob_threshold = blob_threshold
         self._filepath = filepath
         self._owner_thread = threading.current_thread().ident
         self._conn = _prepare_database(filepath, readonly)
         self._lock = lock
+        self._accessed = {}
+        self._accessed_since = None
 
     @property
     def readonly(self):
@@ -265,6 +344,49 @@ class Cache:
     def max_item_size(self, max_item_size):
         self._max_item_size = max_item_size
 
+    @property
+    def blob_threshold(self):
+        "Min size of a response body stored in a file outside the database."
+        return self._blob_threshold
+
+    def _flush_accessed(self, cur):
+        "Write pending access times. The caller commits."
+        if self._accessed:
+            cur.executemany(
+                "UPDATE responses SET time_last_accessed = ? WHERE cache_key = ?",
+                [(t, cache_key) for cache_key, t in self._accessed.items()],
+            )
+            self._accessed.clear()
+        self._accessed_since = None
+
+    def _delete_blobs(self, blob_names):
+        directory = _blob_directory(self._filepath)
+        for blob_name in blob_names:
+            if blob_name is not None:
+                (directory / blob_name).unlink(missing_ok=True)
+
+    def _write_blob(self, cache_key, body):
+        "Write a body to a file, atomically, and return its name."
+        directory = _blob_directory(self._filepath)
+        directory.mkdir(parents=True, exist_ok=True)
+        blob_name = hashlib.sha256(cache_key.encode()).hexdigest()
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(body)
+            os.replace(tmp_path, directory / blob_name)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return blob_name
+
+    def _read_blob(self, blob_name):
+        try:
+            return (_blob_directory(self._filepath) / blob_name).read_bytes()
+        except FileNotFoundError:
+            # Evicted by another process sharing the cache
+            return None
+
     @with_thread_lock
     def clear(self):
         """
@@ -277,8 +399,11 @@ class Cache:
                 "Cannot clear cache from a different thread than the one it was created on"
             )
         with closing(self._conn.cursor()) as cur:
+            self._accessed.clear()
+            self._accessed_since = None
             cur.execute("DELETE FROM responses")
             self._conn.commit()
+        shutil.rmtree(_blob_directory(self._filepath), ignore_errors=True)
 
     @with_thread_lock
     def get(self, request: httpx.Request) -> tp.Optional[httpx.Response]:
@@ -296,7 +421,7 @@ class Cache:
             cache_key = get_cache_key(request)
             row = cur.execute(
                 """SELECT
-status_code, headers, body, is_stream, encoding
+status_code, headers, body, is_stream, encoding, blob_name
 FROM
 responses
 WHERE cache_key = ?""",
@@ -304,14 +429,22 @@ WHERE cache_key = ?""",
             ).fetchone()
             if row is None:
                 return None
+            *row, blob_name = row
+            if blob_name is not None:
+                row[2] = self._read_blob(blob_name)
+                if row[2] is None:
+                    return None
             if (not self.readonly) and self.write_safe():
-                cur.execute(
-                    """UPDATE responses
-    SET time_last_accessed = ?
-    WHERE cache_key = ?""",
-                    (datetime.now().timestamp(), cache_key),
-                )
-            self._conn.commit()
+                # Defer the write, so that a hit costs one read.
+                now = time.monotonic()
+                self._accessed[cache_key] = datetime.now().timestamp()
+                if self._accessed_since is None:
+                    self._accessed_since = now
+                if (len(self._accessed) >= ACCESS_FLUSH_COUNT) or (
+                    now - self._accessed_since >= ACCESS_FLUSH_INTERVAL
+                ):
+                    self._flush_accessed(cur)
+                    self._conn.commit()
 
         return load(row, request)
 
@@ -343,27 +476,57 @@ WHERE cache_key = ?""",
         if incoming_size > self.max_item_size:
             # Decline to store.
             return False
+        cache_key = get_cache_key(request)
+        row = dump(response, content)
+        blob_name = None
+        if (self.blob_threshold is not None) and (incoming_size >= self.blob_threshold):
+            blob_name = self._write_blob(cache_key, row[2])
+            row = row[:2] + (None,) + row[3:]
+        evicted_blobs = []
         with closing(self._conn.cursor()) as cur:
-            (total_size,) = cur.execute("SELECT SUM(size) FROM responses").fetchone()
-            total_size = total_size or 0  # If empty, total_size is None.
+            # Evict by up-to-date access times.
+            self._flush_accessed(cur)
+            # Remove any previous version of this response, so that the
+            # trigger maintaining the total size counts it.
+            previous = cur.execute(
+                "SELECT blob_name FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if previous is not None:
+                cur.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+                if previous[0] != blob_name:
+                    evicted_blobs.append(previous[0])
+            (total_size,) = cur.execute(
+                "SELECT total FROM tiled_http_response_cache_size"
+            ).fetchone()
             while (incoming_size + total_size) > self.capacity:
-                # Cull to make space.
-                (cache_key, size) = cur.execute(
+                # Cull to make space, least recently used first.
+                rows = cur.execute(
                     """SELECT
-cache_key, size
+cache_key, size, blob_name
 FROM responses
-ORDER BY time_last_accessed ASC"""
-                ).fetchone()
-                cur.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
-                total_size -= size
+ORDER BY time_last_accessed ASC
+LIMIT ?""",
+                    (EVICTION_BATCH_SIZE,),
+                ).fetchall()
+                if not rows:
+                    break
+                for evicted_key, size, evicted_blob in rows:
+                    cur.execute(
+                        "DELETE FROM responses WHERE cache_key = ?", (evicted_key,)
+                    )
+                    evicted_blobs.append(evicted_blob)
+                    total_size -= size
+                    if (incoming_size + total_size) <= self.capacity:
+                        break
             cur.execute(
-                """INSERT OR REPLACE INTO responses
-(cache_key, status_code, headers, body, is_stream, encoding, size, time_created, time_last_accessed)
+                """INSERT INTO responses
+(cache_key, status_code, headers, body, is_stream, encoding, size, time_created, time_last_accessed, blob_name)
 VALUES
-(?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (get_cache_key(request),) + dump(response, content),
+(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (cache_key,) + row + (blob_name,),
             )
             self._conn.commit()
+        self._delete_blobs(evicted_blobs)
         return True
 
     @with_thread_lock
@@ -377,17 +540,23 @@ VALUES
             raise RuntimeError("Cache is readonly")
         if not self.write_safe():
             raise RuntimeError("Write is not safe from another thread")
+        cache_key = get_cache_key(request)
         with closing(self._conn.cursor()) as cur:
-            cur.execute(
-                "DELETE FROM responses WHERE cache_key=?", (get_cache_key(request),)
-            )
+            self._accessed.pop(cache_key, None)
+            deleted = cur.execute(
+                "SELECT blob_name FROM responses WHERE cache_key=?", (cache_key,)
+            ).fetchall()
+            cur.execute("DELETE FROM responses WHERE cache_key=?", (cache_key,))
             self._conn.commit()
+        self._delete_blobs(name for (name,) in deleted)
 
     def size(self):
         "Size of response bodies in bytes (does not count headers and other auxiliary info)"
         with closing(self._conn.cursor()) as cur:
-            (total_size,) = cur.execute("SELECT SUM(size) FROM responses").fetchone()
-        return total_size or 0  # If emtpy, total_size is None.
+            (total_size,) = cur.execute(
+                "SELECT total FROM tiled_http_response_cache_size"
+            ).fetchone()
+        return total_size
 
     def count(self):
         "Number of responses cached"
@@ -395,6 +564,16 @@ VALUES
             (count,) = cur.execute("SELECT COUNT(*) FROM responses").fetchone()
         return count or 0  # If empty, count is None.
 
+    @with_thread_lock
+    def flush(self) -> None:
+        """Write any pending updates to access times."""
+        if self.readonly or not self._accessed or not self.write_safe():
+            return
+        with closing(self._conn.cursor()) as cur:
+            self._flush_accessed(cur)
+            self._conn.commit()
+
     def close(self) -> None:
         """Close cache."""
+        self.flush()
         self._conn.close()
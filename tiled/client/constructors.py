@@ -29,6 +29,7 @@ def from_uri(
     timeout=None,
     include_data_sources=False,
     auth: Optional[httpx.Auth] = None,
+    limits: Optional[httpx.Limits] = None,
 ):
     """
     Connect to a Node on a local or remote server.
@@ -65,6 +66,10 @@ def from_uri(
         Default False. If True, fetch information about underlying data sources.
     auth : httpx.Auth, optional
         Custom authentication handler.
+    limits : httpx.Limits, optional
+        Limits on the pool of connections to the server. If None, use Tiled
+        default settings. Raise max_connections to make more requests at once,
+        e.g. when reading many blocks of an array concurrently.
     """
     EXPLAIN_LOGIN = """
 
@@ -91,6 +96,7 @@ For non-interactive authentication, use an API key or add custom auth
         headers=headers,
         timeout=timeout,
         verify=verify,
+        limits=limits,
     )
     if auth is not None:
         if isinstance(auth, httpx.Auth):
@@ -674,29 +674,10 @@ class Container(BaseClient, collections.abc.Mapping, IndexersMixin):
             # Do not print messy traceback from thread. Just fail silently.
             return []
 
-    def new(
-        self,
-        structure_family,
-        data_sources,
-        *,
-        key=None,
-        metadata=None,
-        specs=None,
-        access_tags=None,
+    def _new_item(
+        self, structure_family, data_sources, key, metadata, specs, access_tags
     ):
-        """
-        Create a new item within this Node.
-
-        This is a low-level method. See high-level convenience methods listed below.
-
-        See Also
-        --------
-        write_array
-        write_table
-        write_coo_array
-        """
-
-        self._cached_len = None
+        "Build the item for a new node and the body of the request to create it."
         metadata = metadata or {}
         access_blob = {"tags": access_tags} if access_tags is not None else {}
 
@@ -724,26 +705,10 @@ class Container(BaseClient, collections.abc.Mapping, IndexersMixin):
         body = dict(item["attributes"])
         if key is not None:
             body["id"] = key
+        return item, body
 
-        # if check:
-        if any(data_source.assets for data_source in data_sources):
-            endpoint = self.uri.replace("/metadata/", "/register/", 1)
-        else:
-            endpoint = self.uri
-
-        for attempt in retry_context():
-            with attempt:
-                document = handle_error(
-                    self.context.http_client.post(
-                        endpoint,
-                        headers={
-                            "Accept": MSGPACK_MIME_TYPE,
-                            "Content-Type": "application/json",
-                        },
-                        content=safe_json_dump(body),
-                    )
-                ).json()
-
+    def _client_for_new_item(self, item, structure_family, data_sources, document):
+        "Complete the item for a new node with the server's response to creating it."
         if structure_family == StructureFamily.container:
             structure = {"contents": None, "count": None}
         else:
@@ -799,6 +764,121 @@ class Container(BaseClient, collections.abc.Mapping, IndexersMixin):
             include_data_sources=self._include_data_sources,
         )
 
+    def new(
+        self,
+        structure_family,
+        data_sources,
+        *,
+        key=None,
+        metadata=None,
+        specs=None,
+        access_tags=None,
+    ):
+        """
+        Create a new item within this Node.
+
+        This is a low-level method. See high-level convenience methods listed below.
+
+        See Also
+        --------
+        write_array
+        write_table
+        write_coo_array
+        new_batch
+        """
+
+        self._cached_len = None
+        item, body = self._new_item(
+            structure_family, data_sources, key, metadata, specs, access_tags
+        )
+
+        # if check:
+        if any(data_source.assets for data_source in data_sources):
+            endpoint = self.uri.replace("/metadata/", "/register/", 1)
+        else:
+            endpoint = self.uri
+
+        for attempt in retry_context():
+            with attempt:
+                document = handle_error(
+                    self.context.http_client.post(
+                        endpoint,
+                        headers={
+                            "Accept": MSGPACK_MIME_TYPE,
+                            "Content-Type": "application/json",
+                        },
+                        content=safe_json_dump(body),
+                    )
+                ).json()
+
+        return self._client_for_new_item(item, structure_family, data_sources, document)
+
+    def new_batch(self, nodes):
+        """
+        Create many new items within this Node, in one request.
+
+        The server creates all of them in one transaction: if any key is
+        already taken, none are created. The server accepts up to 1000 items
+        per request. This is a low-level method.
+
+        Parameters
+        ----------
+        nodes : list[dict]
+            The arguments to new() for each item: structure_family and
+            data_sources, and optionally key, metadata, specs, access_tags.
+
+        Returns
+        -------
+        clients : list
+            One client per new item, in the order given.
+
+        See Also
+        --------
+        new
+        """
+        self._cached_len = None
+        nodes = list(nodes)
+        items = []
+        bodies = []
+        for node in nodes:
+            item, body = self._new_item(
+                node["structure_family"],
+                node["data_sources"],
+                node.get("key"),
+                node.get("metadata"),
+                node.get("specs"),
+                node.get("access_tags"),
+            )
+            items.append(item)
+            bodies.append(body)
+
+        if any(
+            data_source.assets for node in nodes for data_source in node["data_sources"]
+        ):
+            endpoint = self.uri.replace("/metadata/", "/batch/register/", 1)
+        else:
+            endpoint = self.uri.replace("/metadata/", "/batch/metadata/", 1)
+
+        for attempt in retry_context():
+            with attempt:
+                document = handle_error(
+                    self.context.http_client.post(
+                        endpoint,
+                        headers={
+                            "Accept": MSGPACK_MIME_TYPE,
+                            "Content-Type": "application/json",
+                        },
+                        content=safe_json_dump({"nodes": bodies}),
+                    )
+                ).json()
+
+        return [
+            self._client_for_new_item(
+                item, node["structure_family"], node["data_sources"], node_document
+            )
+            for item, node, node_document in zip(items, nodes, document["nodes"])
+        ]
+
     # When (re)chunking arrays for upload, we use this limit
     # to attempt to avoid bumping into size limits.
     _SUGGESTED_MAX_UPLOAD_SIZE = 100_000_000  # 100 MB
@@ -21,6 +21,7 @@ from .auth import CannotRefreshAuthentication, TiledAuth, build_refresh_request
 from .decoders import SUPPORTED_DECODERS
 from .transport import Transport
 from .utils import (
+    DEFAULT_LIMITS_PARAMS,
     DEFAULT_TIMEOUT_PARAMS,
     MSGPACK_MIME_TYPE,
     handle_error,
@@ -150,9 +151,51 @@ def prompt_for_credentials(http_client, providers: List[AboutAuthenticationProvi
     return tokens
 
 
+def parse_api_uri(uri, api_key=None):
+    """
+    Split the URI of the root API route into a clean URI and an API key.
+
+    Return the URI with a trailing slash and without params or fragments, and
+    the API key given as ?api_key=..., as the argument, or in the environment.
+    """
+    uri = httpx.URL(uri)
+    # If ?api_key=... is present, move it from the query into a header.
+    # The server would accept it in the query parameter, but using
+    # a header is a little more secure (e.g. not logged).
+    parsed_params = urllib.parse.parse_qs(uri.query.decode())
+    api_key_list = parsed_params.pop("api_key", None)
+    if api_key_list is not None:
+        if api_key is not None:
+            raise ValueError(
+                "api_key was provided as query parameter in URI and as keyword argument. Pick one."
+            )
+        if len(api_key_list) != 1:
+            raise ValueError("Cannot handle two api_key query parameters")
+        (api_key,) = api_key_list
+    if api_key is None:
+        # Check for an API key from the environment.
+        api_key = os.getenv("TILED_API_KEY")
+
+    # FastAPI redirects /api -> /api/ so add it here to save a request.
+    path = uri.path
+    if not path.endswith("/"):
+        path = f"{path}/"
+    # Construct the uri *without* api_key param.
+    # Drop any params/fragments.
+    api_uri = httpx.URL(
+        urllib.parse.urlunsplit((uri.scheme, uri.netloc.decode(), path, {}, ""))
+    )
+    return api_uri, api_key
+
+
 class Context:
     """
     Wrap an httpx.Client with an optional cache and authentication functionality.
+
+    The limits (an httpx.Limits) bound the pool of connections to the server:
+    how many requests may be in flight at once (max_connections), how many
+    idle connections are kept open for reuse (max_keepalive_connections), and
+    for how long (keepalive_expiry, in seconds).
     """
 
     def __init__(
@@ -164,6 +207,7 @@ class Context:
         cache=UNSET,
         timeout=None,
         verify=True,
+        limits=None,
         app=None,
         raise_server_exceptions=True,
     ):
@@ -185,41 +229,21 @@ class Context:
         # version is too old.
         headers.setdefault("user-agent", USER_AGENT)
 
-        # If ?api_key=... is present, move it from the query into a header.
-        # The server would accept it in the query parameter, but using
-        # a header is a little more secure (e.g. not logged).
-        parsed_params = urllib.parse.parse_qs(uri.query.decode())
-        api_key_list = parsed_params.pop("api_key", None)
-        if api_key_list is not None:
-            if api_key is not None:
-                raise ValueError(
-                    "api_key was provided as query parameter in URI and as keyword argument. Pick one."
-                )
-            if len(api_key_list) != 1:
-                raise ValueError("Cannot handle two api_key query parameters")
-            (api_key,) = api_key_list
-        if api_key is None:
-            # Check for an API key from the environment.
-            api_key = os.getenv("TILED_API_KEY")
+        self.api_uri, api_key = parse_api_uri(uri, api_key)
         # We will set the API key via the `api_key` property below,
         # after constructing the Client object.
-
-        # FastAPI redirects /api -> /api/ so add it here to save a request.
-        path = uri.path
-        if not path.endswith("/"):
-            path = f"{path}/"
-        # Construct the uri *without* api_key param.
-        # Drop any params/fragments.
-        self.api_uri = httpx.URL(
-            urllib.parse.urlunsplit((uri.scheme, uri.netloc.decode(), path, {}, ""))
-        )
         if timeout is None:
             timeout = httpx.Timeout(**DEFAULT_TIMEOUT_PARAMS)
         if cache is UNSET:
             cache = None
+        if limits is None:
+            limits = httpx.Limits(**DEFAULT_LIMITS_PARAMS)
         if app is None:
             client = httpx.Client(
-                transport=Transport(cache=cache),
+                transport=Transport(
+                    transport=httpx.HTTPTransport(verify=verify, limits=limits),
+                    cache=cache,
+                ),
                 verify=verify,
                 timeout=timeout,
                 follow_redirects=True,
@@ -261,6 +285,7 @@ class Context:
 
         self.http_client = client
         self._verify = verify
+        self._limits = limits
         self._cache = cache
         self._token_cache = Path(TILED_CACHE_DIR / "tokens")
 
@@ -340,6 +365,7 @@ class Context:
             self.http_client.timeout,
             self.http_client.auth,
             self._verify,
+            self._limits,
             self._token_cache,
             self.server_info,
             self.cache,
@@ -354,6 +380,7 @@ class Context:
             timeout,
             auth,
             verify,
+            limits,
             token_cache,
             server_info,
             cache,
@@ -372,7 +399,10 @@ class Context:
             )
         self.http_client = httpx.Client(
             verify=verify,
-            transport=Transport(cache=cache),
+            transport=Transport(
+                transport=httpx.HTTPTransport(verify=verify, limits=limits),
+                cache=cache,
+            ),
             cookies=cookies,
             timeout=timeout,
             headers=headers,
@@ -382,6 +412,7 @@ class Context:
         self._token_cache = token_cache
         self._cache = cache
         self._verify = verify
+        self._limits = limits
         self.server_info = server_info
 
     @classmethod
@@ -394,6 +425,7 @@ class Context:
         cache=UNSET,
         timeout=None,
         verify=True,
+        limits=None,
         app=None,
     ):
         """
@@ -447,6 +479,7 @@ class Context:
             cache=cache,
             timeout=timeout,
             verify=verify,
+            limits=limits,
             app=app,
         )
         return context, node_path_parts
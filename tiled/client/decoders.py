@@ -38,7 +38,15 @@ if modules_available("zstandard"):
             self._obj = self._context.decompressobj()
 
         def decode(self, data: bytes) -> bytes:
-            return self._obj.decompress(data)
+            # Some servers send a streaming body as a series of frames.
+            output = []
+            while data:
+                output.append(self._obj.decompress(data))
+                if not self._obj.eof:
+                    break
+                data = self._obj.unused_data
+                self._obj = self._context.decompressobj()
+            return b"".join(output)
 
         def flush(self) -> bytes:
             return b""
@@ -1,4 +1,5 @@
 import collections
+import contextvars
 import dataclasses
 import logging
 import mimetypes
@@ -21,6 +22,11 @@ from .utils import ClientError
 
 logger = logging.getLogger(__name__)
 
+# The default number of files to introspect at once
+DEFAULT_CONCURRENCY = 1
+# The default number of nodes to create per request
+DEFAULT_BATCH_SIZE = 100
+
 
 def strip_suffixes(filename):
     """
@@ -94,6 +100,9 @@ class Settings:
     mimetype_detection_hook: callable
     key_from_filename: callable
     filter: callable
+    # Bounds the number of files being introspected at once, across the walk.
+    limiter: anyio.CapacityLimiter
+    batch_size: int
 
     @classmethod
     def init(
@@ -103,6 +112,8 @@ class Settings:
         mimetype_detection_hook=None,
         key_from_filename=None,
         filter=None,
+        concurrency=DEFAULT_CONCURRENCY,
+        batch_size=DEFAULT_BATCH_SIZE,
     ):
         # If parameters come from a configuration file, they
         # are given as importable strings, like "package.module:Reader".
@@ -132,8 +143,14 @@ class Settings:
             mimetype_detection_hook=mimetype_detection_hook,
             key_from_filename=key_from_filename,
             filter=filter,
+            limiter=anyio.CapacityLimiter(concurrency),
+            batch_size=batch_size,
         )
 
+    @property
+    def concurrency(self):
+        return int(self.limiter.total_tokens)
+
 
 async def register(
     node,
@@ -146,14 +163,24 @@ async def register(
     key_from_filename=None,
     filter=None,
     overwrite=True,
+    concurrency=DEFAULT_CONCURRENCY,
+    batch_size=DEFAULT_BATCH_SIZE,
 ):
-    "Register a file or directory (recursively)."
+    """
+    Register a file or directory (recursively).
+
+    Up to `concurrency` files (and directories) are introspected at once, in
+    threads, and the nodes for the files in each directory are created in
+    batches of up to `batch_size` per request.
+    """
     settings = Settings.init(
         adapters_by_mimetype=adapters_by_mimetype,
         mimetypes_by_file_ext=mimetypes_by_file_ext,
         mimetype_detection_hook=mimetype_detection_hook,
         key_from_filename=key_from_filename,
         filter=filter,
+        concurrency=concurrency,
+        batch_size=batch_size,
     )
     path = Path(path)
     parsed_walkers = []
@@ -227,15 +254,24 @@ async def _walk(
             directories.append(item)
         else:
             files.append(item)
-    for walker in walkers:
-        files, directories = await walker(
-            node,
-            path,
-            files,
-            directories,
-            settings,
-        )
-    for directory in directories:
+    # Nodes that the walkers create directly in this node are collected
+    # and created in batches.
+    batch = NodeBatch(node, settings.batch_size)
+    token = _node_batch.set(batch)
+    try:
+        for walker in walkers:
+            files, directories = await walker(
+                node,
+                path,
+                files,
+                directories,
+                settings,
+            )
+        await batch.flush()
+    finally:
+        _node_batch.reset(token)
+
+    async def walk_directory(directory):
         key = settings.key_from_filename(directory.name)
         await create_node_or_drop_collision(
             node,
@@ -255,6 +291,8 @@ async def _walk(
             settings,
         )
 
+    await map_concurrently(walk_directory, directories, settings.concurrency)
+
 
 async def one_node_per_item(
     node,
@@ -264,26 +302,20 @@ async def one_node_per_item(
     settings,
 ):
     "Process each file and directory as mapping to one logical 'node' in Tiled."
-    unhandled_files = []
-    unhandled_directories = []
-    for file in files:
-        result = await register_single_item(
-            node,
-            file,
-            is_directory=False,
-            settings=settings,
-        )
-        if result is None:
-            unhandled_files.append(file)
-    for directory in directories:
-        result = await register_single_item(
-            node,
-            directory,
-            is_directory=True,
-            settings=settings,
-        )
-        if result is None:
-            unhandled_directories.append(directory)
+    results = await map_concurrently(
+        partial(register_single_item, node, is_directory=False, settings=settings),
+        files,
+        settings.concurrency,
+    )
+    unhandled_files = [file for file, result in zip(files, results) if result is None]
+    results = await map_concurrently(
+        partial(register_single_item, node, is_directory=True, settings=settings),
+        directories,
+        settings.concurrency,
+    )
+    unhandled_directories = [
+        directory for directory, result in zip(directories, results) if result is None
+    ]
     return unhandled_files, unhandled_directories
 
 
@@ -293,7 +325,12 @@ async def register_single_item(
     is_directory,
     settings,
 ):
-    "Register a single file or directory as a node."
+    """
+    Register a single file or directory as a node.
+
+    Return the new node, or its key if its creation was deferred to a batch,
+    or None if the item could not be registered.
+    """
     unhandled_items = []
     mimetype = resolve_mimetype(
         item, settings.mimetypes_by_file_ext, settings.mimetype_detection_hook
@@ -313,46 +350,49 @@ async def register_single_item(
         return
     adapter_class = settings.adapters_by_mimetype[mimetype]
     logger.info("    Resolved mimetype '%s' with adapter for '%s'", mimetype, item)
+
+    def introspect():
+        # Constructing the adapter may open and read the file, so this runs
+        # in a worker thread.
+        adapter = adapter_class.from_uris(ensure_uri(item))
+        if hasattr(adapter, "generate_data_sources"):
+            # Let the Adapter describe the DataSouce(s).
+            data_sources = adapter.generate_data_sources(
+                mimetype, dict_or_none, item, is_directory
+            )
+        else:
+            # Back-compat: Assume one Asset passed as a
+            # parameter named 'data_uri'.
+            data_sources = [
+                DataSource(
+                    structure_family=adapter.structure_family,
+                    mimetype=mimetype,
+                    structure=dict_or_none(adapter.structure()),
+                    parameters={},
+                    management=Management.external,
+                    assets=[
+                        Asset(
+                            data_uri=ensure_uri(item),
+                            is_directory=is_directory,
+                            parameter="data_uri",
+                        )
+                    ],
+                )
+            ]
+        return {
+            "structure_family": adapter.structure_family,
+            "metadata": dict(adapter.metadata()),
+            "specs": adapter.specs,
+            "data_sources": data_sources,
+        }
+
     try:
-        adapter = await anyio.to_thread.run_sync(
-            adapter_class.from_uris, ensure_uri(item)
-        )
+        kwargs = await anyio.to_thread.run_sync(introspect, limiter=settings.limiter)
     except Exception:
         logger.exception("    SKIPPED: Error constructing adapter for '%s':", item)
         return
     key = settings.key_from_filename(item.name)
-    if hasattr(adapter, "generate_data_sources"):
-        # Let the Adapter describe the DataSouce(s).
-        data_sources = adapter.generate_data_sources(
-            mimetype, dict_or_none, item, is_directory
-        )
-    else:
-        # Back-compat: Assume one Asset passed as a
-        # parameter named 'data_uri'.
-        data_sources = [
-            DataSource(
-                structure_family=adapter.structure_family,
-                mimetype=mimetype,
-                structure=dict_or_none(adapter.structure()),
-                parameters={},
-                management=Management.external,
-                assets=[
-                    Asset(
-                        data_uri=ensure_uri(item),
-                        is_directory=is_directory,
-                        parameter="data_uri",
-                    )
-                ],
-            )
-        ]
-    return await create_node_or_drop_collision(
-        node,
-        key=key,
-        structure_family=adapter.structure_family,
-        metadata=dict(adapter.metadata()),
-        specs=adapter.specs,
-        data_sources=data_sources,
-    )
+    return await create_node_or_defer(node, key=key, **kwargs)
 
 
 # Matches filename with (optional) prefix characters followed by digits \d
@@ -406,8 +446,11 @@ async def group_image_sequences(
                 sequences[sequence_name].append(file)
                 continue
         unhandled_files.append(file)
-    for name, sequence in sequences.items():
-        await register_image_sequence(node, name, sorted(sequence), settings)
+    await map_concurrently(
+        lambda item: register_image_sequence(node, item[0], sorted(item[1]), settings),
+        list(sequences.items()),
+        settings.concurrency,
+    )
     return unhandled_files, unhandled_directories
 
 
@@ -427,13 +470,16 @@ async def register_image_sequence(node, name, sequence, settings):
     adapter_class = settings.adapters_by_mimetype[mimetype]
     key = settings.key_from_filename(name)
     try:
-        adapter = adapter_class.from_uris(
-            *[ensure_uri(filepath) for filepath in sequence]
+        adapter = await anyio.to_thread.run_sync(
+            lambda: adapter_class.from_uris(
+                *[ensure_uri(filepath) for filepath in sequence]
+            ),
+            limiter=settings.limiter,
         )
     except Exception:
         logger.exception("    SKIPPED: Error constructing adapter for '%s'", name)
         return
-    await create_node_or_drop_collision(
+    await create_node_or_defer(
         node,
         key=key,
         structure_family=adapter.structure_family,
@@ -491,6 +537,8 @@ async def watch(
     key_from_filename=None,
     filter=None,
     initial_walk_complete_event=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    batch_size=DEFAULT_BATCH_SIZE,
 ):
     settings = Settings.init(
         adapters_by_mimetype=adapters_by_mimetype,
@@ -498,6 +546,8 @@ async def watch(
         mimetype_detection_hook=mimetype_detection_hook,
         key_from_filename=key_from_filename,
         filter=filter,
+        concurrency=concurrency,
+        batch_size=batch_size,
     )
     if initial_walk_complete_event is None:
         initial_walk_complete_event = anyio.Event()
@@ -529,6 +579,8 @@ async def watch(
             mimetype_detection_hook=settings.mimetype_detection_hook,
             key_from_filename=settings.key_from_filename,
             filter=settings.filter,
+            concurrency=settings.concurrency,
+            batch_size=settings.batch_size,
         )
         # Signal that initial walk is complete.
         # Process any changes that were accumulated during the initial walk.
@@ -615,6 +667,8 @@ async def process_changes(
             mimetype_detection_hook=settings.mimetype_detection_hook,
             key_from_filename=settings.key_from_filename,
             filter=settings.filter,
+            concurrency=settings.concurrency,
+            batch_size=settings.batch_size,
         )
 
 
@@ -646,6 +700,94 @@ async def create_node_or_drop_collision(
             raise
 
 
+# The batch of new nodes being collected for the directory currently being
+# walked, if any. Walkers run in the context of their directory, so they
+# need not be aware of it.
+_node_batch = contextvars.ContextVar("node_batch", default=None)
+
+
+class NodeBatch:
+    """
+    Collect new children of one node and create them in batches.
+
+    If the server rejects a batch because of a key collision, or does not
+    support creating nodes in batches, fall back to creating them one at a
+    time, so that collisions are handled just as they are by
+    create_node_or_drop_collision.
+    """
+
+    def __init__(self, node, size):
+        self.node = node
+        self.size = size
+        self._pending = []
+        self._lock = anyio.Lock()
+
+    async def add(self, **kwargs):
+        self._pending.append(kwargs)
+        if len(self._pending) >= self.size:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            if self.size > 1:
+                try:
+                    # The walk holds synchronous clients, so make this
+                    # blocking request in a worker thread, leaving the event
+                    # loop free to introspect other files meanwhile.
+                    await anyio.to_thread.run_sync(self.node.new_batch, pending)
+                    return
+                except ClientError as err:
+                    status_code = err.response.status_code
+                    if status_code in {
+                        httpx.codes.NOT_FOUND,
+                        httpx.codes.METHOD_NOT_ALLOWED,
+                    }:
+                        # This server cannot create nodes in batches.
+                        self.size = 1
+                    elif status_code != httpx.codes.CONFLICT:
+                        raise
+            for kwargs in pending:
+                await create_node_or_drop_collision(self.node, **kwargs)
+
+
+async def create_node_or_defer(node, *, key, **kwargs):
+    """
+    Create a node, deferring to the batch being collected for this node, if any.
+
+    Return the new node, or its key if its creation was deferred.
+    """
+    batch = _node_batch.get()
+    if (batch is not None) and (batch.node is node):
+        await batch.add(key=key, **kwargs)
+        return key
+    return await create_node_or_drop_collision(node, key=key, **kwargs)
+
+
+async def map_concurrently(func, items, concurrency):
+    """
+    Await func(item) for each item, running up to `concurrency` at once.
+
+    Return the results in the order of the items.
+    """
+    results = [None] * len(items)
+    semaphore = anyio.Semaphore(concurrency)
+
+    async def run(i, item):
+        try:
+            results[i] = await func(item)
+        finally:
+            semaphore.release()
+
+    async with anyio.create_task_group() as tg:
+        for i, item in enumerate(items):
+            await semaphore.acquire()
+            tg.start_soon(run, i, item)
+    return results
+
+
 def dict_or_none(structure):
     if structure is None:
         return None
@@ -1,5 +1,8 @@
+import concurrent.futures
 import itertools
+import json
 import warnings
+from pathlib import Path
 
 import httpx
 
@@ -13,6 +16,10 @@ def copy(
     source: BaseClient,
     dest: BaseClient,
     on_conflict: str = "error",
+    *,
+    max_workers: int = 4,
+    batch_size: int = 100,
+    checkpoint=None,
 ):
     """
     Copy data from one Tiled instance to another.
@@ -22,6 +29,15 @@ def copy(
     source : tiled node
     dest : tiled node
     on_conflict : str, default 'error', other options 'warn', 'skip'
+    max_workers : int, default 4
+        Number of blocks, partitions, etc. to copy at once. Each is read from
+        the source and written to the destination in a worker thread, so reads
+        of some overlap with writes of others.
+    batch_size : int, default 100
+        Number of nodes to create in the destination per request.
+    checkpoint : str or Path, optional
+        File recording what has been copied. If the copy is interrupted, run
+        it again with the same checkpoint to resume where it left off.
 
     Examples
     --------
@@ -43,25 +59,153 @@ def copy(
     Copy and ignore duplicates.
 
     >>> copy(a, b, on_conflict = 'skip')
+
+    Copy a large catalog, resumably.
+
+    >>> copy(a, b, max_workers=16, checkpoint="copy-checkpoint.jsonl")
     """
-    if hasattr(source, "structure_family"):
-        # looks like a client object
-        _DISPATCH[source.structure_family](
-            source.include_data_sources(), dest, on_conflict
-        )
-    else:
-        _DISPATCH[StructureFamily.container](dict(source), dest, on_conflict)
+    with _Copier(max_workers, batch_size, on_conflict, checkpoint) as copier:
+        if hasattr(source, "structure_family"):
+            # looks like a client object
+            _DISPATCH[source.structure_family](
+                source.include_data_sources(), dest, copier, ()
+            )
+        else:
+            _DISPATCH[StructureFamily.container](dict(source), dest, copier, ())
+        copier.wait()
+
+
+class _Checkpoint:
+    """
+    Set of completed units of work, which is appended to a file, if given
+
+    Each unit is a tuple like ("block", path, block), written as one line of JSON.
+    """
+
+    def __init__(self, filepath=None):
+        self._completed = set()
+        self._file = None
+        if filepath is not None:
+            filepath = Path(filepath)
+            if filepath.exists():
+                # A partly written last line, from an interrupted copy, is
+                # simply never matched.
+                self._completed.update(filepath.read_text().splitlines())
+            self._file = open(filepath, "a")
+
+    def __contains__(self, unit):
+        return json.dumps(unit) in self._completed
+
+    def add(self, unit):
+        line = json.dumps(unit)
+        self._completed.add(line)
+        if self._file is not None:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class _Copier:
+    """
+    Run units of work in a pool of threads, and record them as they complete
+
+    The tree is walked, and nodes are created, in the calling thread. Only
+    the copying of data, which does not depend on other units, is submitted
+    to the pool, so that the pool cannot deadlock.
+    """
+
+    def __init__(self, max_workers, batch_size, on_conflict, checkpoint):
+        self.batch_size = batch_size
+        self.on_conflict = on_conflict
+        self.checkpoint = _Checkpoint(checkpoint)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        # Bound the data held in memory by units waiting to run.
+        self._max_pending = 2 * max_workers
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.checkpoint.close()
+
+    def submit(self, unit, func, *args):
+        "Run func(*args) in the pool unless unit has already been completed."
+        if unit in self.checkpoint:
+            return
+        while len(self._pending) >= self._max_pending:
+            self._collect(concurrent.futures.FIRST_COMPLETED)
+        self._pending[self._executor.submit(func, *args)] = unit
+
+    def wait(self):
+        "Wait for all submitted units to complete."
+        while self._pending:
+            self._collect(concurrent.futures.FIRST_COMPLETED)
+
+    def _collect(self, return_when):
+        done, _ = concurrent.futures.wait(self._pending, return_when=return_when)
+        for future in done:
+            unit = self._pending.pop(future)
+            future.result()  # Raise if it failed.
+            self.checkpoint.add(unit)
+
+    def create_nodes(self, dest, nodes):
+        """
+        Create nodes in dest, in one request if possible.
+
+        Return a client for each, or None for those skipped due to a conflict.
+        """
+        if (self.batch_size > 1) and (len(nodes) > 1):
+            try:
+                return dest.new_batch(nodes)
+            except ClientError as err:
+                status_code = err.response.status_code
+                if status_code in {
+                    httpx.codes.NOT_FOUND,
+                    httpx.codes.METHOD_NOT_ALLOWED,
+                }:
+                    # This server cannot create nodes in batches.
+                    self.batch_size = 1
+                elif status_code != httpx.codes.CONFLICT:
+                    raise
+            # Create them one at a time, to handle conflicts per on_conflict.
+        results = []
+        for node in nodes:
+            try:
+                results.append(dest.new(**node))
+            except ClientError as err:
+                if (
+                    self.on_conflict == "skip" or self.on_conflict == "warn"
+                ) and err.response.status_code == httpx.codes.CONFLICT:
+                    if self.on_conflict == "warn":
+                        warnings.warn("Skipped existing entry")
+                    results.append(None)
+                else:
+                    raise err
+        return results
 
 
-def _copy_array(source, dest, on_conflict):
+def _copy_array(source, dest, copier, path):
     num_blocks = (range(len(n)) for n in source.chunks)
     # Loop over each block index --- e.g. (0, 0), (0, 1), (0, 2) ....
     for block in itertools.product(*num_blocks):
-        array = source.read_block(block)
-        dest.write_block(array, block)
+        copier.submit(("block", path, block), _copy_array_block, source, dest, block)
 
 
-def _copy_awkward(source, dest, on_conflict):
+def _copy_array_block(source, dest, block):
+    array = source.read_block(block)
+    dest.write_block(array, block)
+
+
+def _copy_awkward(source, dest, copier, path):
+    copier.submit(("data", path), _copy_awkward_data, source, dest)
+
+
+def _copy_awkward_data(source, dest):
     import awkward
 
     array = source.read()
@@ -69,83 +213,120 @@ def _copy_awkward(source, dest, on_conflict):
     dest.write(container)
 
 
-def _copy_sparse(source, dest, on_conflict):
+def _copy_sparse(source, dest, copier, path):
     num_blocks = (range(len(n)) for n in source.chunks)
     # Loop over each block index --- e.g. (0, 0), (0, 1), (0, 2) ....
     for block in itertools.product(*num_blocks):
-        array = source.read_block(block)
-        dest.write_block(array.coords, array.data, block)
+        copier.submit(("block", path, block), _copy_sparse_block, source, dest, block)
 
 
-def _copy_table(source, dest, on_conflict):
+def _copy_sparse_block(source, dest, block):
+    array = source.read_block(block)
+    dest.write_block(array.coords, array.data, block)
+
+
+def _copy_table(source, dest, copier, path):
     for partition in range(source.structure().npartitions):
-        df = source.read_partition(partition)
-        dest.write_partition(partition, df)
-
-
-def _copy_container(source, dest, on_conflict):
-    for key, child_node in source.items():
-        original_data_sources = child_node.include_data_sources().data_sources()
-        num_data_sources = len(original_data_sources)
-        if num_data_sources == 0:
-            # A container with no data sources is just an organizational
-            # entity in the database.
-            if child_node.structure_family == StructureFamily.container:
-                data_sources = []
-            else:
-                raise ValueError(
-                    f"Unable to copy {child_node} which is a "
-                    f"{child_node.structure_family} but has no data sources."
+        copier.submit(
+            ("partition", path, partition),
+            _copy_table_partition,
+            source,
+            dest,
+            partition,
+        )
+
+
+def _copy_table_partition(source, dest, partition):
+    df = source.read_partition(partition)
+    dest.write_partition(partition, df)
+
+
+def _copy_container(source, dest, copier, path):
+    items = iter(source.items())
+    while batch := list(itertools.islice(items, copier.batch_size)):
+        to_create = []  # (key, child_node, copy_data, kwargs for new)
+        to_copy = []  # (key, child_node, new node)
+        for key, child_node in batch:
+            original_data_sources = child_node.include_data_sources().data_sources()
+            copy_data = _has_data_to_copy(child_node, original_data_sources)
+            if ("node", path + (key,)) in copier.checkpoint:
+                # Created by an earlier, interrupted copy
+                if copy_data:
+                    to_copy.append((key, child_node, dest[key]))
+                continue
+            to_create.append(
+                (
+                    key,
+                    child_node,
+                    copy_data,
+                    dict(
+                        key=key,
+                        structure_family=child_node.structure_family,
+                        data_sources=_data_sources_for_copy(
+                            child_node, original_data_sources
+                        ),
+                        metadata=dict(child_node.metadata),
+                        specs=child_node.specs,
+                    ),
                 )
-        elif num_data_sources == 1:
-            (original_data_source,) = original_data_sources
-            if original_data_source.management == Management.external:
-                data_sources = [original_data_source]
-            else:
-                if child_node.structure_family == StructureFamily.container:
-                    data_sources = []
-                else:
-                    data_sources = [
-                        DataSource(
-                            management=original_data_source.management,
-                            mimetype=original_data_source.mimetype,
-                            structure_family=original_data_source.structure_family,
-                            structure=original_data_source.structure,
-                        )
-                    ]
-        else:
-            # As of this writing this is impossible, but we anticipate that
-            # it may be added someday.
-            raise NotImplementedError(
-                "Multiple Data Sources in one Node is not supported."
             )
-        try:
-            node = dest.new(
-                key=key,
-                structure_family=child_node.structure_family,
-                data_sources=data_sources,
-                metadata=dict(child_node.metadata),
-                specs=child_node.specs,
-            )
-        except ClientError as err:
-            if (
-                on_conflict == "skip" or on_conflict == "warn"
-            ) and err.response.status_code == httpx.codes.CONFLICT:
-                if on_conflict == "warn":
-                    warnings.warn("Skipped existing entry")
+        nodes = copier.create_nodes(dest, [kwargs for *_, kwargs in to_create])
+        for (key, child_node, copy_data, _), node in zip(to_create, nodes):
+            if node is None:
+                # Skipped due to a conflict
                 continue
-            else:
-                raise err
-        if (
+            copier.checkpoint.add(("node", path + (key,)))
+            if copy_data:
+                to_copy.append((key, child_node, node))
+        for key, child_node, node in to_copy:
+            _DISPATCH[child_node.structure_family](
+                child_node, node, copier, path + (key,)
+            )
+
+
+def _data_sources_for_copy(child_node, original_data_sources):
+    "Describe the data sources that a copy of child_node should have."
+    num_data_sources = len(original_data_sources)
+    if num_data_sources == 0:
+        # A container with no data sources is just an organizational
+        # entity in the database.
+        if child_node.structure_family == StructureFamily.container:
+            return []
+        raise ValueError(
+            f"Unable to copy {child_node} which is a "
+            f"{child_node.structure_family} but has no data sources."
+        )
+    elif num_data_sources == 1:
+        (original_data_source,) = original_data_sources
+        if original_data_source.management == Management.external:
+            return [original_data_source]
+        if child_node.structure_family == StructureFamily.container:
+            return []
+        return [
+            DataSource(
+                management=original_data_source.management,
+                mimetype=original_data_source.mimetype,
+                structure_family=original_data_source.structure_family,
+                structure=original_data_source.structure,
+            )
+        ]
+    # As of this writing this is impossible, but we anticipate that
+    # it may be added someday.
+    raise NotImplementedError("Multiple Data Sources in one Node is not supported.")
+
+
+def _has_data_to_copy(child_node, original_data_sources):
+    "Whether data (or children) must be copied, not only the node itself."
+    return bool(
+        (
             original_data_sources
             and (original_data_sources[0].management != Management.external)
-        ) or (
+        )
+        or (
             (child_node.structure_family == StructureFamily.container)
             and (not original_data_sources)
-        ):
-            _DISPATCH[child_node.structure_family](
-                child_node, node, on_conflict=on_conflict
-            )
+        )
+    )
 
 
 _DISPATCH = {
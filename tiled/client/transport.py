@@ -149,75 +149,31 @@ class Transport(httpx.BaseTransport):
         return response
 
 
-# For when we implement an Async client
-#
-# class AsyncCacheControlTransport(httpx.AsyncBaseTransport):
-#     """Async CacheControl transport for httpx_cache.
-#
-#     Args:
-#         transport (optional): an existing httpx async-transport, if no transport
-#             is given, defaults to an httpx.AsyncHTTPTransport with default args.
-#         cache (optional): cache to use with this transport, defaults to
-#             httpx_cache.DictCache
-#         cacheable_methods: methods that are allowed to be cached, defaults to ['GET']
-#         cacheable_status_codes: status codes that are allowed to be cached,
-#             defaults to: (200, 203, 300, 301, 308)
-#     """
-#
-#     def __init__(
-#         self,
-#         *,
-#         transport: tp.Optional[httpx.AsyncBaseTransport] = None,
-#         cache: tp.Optional[BaseCache] = None,
-#         cacheable_methods: tp.Tuple[str, ...] = ("GET",),
-#         cacheable_status_codes: tp.Tuple[int, ...] = (200, 203, 300, 301, 308),
-#         always_cache: bool = False,
-#     ):
-#         self.controller = CacheControl(
-#             cacheable_methods=cacheable_methods,
-#             cacheable_status_codes=cacheable_status_codes,
-#             always_cache=always_cache,
-#         )
-#         self.transport = transport or httpx.AsyncHTTPTransport()
-#         self.cache = cache or DictCache()
-#
-#     async def aclose(self) -> None:
-#         await self.cache.aclose()
-#         await self.transport.aclose()
-#
-#     async def handle_async_request(self, request: httpx.Request) -> TiledResponse:
-#         # check if request is cacheable
-#         if self.controller.is_request_cacheable(request):
-#             logger.debug(f"Checking cache for: %s", request)
-#             cached_response = await self.cache.aget(request)
-#             if cached_response is not None:
-#                 logger.debug(f"Found cached response for: %s", request)
-#                 if self.controller.is_response_fresh(
-#                     request=request, response=cached_response
-#                 ):
-#                     setattr(cached_response, "from_cache", True)
-#                     return cached_response
-#                 else:
-#                     logger.debug(f"Cached response is stale, deleting: %s", request)
-#                     await self.cache.adelete(request)
-#
-#         # Request is not in cache, call original transport
-#         response = await self.transport.handle_async_request(request)
-#
-#         if self.controller.is_response_cacheable(request=request, response=response):
-#             if hasattr(response, "_content"):
-#                 logger.debug(f"Caching response for: %s", request)
-#                 await self.cache.aset(request=request, response=response)
-#             else:
-#                 # Wrap the response with cache callback:
-#                 async def _callback(content: bytes) -> None:
-#                     logger.debug(f"Caching response for: %s", request)
-#                     await self.cache.aset(
-#                         request=request, response=response, content=content
-#                     )
-#
-#                 response.stream = ByteStreamWrapper(
-#                     stream=response.stream, callback=_callback  # type: ignore
-#                 )
-#         setattr(response, "from_cache", False)
-#         return response
+class AsyncTransport(httpx.AsyncBaseTransport):
+    """Custom async transport, for use with an httpx.AsyncClient.
+
+    This applies the same logging and response type as Transport. It does not
+    cache, because the Cache is backed by a synchronous SQLite connection.
+
+    Args:
+        transport (optional): an existing httpx async transport, if no transport
+            is given, defaults to an httpx.AsyncHTTPTransport with default args.
+    """
+
+    def __init__(self, *, transport: tp.Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if __debug__:
+            log_request(request)
+            collect_request(request)
+        response = await self.transport.handle_async_request(request)
+        response.__class__ = TiledResponse
+        response.request = request
+        if __debug__:
+            log_response(response)
+            collect_response(response)
+        return response
@@ -1,4 +1,7 @@
 import builtins
+import collections
+import concurrent.futures
+import itertools
 import os
 import uuid
 from collections import defaultdict
@@ -312,6 +315,15 @@ DEFAULT_TIMEOUT_PARAMS = {
     "pool": 5.0,
 }
 
+# Bound the connections held open to the server. Requests beyond
+# max_connections wait (up to the "pool" timeout) for one to be released.
+# Idle connections are kept open for reuse for keepalive_expiry seconds.
+DEFAULT_LIMITS_PARAMS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 5.0,
+}
+
 
 def params_from_slice(slice):
     "Generate URL query param ?slice=... from Python slice object."
@@ -481,3 +493,29 @@ def slices_to_dask_chunks(slice_dict, shape):
     )
 
     return dask_chunks
+
+
+def prefetch(func, args, depth):
+    """
+    Yield func(arg) for each arg, in order, computing up to depth results ahead.
+
+    The calls run in a pool of depth threads, so that fetching the next results
+    overlaps with the consumption of this one. If the consumer stops early,
+    calls that have not started are cancelled.
+    """
+    args = iter(args)
+    if depth < 1:
+        yield from map(func, args)
+        return
+    executor = concurrent.futures.ThreadPoolExecutor(depth)
+    pending = collections.deque(
+        executor.submit(func, arg) for arg in itertools.islice(args, depth)
+    )
+    try:
+        while pending:
+            future = pending.popleft()
+            for arg in itertools.islice(args, 1):
+                pending.append(executor.submit(func, arg))
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -83,6 +83,22 @@ def register(
         None,
         "--api-key",
     ),
+    concurrency: int = typer.Option(
+        1,
+        "--concurrency",
+        "-j",
+        min=1,
+        help="Number of files and directories to introspect at once.",
+    ),
+    batch_size: int = typer.Option(
+        100,
+        "--batch-size",
+        min=1,
+        help=(
+            "Number of nodes to create per request. "
+            "Use 1 to create each node with its own request."
+        ),
+    ),
 ):
     from ..client.register import default_filter
 
@@ -145,6 +161,8 @@ def register(
                 walkers=walkers,
                 key_from_filename=key_from_filename,
                 filter=filter,
+                concurrency=concurrency,
+                batch_size=batch_size,
             )
         )
     else:
@@ -159,5 +177,7 @@ def register(
                 walkers=walkers,
                 key_from_filename=key_from_filename,
                 filter=filter,
+                concurrency=concurrency,
+                batch_size=batch_size,
             )
         )
@@ -150,6 +150,7 @@ class Authentication(BaseSettings):
     access_token_max_age: Optional[timedelta] = None
     refresh_token_max_age: Optional[timedelta] = None
     session_max_age: Optional[timedelta] = None
+    api_key_cache_ttl: Optional[timedelta] = None
 
     @field_validator("providers", mode="after")
     @classmethod
@@ -233,6 +234,7 @@ class StreamingCacheConfig(BaseSettings):
     seq_ttl: int = 2592000  # 30 days
     socket_timeout: int = 86400  # 1 day
     socket_connect_timeout: int = 10
+    replay_batch_size: int = 500
 
     model_config = SettingsConfigDict(env_prefix="TILED_STREAMING_CACHE_")
     settings_customise_sources = classmethod(settings_customise_sources)
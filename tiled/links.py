@@ -20,6 +20,8 @@ def links_for_array(structure_family, structure, base_url, path_str):
     block_template = ",".join(f"{{{index}}}" for index in range(len(structure.shape)))
     links["block"] = f"{base_url}/array/block/{path_str}?block={block_template}"
     links["full"] = f"{base_url}/array/full/{path_str}"
+    if structure_family == StructureFamily.array:
+        links["blocks"] = f"{base_url}/array/blocks/{path_str}"
     return links
 
 
@@ -236,29 +236,37 @@ for media_type in [
 if modules_available("zstandard"):
     import zstandard
 
-    # These defaults are cribbed from
-    # https://docs.dask.org/en/latest/configuration-reference.html
-    # TODO Make compression settings configurable.
-    # This complex in our case because, as with gzip, we may
-    # want configure differently for different media types.
-    zstd_compressor = zstandard.ZstdCompressor(level=3, threads=0)
-
     class ZstdBuffer:
         """
         Imitate the API provided by gzip.GzipFile and used by tiled.server.compression.
 
         It's not clear to me yet what this buys us, but I think we should follow
         the pattern set by starlette until we have a clear reason not to.
+
+        Each buffer writes one zstd frame, however many times write() is called,
+        so a body streamed in chunks decodes as one stream.
         """
 
         def __init__(self, file):
             self._file = file
+            # These defaults are cribbed from
+            # https://docs.dask.org/en/latest/configuration-reference.html
+            # TODO Make compression settings configurable.
+            # This complex in our case because, as with gzip, we may
+            # want configure differently for different media types.
+            # A compressor is not safe to share between concurrent responses.
+            self._compressor = zstandard.ZstdCompressor(
+                level=3, threads=0
+            ).compressobj()
 
         def write(self, b):
-            self._file.write(zstd_compressor.compress(b))
+            self._file.write(self._compressor.compress(b))
+            # Emit what has been compressed so far, so that each chunk of a
+            # streaming response can be sent as soon as it is compressed.
+            self._file.write(self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
 
         def close(self):
-            pass
+            self._file.write(self._compressor.flush())
 
     for media_type in [
         "application/json",
@@ -307,6 +315,10 @@ if modules_available("lz4"):
         the pattern set by starlette until we have a clear reason not to.
         """
 
+        # Each write() produces a separate block, so a body written in several
+        # chunks could not be decoded as one.
+        streaming = False
+
         def __init__(self, file):
             self._file = file
 
@@ -339,6 +351,10 @@ if modules_available("blosc2"):
         the pattern set by starlette until we have a clear reason not to.
         """
 
+        # Each write() produces a separate frame, so a body written in several
+        # chunks could not be decoded as one.
+        streaming = False
+
         def __init__(self, file):
             self._file = file
 
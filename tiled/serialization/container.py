@@ -1,6 +1,8 @@
-import io
+import itertools
+import tempfile
 
 from ..media_type_registration import default_serialization_registry
+from ..ndslice import NDBlock
 from ..structures.core import StructureFamily
 from ..utils import (
     BrokenLink,
@@ -10,6 +12,9 @@ from ..utils import (
     safe_json_dump,
 )
 
+# Size of the pieces in which an exported file is streamed back
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 async def walk(node, filter_for_access, pre=None):
     """
@@ -48,41 +53,98 @@ if modules_available("h5py"):
         Encode everything below this node as HDF5.
 
         Walk node. Encode all nodes an dataframes as Groups, all arrays and columns as Datasets.
+
+        The file is written to a temporary file on disk, arrays are copied
+        into it block by block, and the finished file is streamed back, so
+        that memory use does not grow with the size of the export.
         """
         import h5py
 
-        buffer = io.BytesIO()
-        root_node = node
-        MSG = "Metadata contains types or structure that does not fit into HDF5."
-        with h5py.File(buffer, mode="w") as file:
+        spool = tempfile.TemporaryFile()
+        try:
+            with h5py.File(spool, mode="w") as file:
+                try:
+                    file.attrs.update(metadata)
+                except TypeError:
+                    raise SerializationError(_HDF5_METADATA_MSG)
+                # Map each path to the (node, group) of the container it names,
+                # so that ancestors are resolved once, not once per leaf.
+                ancestors = {(): (node, file)}
+                async for key_path, array_adapter in walk(node, filter_for_access):
+                    parent, group = ancestors[()]
+                    for depth, key in enumerate(key_path[:-1], start=1):
+                        prefix = tuple(key_path[:depth])
+                        if prefix not in ancestors:
+                            ancestors[prefix] = await _hdf5_group(parent, group, key)
+                        parent, group = ancestors[prefix]
+                    dataset = await _write_hdf5_dataset(
+                        group, key_path[-1], array_adapter
+                    )
+                    for k, v in array_adapter.metadata().items():
+                        dataset.attrs.create(k, v)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return _stream_file(spool)
+
+    async def _hdf5_group(node, group, key):
+        "Resolve the child node at key and the HDF5 group to write it into."
+        if hasattr(node, "lookup_adapter"):
             try:
-                file.attrs.update(metadata)
-            except TypeError:
-                raise SerializationError(MSG)
-            async for key_path, array_adapter in walk(node, filter_for_access):
-                group = file
-                node = root_node
-                for key in key_path[:-1]:
-                    if hasattr(node, "lookup_adapter"):
-                        try:
-                            node = await node.lookup_adapter([key])
-                        except BrokenLink:
-                            continue
-                    else:
-                        node = node[key]
-                    if key in group:
-                        group = group[key]
-                    else:
-                        group = group.create_group(key)
-                        try:
-                            group.attrs.update(node.metadata())
-                        except TypeError:
-                            raise SerializationError(MSG)
-                data = await ensure_awaitable(array_adapter.read)
-                dataset = group.create_dataset(key_path[-1], data=data)
-                for k, v in array_adapter.metadata().items():
-                    dataset.attrs.create(k, v)
-        return buffer.getbuffer()
+                child = await node.lookup_adapter([key])
+            except BrokenLink:
+                return node, group
+        else:
+            child = node[key]
+        if key in group:
+            return child, group[key]
+        child_group = group.create_group(key)
+        try:
+            child_group.attrs.update(child.metadata())
+        except TypeError:
+            raise SerializationError(_HDF5_METADATA_MSG)
+        return child, child_group
+
+    async def _write_hdf5_dataset(group, key, array_adapter):
+        """
+        Create a Dataset from an array, copying it block by block.
+
+        Tables, and arrays that cannot be read by block, are read whole.
+        """
+        if (array_adapter.structure_family != StructureFamily.array) or (
+            not hasattr(array_adapter, "read_block")
+        ):
+            data = await ensure_awaitable(array_adapter.read)
+            return group.create_dataset(key, data=data)
+        structure = array_adapter.structure()
+        dtype = structure.data_type.to_numpy_dtype()
+        if (not structure.shape) or (dtype.kind in "OU") or (0 in structure.shape):
+            # Scalars, empty arrays, and strings (which HDF5 stores
+            # differently than numpy) are small or special: let h5py infer
+            # the Dataset from the data.
+            data = await ensure_awaitable(array_adapter.read)
+            return group.create_dataset(key, data=data)
+        dataset = group.create_dataset(key, shape=structure.shape, dtype=dtype)
+        num_blocks = (range(len(n)) for n in structure.chunks)
+        for block in itertools.product(*num_blocks):
+            block = NDBlock(*block)
+            data = await ensure_awaitable(array_adapter.read_block, block)
+            slice_ = block.slice_from_chunks(structure.chunks)
+            await ensure_awaitable(dataset.__setitem__, tuple(slice_), data)
+        return dataset
+
+    def _stream_file(file):
+        "Yield the contents of file in chunks, and close it when done."
+        try:
+            while chunk := file.read(STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            file.close()
+
+    _HDF5_METADATA_MSG = (
+        "Metadata contains types or structure that does not fit into HDF5."
+    )
 
     default_serialization_registry.register(
         StructureFamily.container, "application/x-hdf5", serialize_hdf5
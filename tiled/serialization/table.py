@@ -47,19 +47,71 @@ def deserialize_arrow(buffer):
 def serialize_parquet(mimetype, df, metadata, preserve_index=True):
     import pyarrow.parquet
 
-    table = pyarrow.Table.from_pandas(df, preserve_index=preserve_index)
+    if isinstance(df, pyarrow.Table):
+        table = df
+    else:
+        table = pyarrow.Table.from_pandas(df, preserve_index=preserve_index)
     sink = pyarrow.BufferOutputStream()
     with pyarrow.parquet.ParquetWriter(sink, table.schema) as writer:
         writer.write_table(table)
     return memoryview(sink.getvalue())
 
 
+# Number of rows encoded at a time by the streaming text formats below
+ROWS_PER_BATCH = 10_000
+
+
+def row_batches(df):
+    """
+    Yield a pandas.DataFrame or pyarrow.Table in pieces of ROWS_PER_BATCH rows.
+
+    A pyarrow.Table is split into pyarrow.RecordBatch, without copying. A
+    pandas.DataFrame is sliced into smaller DataFrames.
+    """
+    if hasattr(df, "to_batches"):
+        yield from df.to_batches(max_chunksize=ROWS_PER_BATCH)
+    else:
+        for start in range(0, len(df), ROWS_PER_BATCH):
+            yield df.iloc[start : start + ROWS_PER_BATCH]  # noqa: E203
+
+
+def drop_pandas_index(table):
+    """
+    Drop the columns of a pyarrow.Table that hold a pandas index.
+
+    A table that was written from pandas may store its index as columns,
+    which would not be emitted as data if the table were read into pandas.
+    """
+    index_columns = {
+        column
+        for column in (table.schema.pandas_metadata or {}).get("index_columns", [])
+        if isinstance(column, str)
+    }
+    if not index_columns:
+        return table
+    return table.select(
+        [name for name in table.column_names if name not in index_columns]
+    )
+
+
 def serialize_csv(mimetype, df, metadata, preserve_index=False):
-    file = io.StringIO()
+    "Stream CSV, encoding ROWS_PER_BATCH rows at a time."
     opt_params = parse_mimetype(mimetype)[1]
     include_header = opt_params.get("header", "present") != "absent"
-    df.to_csv(file, header=include_header, index=preserve_index)
-    return file.getvalue().encode()
+    if len(df) == 0:
+        # Emit the header alone, if any.
+        batches = [df]
+    else:
+        batches = row_batches(df)
+    for batch in batches:
+        if hasattr(batch, "to_pandas"):
+            # Convert integer columns with nulls to Python objects, not floats,
+            # so that each batch is written the same way whether it has nulls
+            # or not.
+            batch = batch.to_pandas(integer_object_nulls=True)
+        yield batch.to_csv(header=include_header, index=preserve_index).encode()
+        # Only the first batch has a header.
+        include_header = False
 
 
 @default_deserialization_registry.register(StructureFamily.table, "text/csv")
@@ -109,13 +161,37 @@ if modules_available("openpyxl", "pandas"):
 if modules_available("orjson"):
     import orjson
 
-    default_serialization_registry.register(
-        StructureFamily.table,
-        "application/json",
-        lambda mimetype, df, metadata: orjson.dumps(
-            {column: df[column].tolist() for column in df},
-        ),
-    )
+    @default_serialization_registry.register(StructureFamily.table, "application/json")
+    def serialize_json(mimetype, df, metadata):
+        """
+        Stream a JSON object mapping each column name to a list of its values.
+
+        The lists are encoded ROWS_PER_BATCH values at a time.
+        """
+        if hasattr(df, "to_batches"):
+            df = drop_pandas_index(df)
+            columns = df.column_names
+        else:
+            columns = df.columns
+        # Hold back the punctuation to send it with the first values, so that
+        # the first chunk includes encoded data.
+        pending = b"{"
+        for i, column in enumerate(columns):
+            pending += (b"," if i else b"") + orjson.dumps(str(column)) + b":["
+            first = True
+            for batch in row_batches(df):
+                if hasattr(batch, "iloc"):
+                    values = batch[column].tolist()
+                else:
+                    values = batch.column(column).to_pylist()
+                if values:
+                    # Strip the brackets to splice the pieces into one list.
+                    values = orjson.dumps(values)[1:-1]
+                    yield pending + (b"" if first else b",") + values
+                    pending = b""
+                    first = False
+            pending += b"]"
+        yield pending + b"}"
 
     # Newline-delimited JSON. For example, this DataFrame:
     #
@@ -131,13 +207,21 @@ if modules_available("orjson"):
         "application/json-seq",  # official mimetype for newline-delimited JSON
     )
     def json_sequence(mimetype, df, metadata):
-        if rows := df.to_dict(orient="records"):
-            # The first row is a special case; the rest start with a newline.
-            yield orjson.dumps(rows[0])
-            # Emit the remaining rows, prepending newline.
-            for row in rows[1:]:
-                yield b"\n" + orjson.dumps(row)
-        else:
+        "Stream newline-delimited JSON, encoding ROWS_PER_BATCH rows at a time."
+        if hasattr(df, "to_batches"):
+            df = drop_pandas_index(df)
+        first = True
+        for batch in row_batches(df):
+            if hasattr(batch, "iloc"):
+                rows = batch.to_dict(orient="records")
+            else:
+                rows = batch.to_pylist()
+            if rows:
+                # Every row but the very first one starts with a newline.
+                lines = b"\n".join(map(orjson.dumps, rows))
+                yield lines if first else b"\n" + lines
+                first = False
+        if first:
             # No rows
             yield b""
 
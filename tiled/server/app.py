@@ -433,6 +433,7 @@ def build_app(
         # Delay this imports to avoid delaying startup with the SQL and cryptography
         # imports if they are not needed.
         from .authentication import (
+            APIKeyCache,
             add_external_routes,
             add_internal_routes,
             authentication_router,
@@ -464,6 +465,8 @@ def build_app(
         # And add this authentication_router itself to the app.
         app.include_router(authentication_router, prefix="/api/v1/auth")
         app.state.authenticated = True
+        # Verified API keys are shared between requests for a short time.
+        app.state.api_key_cache = APIKeyCache()
     else:
         app.state.authenticated = False
 
@@ -481,6 +484,7 @@ def build_app(
             "access_token_max_age",
             "refresh_token_max_age",
             "session_max_age",
+            "api_key_cache_ttl",
         ]:
             if (value := getattr(authentication, item)) is not None:
                 setattr(settings, item, value)
@@ -731,6 +735,14 @@ def build_app(
         for task in tasks["shutdown"]:
             await task()
 
+        if hasattr(app.state.access_policy, "close"):
+            # Release any connections held by the access policy.
+            await app.state.access_policy.close()
+        if app.state.access_policy is not None and hasattr(
+            app.state.access_policy, "access_tags_parser"
+        ):
+            await app.state.access_policy.access_tags_parser.close()
+
         settings: Settings = app.dependency_overrides[get_settings]()
         if settings.database_settings.uri is not None:
             from .connection_pool import close_database_connection_pool
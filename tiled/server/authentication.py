@@ -1,11 +1,14 @@
 import hashlib
 import secrets
+import time
 import uuid as uuid_module
 import warnings
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Annotated, Any, Callable, List, Optional, Sequence
 
+import cachetools
 from fastapi import (
     APIRouter,
     Depends,
@@ -31,8 +34,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, update
 from starlette.datastructures import URL
+from starlette.requests import HTTPConnection
 from starlette.status import (
     HTTP_204_NO_CONTENT,
     HTTP_400_BAD_REQUEST,
@@ -85,6 +89,12 @@ SESSION_LIMIT = 200
 DEVICE_CODE_MAX_AGE = timedelta(minutes=15)
 DEVICE_CODE_POLLING_INTERVAL = 5  # seconds
 
+# Max number of verified API keys held in memory by APIKeyCache.
+API_KEY_CACHE_MAX_SIZE = 10_000
+# APIKey.latest_activity has second resolution, so there is no point in
+# writing it more often than this.
+API_KEY_ACTIVITY_RESOLUTION = 1  # seconds
+
 
 def utcnow():
     "UTC now with second resolution"
@@ -100,6 +110,86 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 
+@dataclass
+class VerifiedAPIKey:
+    "The outcome of validating an API key against the authentication database"
+
+    first_eight: str
+    hashed_secret: bytes
+    expiration_time: Optional[datetime]
+    # This is a (detached) orm.Principal, with roles and identities loaded.
+    principal: Any
+    scopes: frozenset[str]
+    access_tags: Optional[frozenset[str]]
+    verified_at: float
+    activity_recorded_at: float
+
+    @classmethod
+    def from_orm(cls, api_key_orm: orm.APIKey) -> "VerifiedAPIKey":
+        principal = api_key_orm.principal
+        principal_scopes = set().union(*[role.scopes for role in principal.roles])
+        # This intersection addresses the case where the Principal has
+        # lost a scope that they had when this key was created.
+        scopes = set(api_key_orm.scopes).intersection(principal_scopes | {"inherit"})
+        if "inherit" in scopes:
+            # The scope "inherit" is a metascope that confers all the
+            # scopes for the Principal associated with this API,
+            # resolved at access time.
+            scopes.update(principal_scopes)
+        if (access_tags := api_key_orm.access_tags) is not None:
+            access_tags = frozenset(access_tags)
+        now = time.monotonic()
+        return cls(
+            first_eight=api_key_orm.first_eight,
+            hashed_secret=api_key_orm.hashed_secret,
+            expiration_time=api_key_orm.expiration_time,
+            principal=principal,
+            scopes=frozenset(scopes),
+            access_tags=access_tags,
+            verified_at=now,
+            activity_recorded_at=now,
+        )
+
+    def is_expired(self) -> bool:
+        return (self.expiration_time is not None) and (
+            self.expiration_time.replace(tzinfo=timezone.utc)
+            < datetime.now(timezone.utc)
+        )
+
+
+class APIKeyCache:
+    """
+    Hold verified API keys in memory, keyed on the hashed secret.
+
+    An entry is served for at most `ttl` seconds after it was verified against
+    the database, and never after the API key's own expiration time. Revoking
+    an API key through this server invalidates its entry immediately; changes
+    made by other server processes are picked up once the TTL elapses.
+    """
+
+    def __init__(self, maxsize: int = API_KEY_CACHE_MAX_SIZE):
+        self._cache = cachetools.LRUCache(maxsize)
+
+    def get(self, hashed_secret: bytes, ttl: float) -> Optional[VerifiedAPIKey]:
+        verified = self._cache.get(hashed_secret)
+        if verified is None:
+            return None
+        if (time.monotonic() - verified.verified_at > ttl) or verified.is_expired():
+            self._cache.pop(hashed_secret, None)
+            return None
+        return verified
+
+    def set(self, verified: VerifiedAPIKey, ttl: float) -> None:
+        if ttl > 0:
+            self._cache[verified.hashed_secret] = verified
+
+    def invalidate(self, hashed_secret: bytes) -> None:
+        self._cache.pop(hashed_secret, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
 class StrictAPIKeyHeader(APIKeyHeader):
     # TODO: remove custom subclass https://github.com/bluesky/tiled/issues/921
     """
@@ -201,6 +291,62 @@ async def get_api_key(
     return None
 
 
+async def verify_api_key(
+    connection: HTTPConnection,
+    api_key: str,
+    settings: Settings,
+    db_factory: Callable[[], Optional[AsyncSession]],
+) -> Optional[VerifiedAPIKey]:
+    """
+    Resolve an API key to its Principal, scopes, and access tags.
+
+    This is only applicable in a multi-user configuration. The result is
+    memoized on the connection, so the Principal, scopes, and access tags
+    dependencies share one verification per request, and it is shared
+    between requests via the app's APIKeyCache for up to
+    settings.api_key_cache_ttl. Return None if the key is not valid.
+    """
+    memo = getattr(connection.state, "verified_api_key", None)
+    if (memo is not None) and (memo[0] == api_key):
+        return memo[1]
+    # We store the hashed value of the API key secret.
+    # By comparing hashes we protect against timing attacks.
+    # By storing only the hash of the (high-entropy) secret
+    # we reduce the value of that an attacker can extracted from a
+    # stolen database backup.
+    try:
+        secret = bytes.fromhex(api_key)
+    except Exception:
+        # Not valid hex, therefore not a valid API key
+        return None
+    cache = connection.app.state.api_key_cache
+    ttl = settings.api_key_cache_ttl.total_seconds()
+    verified = cache.get(hashlib.sha256(secret).digest(), ttl)
+    if verified is None:
+        async with db_factory() as db:
+            api_key_orm = await lookup_valid_api_key(db, secret)
+            if api_key_orm is not None:
+                verified = VerifiedAPIKey.from_orm(api_key_orm)
+                api_key_orm.latest_activity = utcnow()
+                await db.commit()
+                cache.set(verified, ttl)
+    elif (
+        time.monotonic() - verified.activity_recorded_at >= API_KEY_ACTIVITY_RESOLUTION
+    ):
+        # Keep latest_activity current without re-loading the key.
+        verified.activity_recorded_at = time.monotonic()
+        async with db_factory() as db:
+            await db.execute(
+                update(orm.APIKey)
+                .where(orm.APIKey.first_eight == verified.first_eight)
+                .where(orm.APIKey.hashed_secret == verified.hashed_secret)
+                .values(latest_activity=utcnow())
+            )
+            await db.commit()
+    connection.state.verified_api_key = (api_key, verified)
+    return verified
+
+
 def headers_for_401(request: Request, security_scopes: SecurityScopes):
     # call directly from methods, rather than as a dependency, to avoid calling
     # when not needed.
@@ -242,41 +388,35 @@ async def get_session_state(decoded_access_token=Depends(get_decoded_access_toke
 
 
 async def get_access_tags_from_api_key(
-    api_key: str, authenticated: bool, db: Optional[AsyncSession]
+    connection: HTTPConnection,
+    api_key: str,
+    settings: Settings,
+    db_factory: Callable[[], Optional[AsyncSession]],
 ) -> Optional[AccessTags]:
-    if not authenticated:
+    if not connection.app.state.authenticated:
         # Tiled is in a "single user" mode with only one API key.
         # In this mode, there is no meaningful access tag limit.
         return None
     # Tiled is in a multi-user configuration with authentication providers.
-    # We store the hashed value of the API key secret.
-    try:
-        secret = bytes.fromhex(api_key)
-    except Exception:
+    verified = await verify_api_key(connection, api_key, settings, db_factory)
+    if (verified is None) or (verified.access_tags is None):
         # access tag limit cannot be enforced without key information
         return None
-    api_key_orm = await lookup_valid_api_key(db, secret)
-    if api_key_orm is None:
-        # access tag limit cannot be enforced without key information
-        return None
-    else:
-        if (access_tags := api_key_orm.access_tags) is not None:
-            access_tags = set(access_tags)
-        return access_tags
+    return set(verified.access_tags)
 
 
 async def get_current_access_tags(
     request: Request,
     api_key: Optional[str] = Depends(get_api_key),
+    settings: Settings = Depends(get_settings),
     db_factory: Callable[[], Optional[AsyncSession]] = Depends(
         get_database_session_factory
     ),
 ) -> Optional[AccessTags]:
     if api_key is not None:
-        async with db_factory() as db:
-            return await get_access_tags_from_api_key(
-                api_key, request.app.state.authenticated, db
-            )
+        return await get_access_tags_from_api_key(
+            request, api_key, settings, db_factory
+        )
     else:
         # Limits on access tags only available via API key auth
         return None
@@ -316,15 +456,15 @@ def get_decoded_access_token_websocket(
 async def get_current_access_tags_websocket(
     websocket: WebSocket,
     api_key: Optional[str] = Depends(get_api_key_websocket),
+    settings: Settings = Depends(get_settings),
     db_factory: Callable[[], Optional[AsyncSession]] = Depends(
         get_database_session_factory
     ),
 ) -> Optional[AccessTags]:
     if api_key is not None:
-        async with db_factory() as db:
-            return await get_access_tags_from_api_key(
-                api_key, websocket.app.state.authenticated, db
-            )
+        return await get_access_tags_from_api_key(
+            websocket, api_key, settings, db_factory
+        )
     else:
         # Limits on access tags only available via API key auth
         return None
@@ -347,9 +487,12 @@ async def move_api_key(request: Request, api_key: Optional[str] = Depends(get_ap
 
 
 async def get_scopes_from_api_key(
-    api_key: str, settings: Settings, authenticated: bool, db: Optional[AsyncSession]
+    connection: HTTPConnection,
+    api_key: str,
+    settings: Settings,
+    db_factory: Callable[[], Optional[AsyncSession]],
 ) -> Sequence[str]:
-    if not authenticated:
+    if not connection.app.state.authenticated:
         # Tiled is in a "single user" mode with only one API key.
         return (
             SINGLE_USER_SCOPES
@@ -357,30 +500,10 @@ async def get_scopes_from_api_key(
             else set()
         )
     # Tiled is in a multi-user configuration with authentication providers.
-    # We store the hashed value of the API key secret.
-    # By comparing hashes we protect against timing attacks.
-    # By storing only the hash of the (high-entropy) secret
-    # we reduce the value of that an attacker can extracted from a
-    # stolen database backup.
-    try:
-        secret = bytes.fromhex(api_key)
-    except Exception:
+    verified = await verify_api_key(connection, api_key, settings, db_factory)
+    if verified is None:
         return NO_SCOPES
-    api_key_orm = await lookup_valid_api_key(db, secret)
-    if api_key_orm is None:
-        return NO_SCOPES
-    else:
-        principal = api_key_orm.principal
-        principal_scopes = set().union(*[role.scopes for role in principal.roles])
-        # This intersection addresses the case where the Principal has
-        # lost a scope that they had when this key was created.
-        scopes = set(api_key_orm.scopes).intersection(principal_scopes | {"inherit"})
-        if "inherit" in scopes:
-            # The scope "inherit" is a metascope that confers all the
-            # scopes for the Principal associated with this API,
-            # resolved at access time.
-            scopes.update(principal_scopes)
-        return scopes
+    return set(verified.scopes)
 
 
 async def get_current_scopes(
@@ -393,10 +516,7 @@ async def get_current_scopes(
     ),
 ) -> set[str]:
     if api_key is not None:
-        async with db_factory() as db:
-            return await get_scopes_from_api_key(
-                api_key, settings, request.app.state.authenticated, db
-            )
+        return await get_scopes_from_api_key(request, api_key, settings, db_factory)
     elif decoded_access_token is not None:
         if isinstance(settings.authenticator, ProxiedOIDCAuthenticator):
             return set(decoded_access_token["scope"].split(" "))
@@ -416,10 +536,7 @@ async def get_current_scopes_websocket(
     ),
 ) -> set[str]:
     if api_key is not None:
-        async with db_factory() as db:
-            return await get_scopes_from_api_key(
-                api_key, settings, websocket.app.state.authenticated, db
-            )
+        return await get_scopes_from_api_key(websocket, api_key, settings, db_factory)
     elif decoded_access_token is not None:
         if isinstance(settings.authenticator, ProxiedOIDCAuthenticator):
             return set(decoded_access_token["scope"].split(" "))
@@ -450,23 +567,18 @@ async def authenticate_websocket_first_message(
 
     if api_key is not None:
         try:
-            async with db_factory() as db:
-                principal = await get_current_principal_from_api_key(
-                    api_key, websocket.app.state.authenticated, db, settings
-                )
+            principal = await get_current_principal_from_api_key(
+                websocket, api_key, settings, db_factory
+            )
         except HTTPException:
             return False, None, None, NO_SCOPES
         if (principal is None) and websocket.app.state.authenticated:
             # In multi-user mode, None principal means key not found.
             return False, None, None, NO_SCOPES
-        async with db_factory() as db:
-            access_tags = await get_access_tags_from_api_key(
-                api_key, websocket.app.state.authenticated, db
-            )
-        async with db_factory() as db:
-            scopes = await get_scopes_from_api_key(
-                api_key, settings, websocket.app.state.authenticated, db
-            )
+        access_tags = await get_access_tags_from_api_key(
+            websocket, api_key, settings, db_factory
+        )
+        scopes = await get_scopes_from_api_key(websocket, api_key, settings, db_factory)
         return True, principal, access_tags, scopes
     elif access_token is not None:
         try:
@@ -529,38 +641,16 @@ async def check_scopes(
 
 
 async def get_current_principal_from_api_key(
-    api_key: str, authenticated: bool, db: AsyncSession, settings: Settings
+    connection: HTTPConnection,
+    api_key: str,
+    settings: Settings,
+    db_factory: Callable[[], Optional[AsyncSession]],
 ):
-    if authenticated:
+    if connection.app.state.authenticated:
         # Tiled is in a multi-user configuration with authentication providers.
-        # We store the hashed value of the API key secret.
-        # By comparing hashes we protect against timing attacks.
-        # By storing only the hash of the (high-entropy) secret
-        # we reduce the value of that an attacker can extracted from a
-        # stolen database backup.
-        try:
-            secret = bytes.fromhex(api_key)
-        except Exception:
-            # Not valid hex, therefore not a valid API key
-            return None
-
-        api_key_orm = await lookup_valid_api_key(db, secret)
-        if api_key_orm is not None:
-            principal = api_key_orm.principal
-            principal_scopes = set().union(*[role.scopes for role in principal.roles])
-            # This intersection addresses the case where the Principal has
-            # lost a scope that they had when this key was created.
-            scopes = set(api_key_orm.scopes).intersection(
-                principal_scopes | {"inherit"}
-            )
-            if "inherit" in scopes:
-                # The scope "inherit" is a metascope that confers all the
-                # scopes for the Principal associated with this API,
-                # resolved at access time.
-                scopes.update(principal_scopes)
-            api_key_orm.latest_activity = utcnow()
-            await db.commit()
-            return principal
+        verified = await verify_api_key(connection, api_key, settings, db_factory)
+        if verified is not None:
+            return verified.principal
         else:
             return None
     else:
@@ -585,10 +675,9 @@ async def get_current_principal_websocket(
     ),
 ):
     if api_key is not None:
-        async with db_factory() as db:
-            principal = await get_current_principal_from_api_key(
-                api_key, websocket.app.state.authenticated, db, settings
-            )
+        principal = await get_current_principal_from_api_key(
+            websocket, api_key, settings, db_factory
+        )
         if (principal is None) and websocket.app.state.authenticated:
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED, detail="Invalid API key"
@@ -644,13 +733,9 @@ async def get_current_principal(
     logging with a SingleUserPrincipal sentinel
     """
     if api_key is not None:
-        async with db_factory() as db:
-            principal = await get_current_principal_from_api_key(
-                api_key,
-                request.app.state.authenticated,
-                db,
-                settings,
-            )
+        principal = await get_current_principal_from_api_key(
+            request, api_key, settings, db_factory
+        )
         if principal is None and request.app.state.authenticated:
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
@@ -1320,6 +1405,7 @@ def authentication_router() -> APIRouter:
                 )
             await db.delete(api_key_orm)
             await db.commit()
+        request.app.state.api_key_cache.invalidate(api_key_orm.hashed_secret)
 
         return Response(status_code=HTTP_204_NO_CONTENT)
 
@@ -1579,6 +1665,7 @@ def authentication_router() -> APIRouter:
                 )
             await db.delete(api_key_orm)
             await db.commit()
+        request.app.state.api_key_cache.invalidate(api_key_orm.hashed_secret)
         return Response(status_code=HTTP_204_NO_CONTENT)
 
     @router.get(
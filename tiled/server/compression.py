@@ -1,17 +1,50 @@
 import io
+import os
 import time
 
+import anyio
 from starlette.datastructures import Headers, MutableHeaders
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Bodies (or chunks of streaming bodies) at least this large are compressed
+# in a worker thread so that they do not block the event loop.
+DEFAULT_OFFLOAD_SIZE = 64 * 1024  # bytes
+
+# Leading bytes of formats that are already compressed, which gain nothing
+# from being compressed again.
+COMPRESSED_SIGNATURES = (
+    b"\x1f\x8b",  # gzip
+    b"\x28\xb5\x2f\xfd",  # zstd
+    b"\x04\x22\x4d\x18",  # lz4 frame
+    b"BZh",  # bzip2
+    b"\xfd7zXZ\x00",  # xz
+    b"PK\x03\x04",  # zip, including xlsx
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"\xff\xd8\xff",  # JPEG
+)
+
+
+def is_compressed(body) -> bool:
+    "Guess, from its leading bytes, whether a body is already compressed."
+    return bytes(body[:8]).startswith(COMPRESSED_SIGNATURES)
+
 
 class CompressionMiddleware:
     def __init__(
-        self, app: ASGIApp, compression_registry, minimum_size: int = 500
+        self,
+        app: ASGIApp,
+        compression_registry,
+        minimum_size: int = 500,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        max_workers: int = None,
     ) -> None:
         self.app = app
         self.compression_registry = compression_registry
         self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        # This must be created in the event loop, so it is created lazily.
+        self._limiter = None
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] == "http":
@@ -21,8 +54,15 @@ class CompressionMiddleware:
                 for item in headers.get("accept-encoding", "").split(",")
                 if item
             }
+            if self._limiter is None:
+                self._limiter = anyio.CapacityLimiter(self.max_workers)
             responder = CompressionResponder(
-                self.app, self.minimum_size, accepted, self.compression_registry
+                self.app,
+                self.minimum_size,
+                accepted,
+                self.compression_registry,
+                offload_size=self.offload_size,
+                limiter=self._limiter,
             )
             await responder(scope, receive, send)
             return
@@ -31,12 +71,20 @@ class CompressionMiddleware:
 
 class CompressionResponder:
     def __init__(
-        self, app: ASGIApp, minimum_size: int, accepted: set, compression_registry
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        accepted: set,
+        compression_registry,
+        offload_size: int = DEFAULT_OFFLOAD_SIZE,
+        limiter: anyio.CapacityLimiter = None,
     ) -> None:
         self.app = app
         self.minimum_size = minimum_size
         self.accepted = accepted
         self.compression_registry = compression_registry
+        self.offload_size = offload_size
+        self.limiter = limiter
         self.send: Send = unattached_send
         self.scope: Scope = None
         self.initial_message: Message = {}
@@ -47,6 +95,56 @@ class CompressionResponder:
         self.scope = scope
         await self.app(scope, receive, self.send_compressed)
 
+    def select_encoding(self, streaming: bool) -> None:
+        "Use the first accepted encoding, skipping any that cannot stream if need be."
+        self.encoding = None
+        self.compressed_file = None
+        for encoding in self.encodings:
+            file_factory = self.compression_registry.dispatch(
+                media_type=self.media_type, encoding=encoding
+            )
+            compressed_buffer = io.BytesIO()
+            compressed_file = file_factory(compressed_buffer)
+            if streaming and not getattr(compressed_file, "streaming", True):
+                continue
+            self.compressed_buffer = compressed_buffer
+            self.compressed_file = compressed_file
+            self.encoding = encoding
+            return
+
+    def _compress(self, body, close: bool) -> bytes:
+        "Compress a body or one chunk of it, returning the output so far."
+        self.compressed_file.write(body)
+        if close:
+            self.compressed_file.close()
+        compressed = self.compressed_buffer.getvalue()
+        self.compressed_buffer.seek(0)
+        self.compressed_buffer.truncate()
+        return compressed
+
+    async def compress(self, body, close: bool = False):
+        """
+        Compress a body or one chunk of it, in a worker thread if it is large.
+
+        Return the compressed bytes, the time spent compressing, and the time
+        spent waiting for a worker thread.
+        """
+        submitted = time.perf_counter()
+        if len(body) < self.offload_size:
+            compressed = self._compress(body, close)
+            return compressed, time.perf_counter() - submitted, 0
+
+        def target():
+            started = time.perf_counter()
+            compressed = self._compress(body, close)
+            return compressed, time.perf_counter() - started, started - submitted
+
+        return await anyio.to_thread.run_sync(target, limiter=self.limiter)
+
+    def record_queue_time(self, queue_time):
+        if queue_time:
+            self.scope["state"]["metrics"]["compress_queue"]["dur"] += queue_time
+
     async def send_compressed(self, message: Message) -> None:
         message_type = message["type"]
         if message_type == "http.response.start":
@@ -56,22 +154,25 @@ class CompressionResponder:
             headers = MutableHeaders(raw=self.initial_message["headers"])
             # Strip off any MIME arguments, as in 'text/plain; charset=utf-8'.
             media_type, *_ = headers.get("Content-Type", "").split(";", 1)
-            for encoding in self.compression_registry.encodings(media_type):
-                if encoding in self.accepted:
-                    file_factory = self.compression_registry.dispatch(
-                        media_type=media_type, encoding=encoding
-                    )
-                    self.compressed_buffer = io.BytesIO()
-                    self.compressed_file = file_factory(self.compressed_buffer)
-                    self.encoding = encoding
-                    break
+            if "Content-Encoding" in headers:
+                # The route has already encoded this body (e.g. with chunks
+                # passed through from storage as they are).
+                encodings = []
             else:
-                self.encoding = None
+                encodings = self.compression_registry.encodings(media_type)
+            self.media_type = media_type
+            self.encodings = [
+                encoding for encoding in encodings if encoding in self.accepted
+            ]
+            self.select_encoding(streaming=False)
         elif message_type == "http.response.body" and not self.started:
             headers = MutableHeaders(raw=self.initial_message["headers"])
             self.started = True
             body = message.get("body", b"")
             more_body = message.get("more_body", False)
+            if self.encoding is not None and is_compressed(body):
+                # Don't spend time compressing incompressible data.
+                self.encoding = None
             if len(body) < self.minimum_size and not more_body:
                 # Don't apply compression to small outgoing responses.
                 await self.send(self.initial_message)
@@ -79,11 +180,10 @@ class CompressionResponder:
             elif not more_body:
                 if self.encoding is not None:
                     # Standard (non-streaming) response.
-                    t0 = time.perf_counter()
-                    self.compressed_file.write(body)
-                    self.compressed_file.close()
-                    compression_time = time.perf_counter() - t0
-                    compressed_body = self.compressed_buffer.getvalue()
+                    compressed_body, compression_time, queue_time = await self.compress(
+                        body, close=True
+                    )
+                    self.record_queue_time(queue_time)
                     # Check to see if the compression ratio is significant.
                     # If it isn't just send the original; the savings isn't worth the decompression time.
                     compression_ratio = len(body) / len(
@@ -106,17 +206,20 @@ class CompressionResponder:
                 await self.send(self.initial_message)
                 await self.send(message)
             else:
-                # Initial body in streaming response.
+                # Initial body in streaming response. Some encodings compress
+                # each write separately, which cannot be decoded as one body.
+                if self.encoding is not None and not getattr(
+                    self.compressed_file, "streaming", True
+                ):
+                    self.select_encoding(streaming=True)
                 if self.encoding is not None:
                     headers = MutableHeaders(raw=self.initial_message["headers"])
                     headers["Content-Encoding"] = self.encoding
                     headers.add_vary_header("Accept-Encoding")
                     del headers["Content-Length"]
 
-                    self.compressed_file.write(body)
-                    message["body"] = self.compressed_buffer.getvalue()
-                    self.compressed_buffer.seek(0)
-                    self.compressed_buffer.truncate()
+                    message["body"], _, queue_time = await self.compress(body)
+                    self.record_queue_time(queue_time)
 
                 await self.send(self.initial_message)
                 await self.send(message)
@@ -127,13 +230,9 @@ class CompressionResponder:
                 body = message.get("body", b"")
                 more_body = message.get("more_body", False)
 
-                self.compressed_file.write(body)
-                if not more_body:
-                    self.compressed_file.close()
-
-                message["body"] = self.compressed_buffer.getvalue()
-                self.compressed_buffer.seek(0)
-                self.compressed_buffer.truncate()
+                # The headers have been sent, so the queue time of this
+                # chunk can no longer be reported.
+                message["body"], _, _ = await self.compress(body, close=not more_body)
 
             await self.send(message)
 
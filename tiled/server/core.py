@@ -1,16 +1,20 @@
+import builtins
 import collections.abc
 import dataclasses
 import inspect
 import itertools
 import math
 import operator
+import os
 import re
+import struct
 import sys
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from hashlib import md5
 from typing import Any, Optional
+from urllib.parse import urlparse
 
 import anyio
 import dateutil.tz
@@ -24,6 +28,7 @@ from starlette.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_400_BAD_RE
 from .. import queries
 from ..adapters.mapping import MapAdapter
 from ..links import links_for_node
+from ..ndslice import NDSlice
 from ..queries import KeyLookup, QueryValueError
 from ..serialization import register_builtin_serializers
 from ..structures.core import Spec, StructureFamily
@@ -34,6 +39,7 @@ from ..utils import (
     UnsupportedShape,
     ensure_awaitable,
     parse_mimetype,
+    path_from_uri,
     safe_json_dump,
 )
 from . import schemas
@@ -152,6 +158,26 @@ def pagination_links(base_url, route, path_parts, offset, limit, length_hint):
     return links
 
 
+def cursor_pagination_links(base_url, route, path_parts, cursor, next_cursor, limit):
+    path_str = "/".join(path_parts)
+    links = {}
+    if cursor is not None:
+        links.update(
+            {
+                "self": f"{base_url}{route}/{path_str}?page[cursor]={cursor}&page[limit]={limit}",
+                # Keyset pagination only runs forward.
+                "prev": None,
+            }
+        )
+    if next_cursor is not None:
+        links[
+            "next"
+        ] = f"{base_url}{route}/{path_str}?page[cursor]={next_cursor}&page[limit]={limit}"
+    else:
+        links["next"] = None
+    return links
+
+
 async def apply_search(tree, filters, query_registry):
     queries = defaultdict(
         dict
@@ -252,6 +278,7 @@ async def construct_entries_response(
     media_type,
     max_depth,
     exact_count_limit,
+    cursor=None,
 ):
     "Construct a response for the `/search` endpoint"
 
@@ -264,8 +291,32 @@ async def construct_entries_response(
     )
     links = pagination_links(base_url, route, path_parts, offset, limit, count)
     data = []
+    # If the tree supports it, page with an opaque cursor that continues from
+    # the last row, which costs the same for every page, rather than an
+    # offset, which costs O(offset) in the database.
+    use_cursor = bool(limit) and getattr(tree, "supports_cursor", False)
+    if (cursor is not None) and not use_cursor:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail="This node does not support page[cursor] with this sorting.",
+        )
 
-    if fields == [schemas.EntryFields.none]:
+    if use_cursor and fields != [schemas.EntryFields.count]:
+        if fields == [schemas.EntryFields.none]:
+            keys, next_cursor = await tree.keys_page(
+                limit, offset=offset, cursor=cursor
+            )
+            items = [(key, None) for key in keys]
+        else:
+            items, next_cursor = await tree.items_page(
+                limit, offset=offset, cursor=cursor
+            )
+        links.update(
+            cursor_pagination_links(
+                base_url, route, path_parts, cursor, next_cursor, limit
+            )
+        )
+    elif fields == [schemas.EntryFields.none]:
         # Pull a page of just the keys, which is cheaper.
         if hasattr(tree, "keys_range"):
             keys = await tree.keys_range(offset, limit)
@@ -321,6 +372,21 @@ DEFAULT_MEDIA_TYPES = {
     StructureFamily.container: {"*/*": "application/x-hdf5"},
     StructureFamily.sparse: {"*/*": APACHE_ARROW_FILE_MIME_TYPE},
 }
+# Table formats that can be serialized directly from a pyarrow.Table
+ARROW_NATIVE_MEDIA_TYPES = {
+    APACHE_ARROW_FILE_MIME_TYPE,
+    "application/x-parquet",
+    "application/json",
+    "application/json-seq",
+    "text/csv",
+}
+
+
+def table_nbytes(data):
+    "Size of a pandas.DataFrame or pyarrow.Table held in memory"
+    if hasattr(data, "memory_usage"):
+        return data.memory_usage().sum()
+    return data.nbytes
 
 
 async def construct_revisions_response(
@@ -352,19 +418,15 @@ async def construct_revisions_response(
     return schemas.Response(data=data, links=links, meta={"count": count})
 
 
-async def construct_data_response(
-    structure_family,
-    serialization_registry,
-    payload,
-    metadata,
-    request,
-    format=None,
-    specs=None,
-    expires=None,
-    filename=None,
-    filter_for_access=None,
+def negotiate_data_media_type(
+    structure_family, serialization_registry, request, format=None, specs=None
 ):
-    request.state.endpoint = "data"
+    """
+    Choose the media type for a data response.
+
+    Returns (media_type, base_media_type, spec), where spec is the spec name
+    or structure family whose serializer should be used.
+    """
     if specs is None:
         specs = []
     default_media_type = DEFAULT_MEDIA_TYPES[structure_family]["*/*"]
@@ -416,10 +478,111 @@ async def construct_data_response(
             f"None of the media types requested by the client are supported. "
             f"Supported: {', '.join(supported)}. Requested: {', '.join(media_types)}.",
         )
-    with record_timing(request.state.metrics, "tok"):
-        # Create an ETag that uniquely identifies this content and the media
-        # type that it will be encoded as.
-        etag = tokenize((payload, base_media_type))
+    return media_type, base_media_type, spec
+
+
+async def content_validator(entry):
+    """
+    Return a token that changes whenever the data of a catalog node changes.
+
+    It is derived from the node id, its data sources and their structures,
+    and the inode, size, and modification time of each asset, so it costs no
+    data I/O. The assets are stat-ed in a worker thread, to keep slow file
+    systems from blocking the event loop. Return None unless every asset is a
+    regular local file: the modification time of a directory (e.g. Zarr) does
+    not change when a chunk is rewritten, and databases may be modified via a
+    separate log.
+    """
+    node = getattr(entry, "node", None)
+    if (node is None) or not node.data_sources:
+        return None
+    parts = [node.id]
+    assets = []
+    for data_source in node.data_sources:
+        parts.append((data_source.id, data_source.structure_id, data_source.parameters))
+        for association in data_source.asset_associations:
+            asset = association.asset
+            if asset.is_directory or (urlparse(asset.data_uri).scheme != "file"):
+                return None
+            assets.append((asset.id, path_from_uri(asset.data_uri)))
+    try:
+        stats = await anyio.to_thread.run_sync(
+            lambda: [os.stat(path) for _, path in assets]
+        )
+    except OSError:
+        return None
+    for (asset_id, _), stat in zip(assets, stats):
+        parts.append((asset_id, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return md5(repr(parts).encode()).hexdigest()
+
+
+async def precomputed_etag(
+    entry, serialization_registry, request, format=None, selection=None
+):
+    """
+    Return an ETag for a data response without reading the data, or None.
+
+    It combines content_validator(entry) with the route, the query parameters
+    (slice, block, partition, fields, ...), and the negotiated media type.
+    Routes that also take parameters from the request body pass them as
+    selection.
+    """
+    validator = await content_validator(entry)
+    if validator is None:
+        return None
+    try:
+        _, base_media_type, _ = negotiate_data_media_type(
+            entry.structure_family,
+            serialization_registry,
+            request,
+            format,
+            getattr(entry, "specs", []),
+        )
+    except UnsupportedMediaTypes:
+        # Let the caller report this when it tries to respond.
+        return None
+    params = sorted(request.query_params.multi_items())
+    token = (validator, request.url.path, params, selection, base_media_type)
+    return md5(repr(token).encode()).hexdigest()
+
+
+def check_not_modified(request, etag, expires=None):
+    """
+    Return a 304 response if the client already has the content with this ETag.
+
+    Otherwise, including when etag is None, return None.
+    """
+    if (etag is None) or (request.headers.get("If-None-Match", "") != etag):
+        return None
+    request.state.endpoint = "data"
+    headers = {"ETag": etag}
+    if expires is not None:
+        headers["Expires"] = expires.strftime(HTTP_EXPIRES_HEADER_FORMAT)
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+async def construct_data_response(
+    structure_family,
+    serialization_registry,
+    payload,
+    metadata,
+    request,
+    format=None,
+    specs=None,
+    expires=None,
+    filename=None,
+    filter_for_access=None,
+    etag=None,
+):
+    request.state.endpoint = "data"
+    media_type, base_media_type, spec = negotiate_data_media_type(
+        structure_family, serialization_registry, request, format, specs
+    )
+    if etag is None:
+        with record_timing(request.state.metrics, "tok"):
+            # Create an ETag that uniquely identifies this content and the media
+            # type that it will be encoded as.
+            etag = tokenize((payload, base_media_type))
     headers = {"ETag": etag}
     if expires is not None:
         headers["Expires"] = expires.strftime(HTTP_EXPIRES_HEADER_FORMAT)
@@ -437,6 +600,9 @@ async def construct_data_response(
             )
         else:
             content = await ensure_awaitable(serializer, media_type, payload, metadata)
+        streaming = inspect.isgenerator(content) or inspect.isasyncgen(content)
+        if streaming:
+            content = await start_streaming(content)
     except UnsupportedShape as err:
         raise UnsupportedMediaTypes(
             f"The shape of this data {err.args[0]} is incompatible with the requested format ({media_type}). "
@@ -446,7 +612,7 @@ async def construct_data_response(
         raise UnsupportedMediaTypes(
             f"This type is supported in general but there was an error packing this specific data: {err.args[0]}",
         )
-    if inspect.isgenerator(content) or inspect.isasyncgen(content):
+    if streaming:
         response_class = StreamingResponse
     else:
         response_class = Response
@@ -457,6 +623,132 @@ async def construct_data_response(
     )
 
 
+async def start_streaming(content):
+    """
+    Produce the first chunk of a streaming body before the response starts.
+
+    An error raised while encoding the first chunk, which is often where
+    encoding fails, can then be reported with an error status, instead of
+    truncating a response that has already been sent as 200 OK.
+
+    Returns an iterable of the same chunks.
+    """
+    if inspect.isasyncgen(content):
+        try:
+            first = await content.__anext__()
+        except StopAsyncIteration:
+            return []
+
+        async def chunks():
+            yield first
+            async for chunk in content:
+                yield chunk
+
+        return chunks()
+    # Encode off the event loop, as StreamingResponse does for the rest.
+    first = await anyio.to_thread.run_sync(next, content, None)
+    if first is None:
+        return []
+    return itertools.chain([first], content)
+
+
+def array_slab_slices(slice, shape, chunks):
+    """
+    Split a slice of an array into slabs along the first axis.
+
+    The slabs follow the chunk boundaries of the first axis, and their
+    C-ordered bytes, concatenated, are the C-ordered bytes of the full slice.
+    Return None if the slice cannot be split this way.
+    """
+    if not shape:
+        return None
+    expanded = slice.expand_for_shape(shape)
+    first, rest = expanded[0], tuple(expanded[1:])
+    if not isinstance(first, builtins.slice) or first.step < 1:
+        # Integer indexing drops the first axis; reversed steps do not map
+        # onto ascending chunks.
+        return None
+    indexes = range(first.start, first.stop, first.step)
+    slabs = []
+    edge = 0
+    for size in chunks[0]:
+        low, high = edge, edge + size
+        edge = high
+        # Select the indexes that fall within this chunk.
+        start = max(0, math.ceil((low - first.start) / first.step))
+        stop = max(0, math.ceil((high - first.start) / first.step))
+        selected = indexes[start:stop]
+        if selected:
+            slabs.append(
+                NDSlice(
+                    builtins.slice(selected[0], selected[-1] + 1, first.step), *rest
+                )
+            )
+    return slabs
+
+
+def construct_streaming_array_response(
+    entry, slabs, dtype, media_type, request, expires=None, filename=None, etag=None
+):
+    """
+    Stream an array as raw bytes, reading and sending one slab at a time.
+
+    This bounds the memory used by the response to the size of one slab.
+    Because the content is not held in memory, the response carries an ETag
+    only if one was computed in advance.
+    """
+    request.state.endpoint = "data"
+    headers = {}
+    if etag is not None:
+        headers["ETag"] = etag
+    if expires is not None:
+        headers["Expires"] = expires.strftime(HTTP_EXPIRES_HEADER_FORMAT)
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    async def content():
+        # Deferred import because this is not a required dependency of the server
+        # for some use cases.
+        import numpy
+
+        for slab in slabs:
+            array = await ensure_awaitable(entry.read, slab)
+            # Force dask or PIMS or ... to do I/O. Ensure dtype is preserved.
+            yield numpy.ascontiguousarray(array, dtype=dtype).tobytes()
+
+    return StreamingResponse(content(), media_type=media_type, headers=headers)
+
+
+def construct_blocks_response(entry, blocks, dtype, request, expires=None, etag=None):
+    """
+    Stream many blocks of an array as raw bytes, in the order given.
+
+    Each block is preceded by its length in bytes, as an unsigned 64-bit
+    little-endian integer, so that the client can split the stream.
+    """
+    request.state.endpoint = "data"
+    headers = {}
+    if etag is not None:
+        headers["ETag"] = etag
+    if expires is not None:
+        headers["Expires"] = expires.strftime(HTTP_EXPIRES_HEADER_FORMAT)
+
+    async def content():
+        # Deferred import because this is not a required dependency of the server
+        # for some use cases.
+        import numpy
+
+        for block in blocks:
+            array = await ensure_awaitable(entry.read_block, block)
+            # Force dask or PIMS or ... to do I/O. Ensure dtype is preserved.
+            data = numpy.ascontiguousarray(array, dtype=dtype).tobytes()
+            yield struct.pack("<Q", len(data)) + data
+
+    return StreamingResponse(
+        content(), media_type="application/octet-stream", headers=headers
+    )
+
+
 async def construct_resource(
     base_url,
     path_parts,
@@ -1,4 +1,5 @@
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 
 import pydantic_settings
 from fastapi import HTTPException, Query, Request
@@ -11,6 +12,7 @@ from starlette.status import (
 
 from ..access_control.protocols import AccessPolicy
 from ..adapters.protocols import AnyAdapter
+from ..adapters.table_filters import FilterError, parse_filter
 from ..ndslice import NDBlock, NDSlice
 from ..structures.core import StructureFamily
 from ..type_aliases import AccessTags, Scopes
@@ -69,20 +71,29 @@ async def get_entry(
         metrics,
     )
     try:
-        for i, segment in enumerate(path_parts):
-            if hasattr(entry, "lookup_adapter"):
-                # New catalog adapter
-                # This adapter can jump directly to the node of interest,
-                # but currenty doesn't, to ensure access_policy is applied.
-                # Raises NoEntry or BrokenLink if the path is not found
-                entry = await entry.lookup_adapter([segment])
+        remaining = path_parts
+        walking = False  # Once looking up the whole path fails, walk the rest.
+        while remaining:
+            resolved = None
+            if (not walking) and can_lookup_path(entry, access_policy):
+                resolved = await entry.lookup_path(remaining)
+                walking = resolved is None
+            if resolved is not None:
+                # Jump directly to the node of interest.
+                entry, remaining = resolved, []
             else:
-                # Old-style dict-like interface
-                # Traverse into sub-tree(s) to reach the desired entry
-                try:
-                    entry = entry[segment]
-                except (KeyError, TypeError):
-                    raise NoEntry(path_parts)
+                segment, *remaining = remaining
+                if hasattr(entry, "lookup_adapter"):
+                    # New catalog adapter
+                    # Raises NoEntry or BrokenLink if the path is not found
+                    entry = await entry.lookup_adapter([segment])
+                else:
+                    # Old-style dict-like interface
+                    # Traverse into sub-tree(s) to reach the desired entry
+                    try:
+                        entry = entry[segment]
+                    except (KeyError, TypeError):
+                        raise NoEntry(path_parts)
 
             # filter and keep only what we are allowed to see from here
             entry = await filter_for_access(
@@ -138,6 +149,22 @@ async def get_entry(
     )
 
 
+def can_lookup_path(entry, access_policy):
+    """
+    Check whether entry can look up a whole path below it in one query.
+
+    That applies the access filters on entry to every node along the path,
+    which is equivalent to filtering each node in turn only if the access
+    policy gives the same filters for every node.
+    """
+    if not hasattr(entry, "lookup_path"):
+        return False
+    if access_policy is None:
+        # Any conditions are not access filters and apply only to direct children.
+        return not entry.conditions
+    return getattr(access_policy, "node_independent_filters", False)
+
+
 def parse_block_param(block: str = Query(..., pattern="^[0-9]*(,[0-9]+)*$")) -> NDBlock:
     "Specify and parse a block index parameter"
     try:
@@ -148,6 +175,33 @@ def parse_block_param(block: str = Query(..., pattern="^[0-9]*(,[0-9]+)*$")) ->
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+BLOCKS_PATTERN = re.compile(r"^[0-9]+(:[0-9]+)?(,[0-9]+(:[0-9]+)?)*$")
+
+
+def parse_blocks_param(
+    block: List[str] = Query(..., min_length=1),
+) -> List[Tuple[range, ...]]:
+    """
+    Specify and parse one or more block indexes.
+
+    Each may give a range of blocks along any axis, as in '0:4,2', which
+    stands for the blocks (0, 2), (1, 2), (2, 2), (3, 2).
+    """
+    blocks = []
+    for item in block:
+        if not BLOCKS_PATTERN.match(item):
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"Could not parse block {item!r}.",
+            )
+        ranges = []
+        for index in item.split(","):
+            start, _, stop = index.partition(":")
+            ranges.append(range(int(start), int(stop) if stop else int(start) + 1))
+        blocks.append(tuple(ranges))
+    return blocks
+
+
 def parse_slice_param(slice: str = Query("", pattern=SLICE_REGEX)):
     "Specify and parse a slice parameter"
     try:
@@ -169,6 +223,18 @@ def expected_shape(
     return tuple(map(int, expected_shape.split(",")))
 
 
+def table_filters_param(
+    filter: Optional[List[str]] = Query(None, min_length=1),
+):
+    "Specify and parse column predicates for table rows, e.g. filter=x>3"
+    if filter is None:
+        return None
+    try:
+        return [parse_filter(item) for item in filter]
+    except FilterError as err:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=err.args[0])
+
+
 def shape_param(
     shape: str = Query(..., min_length=1, pattern="^[0-9]+(,[0-9]+)*$|^scalar$"),
 ):
@@ -57,6 +57,11 @@ COMPRESSION_DURATION = Histogram(
     "time spent applying compression for all HTTP requests",
     ["method", "code", "endpoint", "encoding"],
 )
+COMPRESSION_QUEUE_DURATION = Histogram(
+    "tiled_compress_queue_duration_seconds",
+    "time spent waiting for a compression worker thread for all HTTP requests",
+    ["method", "code", "endpoint"],
+)
 COMPRESSION_RATIO = Histogram(
     "tiled_compress_ratio",
     "compression ratio for all HTTP requests",
@@ -179,6 +184,10 @@ def capture_request_metrics(request, response):
             COMPRESSION_RATIO.labels(
                 method=method, code=code, endpoint=endpoint, encoding=encoding
             ).observe(metrics["compress"]["ratio"])
+    if "compress_queue" in metrics:
+        COMPRESSION_QUEUE_DURATION.labels(
+            method=method, code=code, endpoint=endpoint
+        ).observe(metrics["compress_queue"]["dur"])
 
 
 def monitor_db_pool(pool: QueuePool, name: str):
@@ -1,6 +1,8 @@
 import collections
 import dataclasses
 import inspect
+import itertools
+import math
 import os
 import warnings
 from copy import deepcopy
@@ -40,6 +42,7 @@ from starlette.status import (
 )
 
 from tiled.adapters.protocols import AnyAdapter
+from tiled.adapters.table_filters import Filter, FilterError, select_rows_pandas
 from tiled.authenticators import ProxiedOIDCAuthenticator
 from tiled.media_type_registration import SerializationRegistry
 from tiled.query_registration import QueryRegistry
@@ -71,6 +74,7 @@ from .authentication import (
 )
 from .connection_pool import get_database_session_factory
 from .core import (
+    ARROW_NATIVE_MEDIA_TYPES,
     DEFAULT_PAGE_SIZE,
     DEPTH_LIMIT,
     MAX_PAGE_SIZE,
@@ -78,13 +82,20 @@ from .core import (
     UnsupportedMediaTypes,
     WrongTypeForRoute,
     apply_search,
+    array_slab_slices,
+    check_not_modified,
+    construct_blocks_response,
     construct_data_response,
     construct_entries_response,
     construct_resource,
     construct_revisions_response,
+    construct_streaming_array_response,
     get_websocket_envelope_formatter,
     json_or_msgpack,
+    negotiate_data_media_type,
+    precomputed_etag,
     resolve_media_type,
+    table_nbytes,
 )
 from .dependencies import (
     expected_shape,
@@ -92,10 +103,12 @@ from .dependencies import (
     get_root_tree,
     offset_param,
     parse_block_param,
+    parse_blocks_param,
     parse_slice_param,
     patch_offset_param,
     patch_shape_param,
     shape_param,
+    table_filters_param,
 )
 from .settings import Settings, get_settings
 from .utils import (
@@ -107,6 +120,9 @@ from .utils import (
 
 T = TypeVar("T")
 
+# Bounds the number of blocks requested from /array/blocks at once
+MAX_BLOCKS_PER_REQUEST = 10_000
+
 
 def _patch_route_signature(
     query_registry: QueryRegistry,
@@ -319,6 +335,7 @@ def get_router(
         limit: Optional[int] = Query(
             DEFAULT_PAGE_SIZE, alias="page[limit]", ge=0, le=MAX_PAGE_SIZE
         ),
+        cursor: Optional[str] = Query(None, alias="page[cursor]"),
         sort: Optional[str] = Query(None),
         max_depth: Optional[int] = Query(None, ge=0, le=DEPTH_LIMIT),
         omit_links: bool = Query(False),
@@ -367,6 +384,7 @@ def get_router(
                 resolve_media_type(request),
                 max_depth=max_depth,
                 exact_count_limit=settings.exact_count_limit,
+                cursor=cursor,
             )
             # NOTE: Back-compatibility for clients older than v0.2.4
             response_model_dump = _model_dump_backcompat(request, response)
@@ -600,6 +618,12 @@ def get_router(
                 ),
             )
 
+        etag = await precomputed_etag(entry, serialization_registry, request, format)
+        not_modified = check_not_modified(
+            request, etag, getattr(entry, "content_stale_at", None)
+        )
+        if not_modified is not None:
+            return not_modified
         if ndim == 0:
             # Handle special case of numpy scalar.
             with record_timing(request.state.metrics, "read"):
@@ -640,10 +664,134 @@ def get_router(
                     specs=getattr(entry, "specs", []),
                     expires=getattr(entry, "content_stale_at", None),
                     filename=filename,
+                    etag=etag,
                 )
         except UnsupportedMediaTypes as err:
             raise HTTPException(status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0])
 
+    @router.get(
+        "/array/blocks/{path:path}",
+        response_model=schemas.Response,
+        name="array blocks",
+    )
+    async def array_blocks(
+        request: Request,
+        path: str,
+        blocks=Depends(parse_blocks_param),
+        format: Optional[str] = None,
+        settings: Settings = Depends(get_settings),
+        principal: Optional[Principal] = Depends(get_current_principal),
+        root_tree=Depends(get_root_tree),
+        session_state: dict = Depends(get_session_state),
+        authn_access_tags: Optional[AccessTags] = Depends(get_current_access_tags),
+        authn_scopes: Scopes = Depends(get_current_scopes),
+        _=Security(check_scopes, scopes=["read:data"]),
+    ):
+        """
+        Fetch many chunks of array-like data in one response.
+
+        Blocks are given as repeated ?block=... parameters, each of which may
+        span a range of blocks, as in ?block=0:4,2. The response is a stream of
+        raw bytes, each block preceded by its length in bytes as an unsigned
+        64-bit little-endian integer.
+        """
+        entry = await get_entry(
+            path,
+            ["read:data"],
+            principal,
+            authn_access_tags,
+            authn_scopes,
+            root_tree,
+            session_state,
+            request.state.metrics,
+            {StructureFamily.array},
+            getattr(request.app.state, "access_policy", None),
+        )
+        structure = entry.structure()
+        chunks = structure.chunks
+        ndim = len(structure.shape)
+        dtype = structure.data_type.to_numpy_dtype()
+        numblocks = tuple(map(len, chunks))
+        for ranges in blocks:
+            if len(ranges) != ndim:
+                raise HTTPException(
+                    status_code=HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail=(
+                        f"Block parameter must have {ndim} comma-separated parameters, "
+                        f"corresponding to the dimensions of this {ndim}-dimensional "
+                        "array."
+                    ),
+                )
+            if any(r.stop > n for r, n in zip(ranges, numblocks)):
+                raise HTTPException(
+                    status_code=HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail=f"Block parameter is out of range for the chunks {chunks}.",
+                )
+        # Check the size of the response, from the ranges, before listing the
+        # blocks or doing any I/O.
+        count = sum(math.prod(map(len, ranges)) for ranges in blocks)
+        if count > MAX_BLOCKS_PER_REQUEST:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Request asks for {count} blocks; at most "
+                    f"{MAX_BLOCKS_PER_REQUEST} may be requested at a time."
+                ),
+            )
+        nbytes = dtype.itemsize * sum(
+            math.prod(
+                sum(dim_chunks[r.start : r.stop])  # noqa: E203
+                for dim_chunks, r in zip(chunks, ranges)
+            )
+            for ranges in blocks
+        )
+        if nbytes > settings.response_bytesize_limit:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Response would exceed {settings.response_bytesize_limit}. "
+                    "Request fewer blocks at a time."
+                ),
+            )
+        requested = [
+            NDBlock(*indexes)
+            for ranges in blocks
+            for indexes in itertools.product(*ranges)
+        ]
+        try:
+            base_media_type = negotiate_data_media_type(
+                entry.structure_family,
+                serialization_registry,
+                request,
+                format,
+                specs=getattr(entry, "specs", []),
+            )[1]
+        except UnsupportedMediaTypes as err:
+            raise HTTPException(status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0])
+        if (base_media_type != "application/octet-stream") or dtype.hasobject:
+            raise HTTPException(
+                status_code=HTTP_406_NOT_ACCEPTABLE,
+                detail=(
+                    "Multiple blocks can only be fetched together as raw bytes "
+                    "(application/octet-stream). Use the /array/block endpoint "
+                    "for other formats."
+                ),
+            )
+        etag = await precomputed_etag(entry, serialization_registry, request, format)
+        not_modified = check_not_modified(
+            request, etag, getattr(entry, "content_stale_at", None)
+        )
+        if not_modified is not None:
+            return not_modified
+        return construct_blocks_response(
+            entry,
+            requested,
+            dtype,
+            request,
+            expires=getattr(entry, "content_stale_at", None),
+            etag=etag,
+        )
+
     @router.get(
         "/array/full/{path:path}", response_model=schemas.Response, name="full array"
     )
@@ -678,6 +826,67 @@ def get_router(
             getattr(request.app.state, "access_policy", None),
         )
         structure_family = entry.structure_family
+        etag = await precomputed_etag(entry, serialization_registry, request, format)
+        not_modified = check_not_modified(
+            request, etag, getattr(entry, "content_stale_at", None)
+        )
+        if not_modified is not None:
+            return not_modified
+        if structure_family == StructureFamily.array:
+            # Check the size of the response before doing any I/O.
+            structure = entry.structure()
+            dtype = structure.data_type.to_numpy_dtype()
+            try:
+                shape = slice.shape_after_slice(structure.shape)
+            except IndexError:
+                raise HTTPException(
+                    status_code=HTTP_400_BAD_REQUEST, detail="Slice out of range"
+                )
+            if (expected_shape is not None) and (expected_shape != shape):
+                raise HTTPException(
+                    status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"The shape expected from the structure {expected_shape} "
+                    f"does not match the shape of the requested slice {shape}",
+                )
+            if math.prod(shape) * dtype.itemsize > settings.response_bytesize_limit:
+                raise HTTPException(
+                    status_code=HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Response would exceed {settings.response_bytesize_limit}. "
+                        "Use slicing ('?slice=...') to request smaller chunks."
+                    ),
+                )
+            try:
+                media_type, base_media_type, spec = negotiate_data_media_type(
+                    structure_family,
+                    serialization_registry,
+                    request,
+                    format,
+                    specs=getattr(entry, "specs", []),
+                )
+            except UnsupportedMediaTypes as err:
+                raise HTTPException(
+                    status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0]
+                )
+            if (
+                (spec == structure_family)
+                and (base_media_type == "application/octet-stream")
+                and not dtype.hasobject
+            ):
+                # Raw bytes can be sent in slabs along the first axis, so that
+                # at most one slab is held in memory at a time.
+                slabs = array_slab_slices(slice, structure.shape, structure.chunks)
+                if (slabs is not None) and (len(slabs) > 1):
+                    return construct_streaming_array_response(
+                        entry,
+                        slabs,
+                        dtype,
+                        media_type,
+                        request,
+                        expires=getattr(entry, "content_stale_at", None),
+                        filename=filename,
+                        etag=etag,
+                    )
         # Deferred import because this is not a required dependency of the server
         # for some use cases.
         import numpy
@@ -720,6 +929,7 @@ def get_router(
                     specs=getattr(entry, "specs", []),
                     expires=getattr(entry, "content_stale_at", None),
                     filename=filename,
+                    etag=etag,
                 )
         except UnsupportedMediaTypes as err:
             raise HTTPException(status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0])
@@ -835,6 +1045,61 @@ def get_router(
         handler = entry.make_ws_handler(websocket, formatter, uri)
         await handler(start, already_accepted=needs_first_message_auth)
 
+    def prefers_arrow(entry, request, format):
+        """
+        Check whether the table will be sent in an Arrow-based format.
+
+        If so, the table can be read and serialized as Arrow throughout,
+        without a round trip through pandas.
+        """
+        try:
+            _, base_media_type, spec = negotiate_data_media_type(
+                StructureFamily.table,
+                serialization_registry,
+                request,
+                format,
+                specs=getattr(entry, "specs", []),
+            )
+        except UnsupportedMediaTypes:
+            # This will be reported when the response is constructed.
+            return False
+        return (spec == StructureFamily.table) and (
+            base_media_type in ARROW_NATIVE_MEDIA_TYPES
+        )
+
+    async def read_table(
+        entry, request, format, partition, column, filters, offset, limit
+    ):
+        """
+        Read a table, or one partition of it, selecting columns and rows.
+
+        Adapters with an Arrow-native read path take the row selection and
+        push it down into their storage. Otherwise, it is applied after reading.
+        """
+        arrow = prefers_arrow(entry, request, format)
+        selecting = bool(filters) or bool(offset) or (limit is not None)
+        if partition is None:
+            read, read_arrow, args = entry.read, "read_arrow", (column,)
+        else:
+            read, read_arrow, args = (
+                entry.read_partition,
+                "read_partition_arrow",
+                (partition, column),
+            )
+        if (arrow or selecting) and hasattr(entry, read_arrow):
+            data = await ensure_awaitable(
+                getattr(entry, read_arrow),
+                *args,
+                filters=filters,
+                offset=offset,
+                limit=limit,
+            )
+            return data if arrow else data.to_pandas()
+        data = await ensure_awaitable(read, *args)
+        if selecting:
+            data = select_rows_pandas(data, filters, offset, limit)
+        return data
+
     @router.get(
         "/table/partition/{path:path}",
         response_model=schemas.Response,
@@ -848,6 +1113,9 @@ def get_router(
         field: Optional[List[str]] = Query(None, min_length=1, deprecated=True),
         format: Optional[str] = None,
         filename: Optional[str] = None,
+        filters: Optional[List[Filter]] = Depends(table_filters_param),
+        offset: int = Query(0, ge=0),
+        limit: Optional[int] = Query(None, ge=0),
         settings: Settings = Depends(get_settings),
         principal: Optional[Principal] = Depends(get_current_principal),
         root_tree=Depends(get_root_tree),
@@ -898,6 +1166,9 @@ def get_router(
             format=format,
             filename=filename,
             settings=settings,
+            filters=filters,
+            offset=offset,
+            limit=limit,
         )
 
     @router.post(
@@ -912,6 +1183,9 @@ def get_router(
         column: Optional[List[str]] = Body(None, min_length=1),
         format: Optional[str] = None,
         filename: Optional[str] = None,
+        filters: Optional[List[Filter]] = Depends(table_filters_param),
+        offset: int = Query(0, ge=0),
+        limit: Optional[int] = Query(None, ge=0),
         settings: Settings = Depends(get_settings),
         principal: Optional[Principal] = Depends(get_current_principal),
         root_tree=Depends(get_root_tree),
@@ -943,6 +1217,9 @@ def get_router(
             format=format,
             filename=filename,
             settings=settings,
+            filters=filters,
+            offset=offset,
+            limit=limit,
         )
 
     async def table_partition(
@@ -953,25 +1230,44 @@ def get_router(
         format: Optional[str],
         filename: Optional[str],
         settings: Settings,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ):
         """
         Fetch a partition (continuous block of rows) from a DataFrame.
         """
+        etag = await precomputed_etag(
+            entry,
+            serialization_registry,
+            request,
+            format,
+            selection=(partition, column, filters, offset, limit),
+        )
+        not_modified = check_not_modified(
+            request, etag, getattr(entry, "content_stale_at", None)
+        )
+        if not_modified is not None:
+            return not_modified
         try:
             # The singular/plural mismatch here of "fields" and "field" is
             # due to the ?field=A&field=B&field=C... encodes in a URL.
             with record_timing(request.state.metrics, "read"):
-                df = await ensure_awaitable(entry.read_partition, partition, column)
+                df = await read_table(
+                    entry, request, format, partition, column, filters, offset, limit
+                )
         except IndexError:
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Partition out of range"
             )
+        except FilterError as err:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=err.args[0])
         except KeyError as err:
             (key,) = err.args
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail=f"No such field {key}."
             )
-        if df.memory_usage().sum() > settings.response_bytesize_limit:
+        if table_nbytes(df) > settings.response_bytesize_limit:
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST,
                 detail=(
@@ -992,6 +1288,7 @@ def get_router(
                     specs=getattr(entry, "specs", []),
                     expires=getattr(entry, "content_stale_at", None),
                     filename=filename,
+                    etag=etag,
                 )
         except UnsupportedMediaTypes as err:
             raise HTTPException(status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0])
@@ -1007,6 +1304,9 @@ def get_router(
         column: Optional[List[str]] = Query(None, min_length=1),
         format: Optional[str] = None,
         filename: Optional[str] = None,
+        filters: Optional[List[Filter]] = Depends(table_filters_param),
+        offset: int = Query(0, ge=0),
+        limit: Optional[int] = Query(None, ge=0),
         settings: Settings = Depends(get_settings),
         principal: Optional[Principal] = Depends(get_current_principal),
         root_tree=Depends(get_root_tree),
@@ -1037,6 +1337,9 @@ def get_router(
             format=format,
             filename=filename,
             settings=settings,
+            filters=filters,
+            offset=offset,
+            limit=limit,
         )
 
     @router.post(
@@ -1050,6 +1353,9 @@ def get_router(
         column: Optional[List[str]] = Body(None, min_length=1),
         format: Optional[str] = None,
         filename: Optional[str] = None,
+        filters: Optional[List[Filter]] = Depends(table_filters_param),
+        offset: int = Query(0, ge=0),
+        limit: Optional[int] = Query(None, ge=0),
         settings: Settings = Depends(get_settings),
         principal: Optional[Principal] = Depends(get_current_principal),
         root_tree=Depends(get_root_tree),
@@ -1080,6 +1386,9 @@ def get_router(
             format=format,
             filename=filename,
             settings=settings,
+            filters=filters,
+            offset=offset,
+            limit=limit,
         )
 
     async def table_full(
@@ -1089,19 +1398,38 @@ def get_router(
         format: Optional[str],
         filename: Optional[str],
         settings: Settings,
+        filters: Optional[List[Filter]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ):
         """
         Fetch the data for the given table.
         """
+        etag = await precomputed_etag(
+            entry,
+            serialization_registry,
+            request,
+            format,
+            selection=(None, column, filters, offset, limit),
+        )
+        not_modified = check_not_modified(
+            request, etag, getattr(entry, "content_stale_at", None)
+        )
+        if not_modified is not None:
+            return not_modified
         try:
             with record_timing(request.state.metrics, "read"):
-                data = await ensure_awaitable(entry.read, column)
+                data = await read_table(
+                    entry, request, format, None, column, filters, offset, limit
+                )
+        except FilterError as err:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=err.args[0])
         except KeyError as err:
             (key,) = err.args
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail=f"No such field {key}."
             )
-        if data.memory_usage().sum() > settings.response_bytesize_limit:
+        if table_nbytes(data) > settings.response_bytesize_limit:
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST,
                 detail=(
@@ -1123,6 +1451,7 @@ def get_router(
                     expires=getattr(entry, "content_stale_at", None),
                     filename=filename,
                     filter_for_access=None,
+                    etag=etag,
                 )
         except UnsupportedMediaTypes as err:
             raise HTTPException(status_code=HTTP_406_NOT_ACCEPTABLE, detail=err.args[0])
@@ -1639,9 +1968,8 @@ def get_router(
             authn_scopes=authn_scopes,
         )
 
-    async def _create_node(
+    async def _prepare_node(
         request: Request,
-        path: str,
         body: schemas.PostMetadataRequest,
         settings: Settings,
         entry,
@@ -1649,6 +1977,12 @@ def get_router(
         authn_access_tags: Optional[AccessTags],
         authn_scopes: Scopes,
     ):
+        """
+        Validate the specs and access blob of a node to be created.
+
+        Return the keyword arguments for entry.create_node and a
+        partial response, to be completed once the node is created.
+        """
         metadata, structure_family, specs, access_blob = (
             body.metadata,
             body.structure_family,
@@ -1691,28 +2025,197 @@ def get_router(
             access_blob_modified = access_blob != {}
             access_blob = {}
 
-        node = await entry.create_node(
-            metadata=body.metadata,
-            structure_family=body.structure_family,
-            key=key,
-            specs=body.specs,
-            data_sources=body.data_sources,
-            access_blob=access_blob,
-        )
+        kwargs = {
+            "metadata": body.metadata,
+            "structure_family": body.structure_family,
+            "key": key,
+            "specs": body.specs,
+            "data_sources": body.data_sources,
+            "access_blob": access_blob,
+        }
+        response_data = {}
+        if metadata_modified:
+            response_data["metadata"] = metadata
+        if access_blob_modified:
+            response_data["access_blob"] = access_blob
+        return kwargs, structure, response_data
+
+    def _created_node_response_data(request, path, node, structure, response_data):
         links = links_for_node(
-            structure_family, structure, get_base_url(request), path + f"/{node.key}"
+            node.structure_family,
+            structure,
+            get_base_url(request),
+            path + f"/{node.key}",
         )
-        response_data = {
+        return {
             "id": node.key,
             "links": links,
             "data_sources": [ds.model_dump() for ds in node.data_sources],
+            **response_data,
         }
-        if metadata_modified:
-            response_data["metadata"] = metadata
-        if access_blob_modified:
-            response_data["access_blob"] = access_blob
 
-        return json_or_msgpack(request, response_data)
+    async def _create_node(
+        request: Request,
+        path: str,
+        body: schemas.PostMetadataRequest,
+        settings: Settings,
+        entry,
+        principal: Optional[Principal],
+        authn_access_tags: Optional[AccessTags],
+        authn_scopes: Scopes,
+    ):
+        kwargs, structure, response_data = await _prepare_node(
+            request,
+            body,
+            settings,
+            entry,
+            principal,
+            authn_access_tags,
+            authn_scopes,
+        )
+        node = await entry.create_node(**kwargs)
+        return json_or_msgpack(
+            request,
+            _created_node_response_data(request, path, node, structure, response_data),
+        )
+
+    @router.post(
+        "/batch/metadata/{path:path}", response_model=schemas.PostBatchResponse
+    )
+    async def post_batch_metadata(
+        request: Request,
+        path: str,
+        body: schemas.PostBatchRequest,
+        settings: Settings = Depends(get_settings),
+        principal: Optional[Principal] = Depends(get_current_principal),
+        authn_access_tags: Optional[AccessTags] = Depends(get_current_access_tags),
+        authn_scopes: Scopes = Depends(get_current_scopes),
+        root_tree=Depends(get_root_tree),
+        session_state: dict = Depends(get_session_state),
+        _=Security(check_scopes, scopes=["write:metadata", "create:node"]),
+    ):
+        """
+        Create many nodes in one transaction. Like POST /metadata/{path}, repeated.
+        """
+        entry = await get_entry(
+            path,
+            ["write:metadata", "create:node"],
+            principal,
+            authn_access_tags,
+            authn_scopes,
+            root_tree,
+            session_state,
+            request.state.metrics,
+            None,
+            getattr(request.app.state, "access_policy", None),
+        )
+        for node_body in body.nodes:
+            for data_source in node_body.data_sources:
+                if data_source.assets:
+                    raise HTTPException(
+                        status_code=HTTP_400_BAD_REQUEST,
+                        detail=(
+                            "Externally-managed assets cannot be registered using "
+                            "POST /batch/metadata/{path}. "
+                            "Use POST /batch/register/{path} instead."
+                        ),
+                    )
+            if node_body.data_sources and not getattr(entry, "writable", False):
+                raise HTTPException(
+                    status_code=HTTP_405_METHOD_NOT_ALLOWED,
+                    detail=f"Data cannot be written at the path {path}",
+                )
+        return await _create_nodes(
+            request=request,
+            path=path,
+            body=body,
+            settings=settings,
+            entry=entry,
+            principal=principal,
+            authn_access_tags=authn_access_tags,
+            authn_scopes=authn_scopes,
+        )
+
+    @router.post(
+        "/batch/register/{path:path}", response_model=schemas.PostBatchResponse
+    )
+    async def post_batch_register(
+        request: Request,
+        path: str,
+        body: schemas.PostBatchRequest,
+        settings: Settings = Depends(get_settings),
+        principal: Optional[Principal] = Depends(get_current_principal),
+        authn_access_tags: Optional[AccessTags] = Depends(get_current_access_tags),
+        authn_scopes: Scopes = Depends(get_current_scopes),
+        root_tree=Depends(get_root_tree),
+        session_state: dict = Depends(get_session_state),
+        _=Security(check_scopes, scopes=["write:metadata", "create:node", "register"]),
+    ):
+        """
+        Create many nodes in one transaction. Like POST /register/{path}, repeated.
+        """
+        entry = await get_entry(
+            path,
+            ["write:metadata", "create:node", "register"],
+            principal,
+            authn_access_tags,
+            authn_scopes,
+            root_tree,
+            session_state,
+            request.state.metrics,
+            None,
+            getattr(request.app.state, "access_policy", None),
+        )
+        return await _create_nodes(
+            request=request,
+            path=path,
+            body=body,
+            settings=settings,
+            entry=entry,
+            principal=principal,
+            authn_access_tags=authn_access_tags,
+            authn_scopes=authn_scopes,
+        )
+
+    async def _create_nodes(
+        request: Request,
+        path: str,
+        body: schemas.PostBatchRequest,
+        settings: Settings,
+        entry,
+        principal: Optional[Principal],
+        authn_access_tags: Optional[AccessTags],
+        authn_scopes: Scopes,
+    ):
+        if not hasattr(entry, "create_nodes"):
+            raise HTTPException(
+                status_code=HTTP_405_METHOD_NOT_ALLOWED,
+                detail=f"Nodes cannot be created in bulk at the path {path}",
+            )
+        prepared = [
+            await _prepare_node(
+                request,
+                node_body,
+                settings,
+                entry,
+                principal,
+                authn_access_tags,
+                authn_scopes,
+            )
+            for node_body in body.nodes
+        ]
+        nodes = await entry.create_nodes([kwargs for kwargs, _, _ in prepared])
+        return json_or_msgpack(
+            request,
+            {
+                "nodes": [
+                    _created_node_response_data(
+                        request, path, node, structure, response_data
+                    )
+                    for node, (_, structure, response_data) in zip(nodes, prepared)
+                ]
+            },
+        )
 
     @router.put("/data_source/{path:path}")
     async def put_data_source(
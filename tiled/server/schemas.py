@@ -47,6 +47,8 @@ StructureT = TypeVar("StructureT")
 
 
 MAX_ALLOWED_SPECS = 20
+# Bounds the work, and the transaction, of one batch request
+MAX_BATCH_NODES = 1000
 
 
 class Error(pydantic.BaseModel):
@@ -234,6 +236,7 @@ class ArrayLinks(pydantic.BaseModel):
     self: str
     full: str
     block: str
+    blocks: Optional[str] = None
 
 
 class AwkwardLinks(pydantic.BaseModel):
@@ -483,6 +486,14 @@ class PostMetadataResponse(pydantic.BaseModel, Generic[ResourceLinksT]):
     access_blob: Dict
 
 
+class PostBatchRequest(pydantic.BaseModel):
+    nodes: Annotated[List[PostMetadataRequest], Field(max_length=MAX_BATCH_NODES)]
+
+
+class PostBatchResponse(pydantic.BaseModel):
+    nodes: List[PostMetadataResponse]
+
+
 class PutMetadataResponse(pydantic.BaseModel, Generic[ResourceLinksT]):
     id: str
     links: Union[ArrayLinks, DataFrameLinks, SparseLinks]
@@ -34,6 +34,8 @@ class Settings(BaseSettings):
     access_token_max_age: timedelta = timedelta(minutes=15)
     refresh_token_max_age: timedelta = timedelta(days=7)
     session_max_age: timedelta = timedelta(days=365)
+    # How long a verified API key may be reused without consulting the database
+    api_key_cache_ttl: timedelta = timedelta(seconds=10)
     # Put a fairly low limit on the maximum size of one chunk, keeping in mind
     # that data should generally be chunked. When we implement async responses,
     # we can raise this global limit.
@@ -16,6 +16,9 @@ from ..utils import safe_json_dump as _safe_json_dump
 
 logger = logging.getLogger(__name__)
 
+# Number of messages fetched from the datastore at once when replaying history
+DEFAULT_REPLAY_BATCH_SIZE = 500
+
 
 def safe_json_dump(content):
     """Additional handling for NDSlice serialization."""
@@ -48,6 +51,9 @@ class StreamingDatastore(Protocol):
     async def get(self, key, *fields) -> None:
         ...
 
+    async def get_many(self, keys, *fields) -> list:
+        ...
+
     async def close(self, node_id) -> None:
         ...
 
@@ -176,10 +182,12 @@ def _make_ws_handler_common(
     node_id: str,
     schema,
     get_func: Callable[..., Any],
+    get_many_func: Callable[..., Any],
     current_sequence_getter: Callable[[], Any],
     live_sequence_source: Callable[
         [], Any
     ],  # returns (AsyncIterator[int], Optional[Callable[[], Awaitable[None]]])
+    replay_batch_size: int = DEFAULT_REPLAY_BATCH_SIZE,
 ):
     """
     Create a websocket handler that implements the streaming protocol for a node.
@@ -199,11 +207,16 @@ def _make_ws_handler_common(
         The schema object describing the structure of the streamed data.
     get_func : Callable[..., Any]
         Function to retrieve data for a given sequence number. Signature: get_func(node_id, sequence, ...).
+    get_many_func : Callable[..., Any]
+        Function to retrieve data for many keys in one round trip. Signature:
+        get_many_func(keys, *fields), returning one list of fields per key.
     current_sequence_getter : Callable[[], Any]
         Function to get the current/latest sequence number for the node.
     live_sequence_source : Callable[[], Tuple[AsyncIterator[int], Optional[Callable[[], Awaitable[None]]]]]
         Function returning an async iterator of new sequence numbers as they become available,
         and optionally a cleanup callback to be awaited when the stream ends.
+    replay_batch_size : int
+        Number of messages fetched at once when replaying history.
 
     Returns
     -------
@@ -215,6 +228,8 @@ def _make_ws_handler_common(
     -------------
     1. Sends the schema to the client to provide context for interpreting subsequent data.
     2. If a starting sequence is provided, replays historical data from that sequence up to the current sequence.
+       History is fetched in batches, and the next batch is fetched while the
+       current one is being sent, so at most two batches are held in memory.
     3. Streams new data live as it becomes available.
 
     Error Handling
@@ -237,6 +252,10 @@ def _make_ws_handler_common(
 
             key = f"data:{node_id}:{sequence}"
             payload_bytes, metadata_bytes = await get_func(key, "payload", "metadata")
+            await send_data(payload_bytes, metadata_bytes)
+
+        async def send_data(payload_bytes, metadata_bytes):
+            """Helper function to send one message, as fetched, to a websocket"""
             if metadata_bytes is None:
                 # This means that the data is no longer available (either expired or not found)
                 return
@@ -259,6 +278,33 @@ def _make_ws_handler_common(
                     metadata["uri"] = f"{uri}?slice={s}"
             await formatter(websocket, metadata, payload_bytes)
 
+        async def fetch_batch(start, stop):
+            keys = [f"data:{node_id}:{s}" for s in range(start, stop)]
+            return await get_many_func(keys, "payload", "metadata")
+
+        async def replay(start, stop):
+            """Send the stored messages from sequence start through stop"""
+            batches = [
+                (batch_start, min(batch_start + replay_batch_size, stop + 1))
+                for batch_start in range(start, stop + 1, replay_batch_size)
+            ]
+            next_batch = None
+            try:
+                for i, batch_range in enumerate(batches):
+                    batch = await (next_batch or fetch_batch(*batch_range))
+                    # Fetch the next batch while this one is sent. Sending
+                    # waits on the client, so a slow client slows the fetching.
+                    next_batch = None
+                    if i + 1 < len(batches):
+                        next_batch = asyncio.create_task(fetch_batch(*batches[i + 1]))
+                    for payload_bytes, metadata_bytes in batch:
+                        await send_data(payload_bytes, metadata_bytes)
+                        if end_stream.is_set():
+                            return
+            finally:
+                if next_batch is not None:
+                    next_batch.cancel()
+
         # Setup buffer
         stream_buffer = asyncio.Queue()
 
@@ -287,8 +333,7 @@ def _make_ws_handler_common(
             # If a sequence number is passed, replay old data
             current_seq = last_sent = int(await current_sequence_getter())
             logger.debug("Replaying old data...")
-            for s in range(sequence, current_seq + 1):
-                await stream_data(s)
+            await replay(sequence, current_seq)
         # Finally stream all buffered data into the websocket
         try:
             while not end_stream.is_set():
@@ -392,6 +437,14 @@ class TTLCacheDatastore(StreamingDatastore):
             return [None for _ in fields]
         return [mapping.get(field) for field in fields]
 
+    async def get_many(self, keys, *fields):
+        async with self._lock:
+            mappings = [self._data_cache.get(key) for key in keys]
+        return [
+            [None if mapping is None else mapping.get(field) for field in fields]
+            for mapping in mappings
+        ]
+
     async def close(self, node_id: str):
         # Increment the counter for this node.
         sequence = await self.incr_seq(node_id)
@@ -422,8 +475,12 @@ class TTLCacheDatastore(StreamingDatastore):
             node_id=node_id,
             schema=schema,
             get_func=self.get,
+            get_many_func=self.get_many,
             current_sequence_getter=current_sequence_getter,
             live_sequence_source=live_sequence_source,
+            replay_batch_size=self._settings.get(
+                "replay_batch_size", DEFAULT_REPLAY_BATCH_SIZE
+            ),
         )
 
 
@@ -492,6 +549,13 @@ class RedisStreamingDatastore(StreamingDatastore):
     async def get(self, key, *fields):
         return await self.client.hmget(key, *fields)
 
+    async def get_many(self, keys, *fields):
+        # One round trip for all the keys
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.hmget(key, *fields)
+        return await pipeline.execute()
+
     def make_ws_handler(self, websocket, formatter, uri, node_id, schema):
         async def current_sequence_getter():
             current_seq = await self.client.get(f"sequence:{node_id}")
@@ -522,6 +586,10 @@ class RedisStreamingDatastore(StreamingDatastore):
             node_id=node_id,
             schema=schema,
             get_func=self.get,
+            get_many_func=self.get_many,
             current_sequence_getter=current_sequence_getter,
             live_sequence_source=live_sequence_source,
+            replay_batch_size=self._settings.get(
+                "replay_batch_size", DEFAULT_REPLAY_BATCH_SIZE
+            ),
         )
@@ -7,7 +7,11 @@ import orjson
 import pydantic_settings
 from fastapi import APIRouter, Depends, HTTPException, Request
 from starlette.responses import Response
-from starlette.status import HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
 
 from ..structures.core import StructureFamily
 from ..type_aliases import AccessTags, Scopes
@@ -47,6 +51,68 @@ def convert_chunks_for_zarr(tiled_chunks: Tuple[Tuple[int]]):
     return [min(ZARR_BLOCK_SIZE, max(*tc, 1)) for tc in tiled_chunks]
 
 
+async def get_passthrough_metadata(entry, zarr_format: int) -> Optional[dict]:
+    """
+    Return metadata for serving the stored chunks of a Zarr-backed array as they are.
+
+    This applies when the array is stored in the Zarr format being served and
+    its chunk grid is the one Tiled advertises for it. Otherwise, return None,
+    and chunks are read, decoded, and re-encoded with zarr_codec.
+    """
+    if (entry.structure_family != StructureFamily.array) or not hasattr(
+        entry, "zarr_metadata"
+    ):
+        return None
+    stored = await ensure_awaitable(entry.zarr_metadata)
+    if stored is None:
+        return None
+    stored_format, metadata = stored
+    if stored_format != zarr_format:
+        return None
+    structure = entry.structure()
+    if zarr_format == 2:
+        chunk_shape = metadata.get("chunks")
+    else:
+        chunk_grid = metadata.get("chunk_grid", {})
+        if chunk_grid.get("name") != "regular":
+            return None
+        chunk_shape = chunk_grid["configuration"]["chunk_shape"]
+    if list(chunk_shape) != convert_chunks_for_zarr(structure.chunks):
+        return None
+    # The stored array may extend past the shape of the node, in its last chunks.
+    metadata = {**metadata, "shape": list(structure.shape)}
+    if zarr_format == 2:
+        # Chunks are requested as "i.j.k" whatever the stored separator.
+        metadata.pop("dimension_separator", None)
+    else:
+        metadata["chunk_key_encoding"] = {
+            "name": "default",
+            "configuration": {"separator": "/"},
+        }
+        metadata["dimension_names"] = list(structure.dims) if structure.dims else None
+        metadata["attributes"] = entry.metadata()
+    return metadata
+
+
+async def read_raw_chunk(entry, zarr_block_indx, zarr_block_spec) -> Response:
+    "Respond with the stored bytes of a chunk of a Zarr-backed array."
+    chunk_coords = tuple(zarr_block_indx) if zarr_block_spec else ()
+    shape = entry.structure().shape
+    if any(i * c >= max(s, 1) for i, c, s in zip(chunk_coords, zarr_block_spec, shape)):
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"Index of zarr block {zarr_block_indx} is out of range.",
+        )
+    buf = await ensure_awaitable(entry.read_raw_chunk, chunk_coords)
+    if buf is None:
+        # Zarr clients read a missing chunk as filled with the fill_value.
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND,
+            detail=f"Zarr block {zarr_block_indx} has not been written.",
+        )
+    return Response(buf, status_code=200)
+
+
 def get_zarr_router_v2() -> APIRouter:
     router = APIRouter()
 
@@ -137,6 +203,9 @@ def get_zarr_router_v2() -> APIRouter:
             structure_families={StructureFamily.array, StructureFamily.sparse},
             access_policy=getattr(request.app.state, "access_policy", None),
         )
+        metadata = await get_passthrough_metadata(entry, zarr_format=2)
+        if metadata is not None:
+            return Response(json.dumps(metadata), status_code=200)
         structure = entry.structure()
         try:
             zarray_spec = {
@@ -229,6 +298,12 @@ def get_zarr_router_v2() -> APIRouter:
                         detail=f"Requested zarr block index {zarr_block_indx} is inconsistent with the shape of array, {entry.structure().shape}.",  # noqa
                     )
 
+                if await get_passthrough_metadata(entry, zarr_format=2) is not None:
+                    with record_timing(request.state.metrics, "read"):
+                        return await read_raw_chunk(
+                            entry, zarr_block_indx, zarr_block_spec
+                        )
+
                 # Indices of the array slices in each dimension that correspond to the requested zarr block
                 block_slices = tuple(
                     [
@@ -308,8 +383,12 @@ def get_zarr_router_v3() -> APIRouter:
             access_policy=getattr(request.app.state, "access_policy", None),
         )
 
+        passthrough_metadata = await get_passthrough_metadata(entry, zarr_format=3)
+        if passthrough_metadata is not None:
+            # Array stored as Zarr, whose chunks are served as they are
+            result = passthrough_metadata
         # Array or sparse array
-        if entry.structure_family in {StructureFamily.array, StructureFamily.sparse}:
+        elif entry.structure_family in {StructureFamily.array, StructureFamily.sparse}:
             structure = entry.structure()
             zarr_dtype = parse_data_type(
                 structure.data_type.to_numpy_descr(), zarr_format=3
@@ -411,6 +490,10 @@ def get_zarr_router_v3() -> APIRouter:
                     detail=f"Requested zarr block index {zarr_block_indx} is inconsistent with the shape of array, {entry.structure().shape}.",  # noqa
                 )
 
+            if await get_passthrough_metadata(entry, zarr_format=3) is not None:
+                with record_timing(request.state.metrics, "read"):
+                    return await read_raw_chunk(entry, zarr_block_indx, zarr_block_spec)
+
             # Indices of the array slices in each dimension that correspond to the requested zarr block
             block_slices = tuple(
                 [